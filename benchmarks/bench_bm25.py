@@ -0,0 +1,94 @@
+"""Indexing throughput and query latency of the local `BM25Index`.
+
+Generates synthetic memories from a Zipf-like vocabulary and reports build rate, the
+median and p99 latency of short keyword queries, and the cost of incremental updates.
+
+Run with ``uv run python benchmarks/bench_bm25.py [--sizes 10000 1000000] [--queries N]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from engram import BM25Index
+from engram._models import Memory
+
+_TOPICS = ("preferences", "work", "tools", "travel", "health")
+
+
+def _vocabulary(size: int) -> list[str]:
+    return [f"w{i}" for i in range(size)]
+
+
+def _memories(count: int, vocab: list[str], rng: random.Random) -> list[Memory]:
+    # Weight word i by 1/(i+1) so a few terms are common and most are rare.
+    weights = [1.0 / (i + 1) for i in range(len(vocab))]
+    memories = []
+    for n in range(count):
+        words = rng.choices(vocab, weights=weights, k=rng.randint(8, 24))
+        memories.append(
+            Memory(
+                id=f"mem-{n:08d}",
+                project_id="proj",
+                content=" ".join(words),
+                topic=_TOPICS[n % len(_TOPICS)],
+                group="default",
+                created_at="2026-01-01T00:00:00Z",
+                updated_at="2026-01-01T00:00:00Z",
+            )
+        )
+    return memories
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _run(size: int, queries: int, rng: random.Random) -> None:
+    vocab = _vocabulary(50_000)
+    memories = _memories(size, vocab, rng)
+
+    start = time.perf_counter()
+    index = BM25Index(memories)
+    build = time.perf_counter() - start
+
+    # Mix of rare and mid-frequency terms, two or three per query.
+    latencies = []
+    for _ in range(queries):
+        terms = rng.sample(vocab[50:20_000], k=rng.randint(2, 3))
+        start = time.perf_counter()
+        index.search(" ".join(terms), limit=10)
+        latencies.append(time.perf_counter() - start)
+
+    updates = min(1_000, size)
+    start = time.perf_counter()
+    for memory in memories[:updates]:
+        index.add(memory)
+    update = (time.perf_counter() - start) / updates
+
+    print(
+        f"{size:>9} memories: build {size / build:10,.0f} memories/s | "
+        f"query p50 {statistics.median(latencies) * 1e6:8.0f} us, "
+        f"p99 {_percentile(latencies, 0.99) * 1e6:8.0f} us | "
+        f"update {update * 1e6:6.1f} us"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200, help="queries per size")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for size in args.sizes:
+        _run(size, args.queries, rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Bytes on the wire versus CPU cost of request-body compression.
+
+Builds representative `ConversationInput` add bodies (chat turns with tool calls whose
+JSON arguments and results dominate the payload) and reports encoded size and
+compression time for each available codec.
+
+Run with ``uv run python benchmarks/bench_compression.py [--turns N] [--repeat N]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+from functools import partial
+
+from engram._compression import Compression, compress_body, zstd_available
+from engram._models import ConversationInput, MessageInput, ToolCallFuncInput, ToolCallInput
+from engram._serialization import encode_add_body
+
+
+def _conversation(turns: int) -> ConversationInput:
+    messages = [
+        MessageInput(role="system", content="You are a helpful coding assistant. " * 40),
+    ]
+    for i in range(turns):
+        arguments = json.dumps(
+            {
+                "query": f"open issues assigned to user {i % 7}",
+                "filters": {"state": "open", "labels": ["bug", "triage"], "limit": 50},
+                "fields": ["id", "title", "assignee", "created_at", "updated_at"],
+            },
+            indent=2,
+        )
+        result = json.dumps(
+            [
+                {"id": n, "title": f"Issue {n}", "assignee": f"user{i % 7}", "state": "open"}
+                for n in range(20)
+            ]
+        )
+        messages += [
+            MessageInput(role="user", content=f"What is left on my plate for sprint {i}?"),
+            MessageInput(
+                role="assistant",
+                tool_calls=[
+                    ToolCallInput(
+                        id=f"call_{i}",
+                        function=ToolCallFuncInput(name="search_issues", arguments=arguments),
+                    )
+                ],
+            ),
+            MessageInput(role="tool", tool_call_id=f"call_{i}", content=result),
+            MessageInput(role="assistant", content=f"You have 20 open issues in sprint {i}."),
+        ]
+    return ConversationInput(messages=messages)
+
+
+def _time(fn: Callable[[], bytes], repeat: int) -> tuple[bytes, float]:
+    out = fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return out, (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20, help="timed repetitions")
+    parser.add_argument("--turns", type=int, nargs="+", default=[5, 50, 500])
+    args = parser.parse_args()
+
+    codecs: list[Compression] = ["gzip", "zstd"] if zstd_available() else ["gzip"]
+    print(f"{'turns':>6} {'codec':>6} {'raw B':>10} {'wire B':>10} {'ratio':>7} {'ms':>8}")
+    for turns in args.turns:
+        body = encode_add_body(
+            _conversation(turns), user_id="user_123", conversation_id="c1", group=None
+        )
+        print(f"{turns:>6} {'none':>6} {len(body):>10} {len(body):>10} {1:>7.2f} {0:>8.3f}")
+        for codec in codecs:
+            wire, seconds = _time(partial(compress_body, body, codec), args.repeat)
+            print(
+                f"{turns:>6} {codec:>6} {len(body):>10} {len(wire):>10} "
+                f"{len(body) / len(wire):>7.2f} {seconds * 1000:>8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
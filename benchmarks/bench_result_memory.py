@@ -0,0 +1,95 @@
+"""Bytes retained per cached memory for parsed and compacted search results.
+
+Run with ``uv run python benchmarks/bench_result_memory.py [--rows N] [--sets N]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from engram._models import Memory, SearchResults
+from engram._serialization import parse_search_results
+
+
+def _response_bytes(rows: int, offset: int) -> bytes:
+    memories = [
+        {
+            "id": f"mem-{offset}-{i:08d}",
+            "project_id": "proj-7f3a2c",
+            "content": f"User {i % 50} prefers async Python and avoids Java ({offset}:{i}).",
+            "topic": ("preferences", "work", "tools")[i % 3],
+            "group": "default",
+            "created_at": "2026-01-01T00:00:00Z",
+            "updated_at": "2026-01-02T00:00:00Z",
+            "user_id": "user_123",
+            "score": 1.0 / (i + 1),
+        }
+        for i in range(rows)
+    ]
+    return json.dumps({"memories": memories, "total": rows}).encode()
+
+
+def _parse_uninterned(data: dict[str, Any]) -> SearchResults:
+    """The pre-interning parser, kept here as the baseline."""
+    return SearchResults(
+        memories=[
+            Memory(
+                id=m["id"],
+                project_id=m["project_id"],
+                content=m["content"],
+                topic=m["topic"],
+                group=m["group"],
+                created_at=m["created_at"],
+                updated_at=m["updated_at"],
+                user_id=m.get("user_id"),
+                conversation_id=m.get("conversation_id"),
+                tags=m.get("tags"),
+                score=m.get("score"),
+            )
+            for m in data["memories"]
+        ],
+        total=data["total"],
+    )
+
+
+def _measure(payloads: list[bytes], build: Callable[[dict[str, Any]], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    cache = [build(json.loads(p)) for p in payloads]
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cache
+    return retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100, help="memories per result set")
+    parser.add_argument("--sets", type=int, default=200, help="cached result sets")
+    args = parser.parse_args()
+
+    payloads = [_response_bytes(args.rows, n) for n in range(args.sets)]
+    total = args.rows * args.sets
+    variants: list[tuple[str, Callable[[dict[str, Any]], object]]] = [
+        ("baseline", _parse_uninterned),
+        ("interned", parse_search_results),
+        ("compact", lambda data: parse_search_results(data).compact()),
+    ]
+    baseline = 0
+    for name, build in variants:
+        retained = _measure(payloads, build)
+        baseline = baseline or retained
+        print(
+            f"{name:>9}: {retained / total:8.1f} B/memory "
+            f"({retained / baseline:6.1%} of baseline, {total} memories)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,27 @@
+from ._bm25 import BM25Index
+from ._cache import (
+    BackendEntry,
+    CacheBackend,
+    CacheStats,
+    MemoryCache,
+    SearchCache,
+    SQLiteCacheBackend,
+)
+from ._compaction import CompactionReport, ConversationCompactor
+from ._dedup import AddDeduplicator, DedupStats
 from ._models import (
+    AddItem,
+    AddResult,
     CommittedOperation,
     CommittedOperations,
+    CompactSearchResults,
+    CompositeRun,
     ConversationInput,
     Memory,
     MessageInput,
     PreExtractedInput,
     PreExtractedItem,
+    RawConversationInput,
     RetrievalConfig,
     Run,
     RunStatus,
@@ -15,41 +31,96 @@ from ._models import (
     ToolCallFuncInput,
     ToolCallInput,
 )
+from ._overlay import WriteOverlay
+from ._resources import (
+    AsyncConversationSession,
+    AsyncOrderedAddExecutor,
+    AsyncScopeMirror,
+    AsyncWriteBuffer,
+    ConversationSession,
+    OrderedAddExecutor,
+    ScopeMirror,
+    WriteBuffer,
+)
+from ._response import AsyncRawResponse, RawResponse
+from ._splitting import AddSplitting
+from ._spool import AddSpool, SpoolStats
+from ._throttle import RunThrottle, ThrottleStats
 from .async_client import AsyncEngramClient
 from .client import EngramClient
 from .errors import (
+    AddManyError,
+    AddSkippedError,
     APIError,
     AuthenticationError,
     ConnectionError,
     EngramError,
     EngramTimeoutError,
+    SplitAddError,
     ValidationError,
 )
+from .types import LoopBlockingStats
 from .version import __version__
 
 __all__ = [
     "APIError",
+    "AddDeduplicator",
+    "AddItem",
+    "AddManyError",
+    "AddResult",
+    "AddSkippedError",
+    "AddSplitting",
+    "AddSpool",
+    "AsyncConversationSession",
     "AsyncEngramClient",
+    "AsyncOrderedAddExecutor",
+    "AsyncRawResponse",
+    "AsyncScopeMirror",
+    "AsyncWriteBuffer",
     "AuthenticationError",
+    "BM25Index",
+    "BackendEntry",
+    "CacheBackend",
+    "CacheStats",
     "CommittedOperation",
     "CommittedOperations",
+    "CompactSearchResults",
+    "CompactionReport",
+    "CompositeRun",
     "ConnectionError",
+    "ConversationSession",
+    "ConversationCompactor",
     "ConversationInput",
+    "DedupStats",
     "EngramClient",
     "EngramError",
     "EngramTimeoutError",
+    "LoopBlockingStats",
     "Memory",
+    "MemoryCache",
     "MessageInput",
+    "OrderedAddExecutor",
     "PreExtractedInput",
     "PreExtractedItem",
+    "RawConversationInput",
+    "RawResponse",
     "RetrievalConfig",
     "Run",
     "RunStatus",
+    "RunThrottle",
+    "SQLiteCacheBackend",
+    "SearchCache",
+    "ScopeMirror",
     "SearchResults",
+    "SplitAddError",
+    "SpoolStats",
     "StringInput",
+    "ThrottleStats",
     "ToolCallCustomInput",
     "ToolCallFuncInput",
     "ToolCallInput",
     "ValidationError",
+    "WriteBuffer",
+    "WriteOverlay",
     "__version__",
 ]
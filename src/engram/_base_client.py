@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 from collections.abc import Mapping
+from concurrent.futures import Executor
 
+from ._compression import DEFAULT_COMPRESSION_THRESHOLD, Compression, validate_compression
 from .errors import ValidationError
 from .types import ClientConfig
 from .version import __version__
 
 DEFAULT_BASE_URL = "https://api.engram.weaviate.io"
 DEFAULT_TIMEOUT = 30.0
+DEFAULT_DECODE_OFFLOAD_THRESHOLD = 256 * 1024
 
 
 class _BaseClient:
@@ -20,9 +23,16 @@ class _BaseClient:
         api_key: str,
         headers: Mapping[str, str] | None = None,
         timeout: float = DEFAULT_TIMEOUT,
+        decode_offload_threshold: int | None = None,
+        decode_executor: Executor | None = None,
+        compression: Compression | None = None,
+        compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
     ) -> None:
         if timeout <= 0:
             raise ValidationError("Timeout must be greater than 0.")
+        if decode_offload_threshold is not None and decode_offload_threshold < 0:
+            raise ValidationError("decode_offload_threshold must not be negative.")
+        validate_compression(compression, compression_threshold)
 
         normalized_base_url = base_url.rstrip("/")
         default_headers = _build_headers(api_key=api_key, header_overrides=headers or {})
@@ -32,6 +42,10 @@ class _BaseClient:
             timeout=timeout,
             headers=default_headers,
             api_key=api_key,
+            decode_offload_threshold=decode_offload_threshold,
+            decode_executor=decode_executor,
+            compression=compression,
+            compression_threshold=compression_threshold,
         )
 
     @property
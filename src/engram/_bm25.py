@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import replace
+from uuid import UUID
+
+from ._models import Memory, SearchResults
+from .errors import ValidationError
+
+_TOKEN = re.compile(r"\w+")
+_MAX_TF = 0xFFFF
+# Compact postings once tombstoned slots outnumber live documents (and are not trivial).
+_MIN_COMPACT_SLOTS = 1024
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.casefold())
+
+
+def _terms(memory: Memory) -> Counter[str]:
+    terms = Counter(tokenize(memory.content))
+    terms.update(tokenize(memory.topic))
+    return terms
+
+
+class _Postings:
+    """Document slots and term frequencies for one term, in two typed arrays."""
+
+    __slots__ = ("slots", "tfs")
+
+    def __init__(self) -> None:
+        self.slots = array("I")
+        self.tfs = array("H")
+
+
+class BM25Index:
+    """In-memory BM25 keyword index over `Memory.content` and `Memory.topic`.
+
+    Memories are added and removed by ID; adding an ID that is already indexed replaces
+    it. `search()` returns `SearchResults` whose memories carry the local BM25 score, so
+    a ``"bm25"`` search can be answered without the server when it is slow or
+    unavailable. Scores are comparable within one index, not with server scores.
+
+    Postings are kept in compact typed arrays. Removed memories are tombstoned and
+    skipped, and the postings are rewritten once tombstones outnumber live memories.
+    """
+
+    def __init__(
+        self, memories: Iterable[Memory] = (), *, k1: float = 1.2, b: float = 0.75
+    ) -> None:
+        if k1 < 0 or not 0 <= b <= 1:
+            raise ValidationError("k1 must not be negative and b must be between 0 and 1.")
+        self._k1 = k1
+        self._b = b
+        self._postings: dict[str, _Postings] = {}
+        self._doc_freq: Counter[str] = Counter()
+        self._memories: list[Memory | None] = []
+        self._lengths = array("I")
+        self._slot_by_id: dict[str, int] = {}
+        self._total_length = 0
+        self.add_many(memories)
+
+    def __len__(self) -> int:
+        return len(self._slot_by_id)
+
+    def __contains__(self, memory_id: object) -> bool:
+        return str(memory_id) in self._slot_by_id
+
+    def __iter__(self) -> Iterator[Memory]:
+        return (m for m in self._memories if m is not None)
+
+    def add(self, memory: Memory) -> None:
+        if memory.id in self._slot_by_id:
+            self._remove(memory.id)
+            self._maybe_compact()
+        terms = _terms(memory)
+        slot = len(self._memories)
+        self._memories.append(memory)
+        length = sum(terms.values())
+        self._lengths.append(length)
+        self._total_length += length
+        self._slot_by_id[memory.id] = slot
+        postings = self._postings
+        for term, tf in terms.items():
+            entry = postings.get(term)
+            if entry is None:
+                entry = postings[term] = _Postings()
+            entry.slots.append(slot)
+            entry.tfs.append(min(tf, _MAX_TF))
+        self._doc_freq.update(terms.keys())
+
+    def add_many(self, memories: Iterable[Memory]) -> None:
+        for memory in memories:
+            self.add(memory)
+
+    def remove(self, memory_id: str | UUID) -> bool:
+        """Remove a memory; returns False if it was not indexed."""
+        if str(memory_id) not in self._slot_by_id:
+            return False
+        self._remove(str(memory_id))
+        self._maybe_compact()
+        return True
+
+    def get(self, memory_id: str | UUID) -> Memory | None:
+        slot = self._slot_by_id.get(str(memory_id))
+        return None if slot is None else self._memories[slot]
+
+    def search(
+        self,
+        query: str,
+        *,
+        limit: int | None = 10,
+        topics: list[str] | None = None,
+    ) -> SearchResults:
+        """Rank memories matching any query term; `total` counts every match."""
+        live = len(self._slot_by_id)
+        if not live:
+            return SearchResults([], 0)
+        k1 = self._k1
+        b = self._b
+        avg_length = self._total_length / live or 1.0
+        memories = self._memories
+        lengths = self._lengths
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            entry = self._postings.get(term)
+            if entry is None:
+                continue
+            df = self._doc_freq[term]
+            idf = math.log(1.0 + (live - df + 0.5) / (df + 0.5))
+            for slot, tf in zip(entry.slots, entry.tfs, strict=True):
+                if memories[slot] is None:
+                    continue
+                norm = k1 * (1.0 - b + b * lengths[slot] / avg_length)
+                scores[slot] = scores.get(slot, 0.0) + idf * tf * (k1 + 1.0) / (tf + norm)
+        if topics is not None:
+            wanted = set(topics)
+            scores = {
+                slot: score
+                for slot, score in scores.items()
+                if (memory := memories[slot]) is not None and memory.topic in wanted
+            }
+        if limit is None:
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        hits = []
+        for slot, score in ranked:
+            memory = memories[slot]
+            assert memory is not None
+            hits.append(replace(memory, score=score))
+        return SearchResults(hits, len(scores))
+
+    def _remove(self, memory_id: str) -> None:
+        slot = self._slot_by_id.pop(memory_id)
+        memory = self._memories[slot]
+        assert memory is not None
+        self._memories[slot] = None
+        self._total_length -= self._lengths[slot]
+        self._doc_freq.subtract(_terms(memory).keys())
+
+    def _maybe_compact(self) -> None:
+        dead = len(self._memories) - len(self._slot_by_id)
+        if dead >= _MIN_COMPACT_SLOTS and dead > len(self._slot_by_id):
+            self._compact()
+
+    def _compact(self) -> None:
+        live = [m for m in self._memories if m is not None]
+        self._postings = {}
+        self._doc_freq = Counter()
+        self._memories = []
+        self._lengths = array("I")
+        self._slot_by_id = {}
+        self._total_length = 0
+        self.add_many(live)
@@ -0,0 +1,18 @@
+from ._backend import BackendEntry, CacheBackend
+from ._memory import CachedMemory, MemoryCache, memory_cache_key
+from ._search import SearchCache, search_cache_key, search_scope
+from ._sqlite import SQLiteCacheBackend
+from ._stats import CacheStats
+
+__all__ = [
+    "BackendEntry",
+    "CacheBackend",
+    "CacheStats",
+    "CachedMemory",
+    "MemoryCache",
+    "SQLiteCacheBackend",
+    "SearchCache",
+    "memory_cache_key",
+    "search_cache_key",
+    "search_scope",
+]
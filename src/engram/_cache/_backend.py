@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Protocol
+
+
+@dataclass(slots=True)
+class BackendEntry:
+    """A serialized cache entry as stored by a `CacheBackend`.
+
+    `stored_at` is wall-clock time (``time.time()``) so it is meaningful across
+    processes. `scope` and `tag` are optional secondary keys used for bulk invalidation
+    (the search scope and the memory ID respectively).
+    """
+
+    key: str
+    value: bytes
+    stored_at: float
+    scope: str | None = None
+    tag: str | None = None
+
+
+class CacheBackend(Protocol):
+    """Storage behind `SearchCache` and `MemoryCache`, shared beyond one process.
+
+    The in-process caches keep their own LRU of decoded objects and fall back to the
+    backend on a miss. Entries live in a `namespace` (one per cache type) and expire at
+    `expires_at` (wall-clock seconds).
+    """
+
+    def get(self, namespace: str, key: str) -> BackendEntry | None: ...
+
+    def set(self, namespace: str, entry: BackendEntry, *, expires_at: float) -> None: ...
+
+    def delete(self, namespace: str, key: str) -> None: ...
+
+    def delete_scope(self, namespace: str, scope: str) -> int: ...
+
+    def delete_tag(self, namespace: str, tag: str) -> int: ...
+
+    def scan(self, namespace: str, limit: int) -> Iterator[BackendEntry]:
+        """Yield up to `limit` unexpired entries, most recently stored first."""
+        ...
+
+    def clear(self, namespace: str) -> None: ...
+
+    def close(self) -> None: ...
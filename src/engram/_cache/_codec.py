@@ -0,0 +1,146 @@
+"""Compact binary encoding of cached `Memory` rows for persistent cache backends.
+
+Layout (little-endian): a format byte, then for each memory its nine string fields as
+``u32 length + UTF-8`` (length 0xFFFFFFFF encodes None), its tags as a ``u32`` count
+(0xFFFFFFFF for None) followed by strings, and its score as a flag byte plus ``f64``.
+"""
+
+from __future__ import annotations
+
+import struct
+import sys
+
+from .._models import Memory, SearchResults
+
+_FORMAT = 1
+_NONE = 0xFFFFFFFF
+_U32 = struct.Struct("<I")
+_F64 = struct.Struct("<d")
+_RESULTS_HEADER = struct.Struct("<BqI")
+_ENTRY_HEADER = struct.Struct("<B")
+
+
+def _write_str(out: bytearray, value: str | None) -> None:
+    if value is None:
+        out += _U32.pack(_NONE)
+        return
+    data = value.encode("utf-8")
+    out += _U32.pack(len(data))
+    out += data
+
+
+def _read_str(data: bytes, offset: int) -> tuple[str | None, int]:
+    (length,) = _U32.unpack_from(data, offset)
+    offset += 4
+    if length == _NONE:
+        return None, offset
+    end = offset + length
+    return data[offset:end].decode("utf-8"), end
+
+
+def _read_required(data: bytes, offset: int) -> tuple[str, int]:
+    value, offset = _read_str(data, offset)
+    if value is None:
+        raise ValueError("Corrupt cache entry: missing required field")
+    return value, offset
+
+
+def _write_memory(out: bytearray, memory: Memory) -> None:
+    for value in (
+        memory.id,
+        memory.project_id,
+        memory.content,
+        memory.topic,
+        memory.group,
+        memory.created_at,
+        memory.updated_at,
+        memory.user_id,
+        memory.conversation_id,
+    ):
+        _write_str(out, value)
+    if memory.tags is None:
+        out += _U32.pack(_NONE)
+    else:
+        out += _U32.pack(len(memory.tags))
+        for tag in memory.tags:
+            _write_str(out, tag)
+    if memory.score is None:
+        out.append(0)
+    else:
+        out.append(1)
+        out += _F64.pack(memory.score)
+
+
+def _read_memory(data: bytes, offset: int) -> tuple[Memory, int]:
+    memory_id, offset = _read_required(data, offset)
+    project_id, offset = _read_required(data, offset)
+    content, offset = _read_required(data, offset)
+    topic, offset = _read_required(data, offset)
+    group, offset = _read_required(data, offset)
+    created_at, offset = _read_required(data, offset)
+    updated_at, offset = _read_required(data, offset)
+    user_id, offset = _read_str(data, offset)
+    conversation_id, offset = _read_str(data, offset)
+    (tag_count,) = _U32.unpack_from(data, offset)
+    offset += 4
+    tags: list[str] | None = None
+    if tag_count != _NONE:
+        tags = []
+        for _ in range(tag_count):
+            tag, offset = _read_required(data, offset)
+            tags.append(tag)
+    score: float | None = None
+    has_score = data[offset]
+    offset += 1
+    if has_score:
+        (score,) = _F64.unpack_from(data, offset)
+        offset += 8
+    memory = Memory(
+        id=memory_id,
+        project_id=sys.intern(project_id),
+        content=content,
+        topic=sys.intern(topic),
+        group=sys.intern(group),
+        created_at=created_at,
+        updated_at=updated_at,
+        user_id=sys.intern(user_id) if user_id is not None else None,
+        conversation_id=sys.intern(conversation_id) if conversation_id is not None else None,
+        tags=tags,
+        score=score,
+    )
+    return memory, offset
+
+
+def encode_results(results: SearchResults) -> bytes:
+    out = bytearray(_RESULTS_HEADER.pack(_FORMAT, results.total, len(results)))
+    for memory in results:
+        _write_memory(out, memory)
+    return bytes(out)
+
+
+def decode_results(data: bytes) -> SearchResults:
+    version, total, count = _RESULTS_HEADER.unpack_from(data, 0)
+    if version != _FORMAT:
+        raise ValueError(f"Unsupported cache entry format {version}")
+    offset = _RESULTS_HEADER.size
+    memories = []
+    for _ in range(count):
+        memory, offset = _read_memory(data, offset)
+        memories.append(memory)
+    return SearchResults(memories, total)
+
+
+def encode_memory_entry(memory: Memory, etag: str | None) -> bytes:
+    out = bytearray(_ENTRY_HEADER.pack(_FORMAT))
+    _write_str(out, etag)
+    _write_memory(out, memory)
+    return bytes(out)
+
+
+def decode_memory_entry(data: bytes) -> tuple[Memory, str | None]:
+    (version,) = _ENTRY_HEADER.unpack_from(data, 0)
+    if version != _FORMAT:
+        raise ValueError(f"Unsupported cache entry format {version}")
+    etag, offset = _read_str(data, _ENTRY_HEADER.size)
+    memory, _ = _read_memory(data, offset)
+    return memory, etag
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import json
+import struct
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Any, TypeVar
+from uuid import UUID
+
+from .._models import Memory, copy_memory
+from ..errors import APIError, ValidationError
+from ._backend import BackendEntry, CacheBackend
+from ._codec import decode_memory_entry, encode_memory_entry
+from ._stats import CacheStats
+
+_NAMESPACE = "memories"
+_T = TypeVar("_T")
+
+
+def memory_cache_key(memory_id: str | UUID, user_id: str | None, group: str | None) -> str:
+    return json.dumps([str(memory_id), user_id, group], separators=(",", ":"))
+
+
+@dataclass(slots=True)
+class CachedMemory:
+    """A cache lookup result.
+
+    `memory` is None for a cached 404, in which case `error` holds the original error.
+    `fresh` is False once the TTL has passed and the entry needs revalidation.
+    """
+
+    memory: Memory | None
+    etag: str | None
+    fresh: bool
+    error: APIError | None = None
+
+
+@dataclass(slots=True)
+class _Entry:
+    memory_id: str
+    memory: Memory | None
+    etag: str | None
+    stored_at: float
+    error: APIError | None = None
+
+
+class MemoryCache:
+    """Bounded LRU cache for `memories.get`, keyed by memory ID plus (`user_id`, `group`).
+
+    Entries are served without a request for `ttl` seconds. After that the client
+    revalidates them: with ``If-None-Match`` when the server sent an ``ETag``, otherwise
+    by refetching and keeping the cached object if `updated_at` is unchanged. 404
+    responses are remembered for `negative_ttl` seconds (0 disables negative caching).
+    `memories.delete` evicts the ID immediately.
+
+    With a `backend` (e.g. `SQLiteCacheBackend`) fetched memories are also written to it
+    for `ttl` seconds and in-memory misses fall back to it, so other processes and later
+    runs can reuse them. 404s are only remembered in memory.
+
+    When `client.runs.get`/`wait` sees a finished run, the memories it created, updated
+    or deleted are evicted. With `prefetch_created=True` the created memories of a run
+    this client started are then fetched into the cache under its `user_id` and the
+    `group` it was added to.
+
+    Pass an instance as `memory_cache=` to `EngramClient` or `AsyncEngramClient`. The
+    cache keeps its own copy of each memory and every hit returns a fresh copy.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 4096,
+        ttl: float = 60.0,
+        negative_ttl: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+        backend: CacheBackend | None = None,
+        prefetch_created: bool = False,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValidationError("max_entries must be greater than 0.")
+        if ttl <= 0:
+            raise ValidationError("ttl must be greater than 0.")
+        if negative_ttl < 0:
+            raise ValidationError("negative_ttl must not be negative.")
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._keys_by_id: dict[str, set[str]] = {}
+        self._stats = CacheStats()
+        self._backend = backend
+        self._warmed = False
+        self.prefetch_created = prefetch_created
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return replace(self._stats)
+
+    def get(self, key: str) -> CachedMemory | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = self._clock() - entry.stored_at
+                if entry.memory is not None:
+                    self._entries.move_to_end(key)
+                    return self._hit(entry, age)
+                if age <= self._negative_ttl:
+                    self._entries.move_to_end(key)
+                    self._stats.negative_hits += 1
+                    return CachedMemory(memory=None, etag=None, fresh=True, error=entry.error)
+                self._remove(key)
+                self._stats.expirations += 1
+            if self._backend is None:
+                self._stats.misses += 1
+                return None
+        backend = self._backend
+        loaded = self._call_backend(backend.get, _NAMESPACE, key)
+        decoded = self._decode(loaded) if loaded is not None else None
+        if decoded is None:
+            with self._lock:
+                self._stats.misses += 1
+            return None
+        entry = decoded
+        self._store(key, entry)
+        with self._lock:
+            self._stats.backend_hits += 1
+            return self._hit(entry, self._clock() - entry.stored_at)
+
+    def put(self, key: str, memory: Memory, etag: str | None = None) -> None:
+        self._store(key, _Entry(memory.id, copy_memory(memory), etag, self._clock()))
+        self._persist(key, memory, etag)
+
+    def warm(self, limit: int | None = None) -> int:
+        """Load the most recently stored backend entries into memory; returns how many.
+
+        The client calls this once at startup; later calls on the same cache do nothing.
+        """
+        if self._backend is None or self._warmed:
+            return 0
+        self._warmed = True
+        limit = self._max_entries if limit is None else min(limit, self._max_entries)
+        backend = self._backend
+        rows = self._call_backend(lambda: list(backend.scan(_NAMESPACE, limit))) or []
+        loaded = 0
+        # Oldest first, so the newest entries end up most recently used.
+        for row in reversed(rows):
+            entry = self._decode(row)
+            if entry is not None and row.key not in self._entries:
+                self._store(row.key, entry)
+                loaded += 1
+        return loaded
+
+    def put_missing(self, key: str, memory_id: str | UUID, error: APIError) -> None:
+        if self._negative_ttl > 0:
+            self._store(key, _Entry(str(memory_id), None, None, self._clock(), error))
+
+    def revalidated(self, key: str, *, changed: bool) -> None:
+        """Restart the TTL of a stale entry the server confirmed is unchanged."""
+        with self._lock:
+            self._stats.refreshes += 1
+            entry = self._entries.get(key)
+            if entry is None or changed:
+                return
+            self._stats.not_modified += 1
+            entry.stored_at = self._clock()
+        if entry.memory is not None:
+            self._persist(key, entry.memory, entry.etag)
+
+    def evict(self, memory_id: str | UUID) -> int:
+        """Drop every cached entry (any scope) for `memory_id`; returns how many."""
+        with self._lock:
+            keys = self._keys_by_id.get(str(memory_id), set()).copy()
+            for key in keys:
+                self._remove(key)
+            self._stats.invalidations += len(keys)
+        if self._backend is not None:
+            self._call_backend(self._backend.delete_tag, _NAMESPACE, str(memory_id))
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_id.clear()
+            self._stats.entries = 0
+        if self._backend is not None:
+            self._call_backend(self._backend.clear, _NAMESPACE)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _hit(self, entry: _Entry, age: float) -> CachedMemory:
+        fresh = age <= self._ttl
+        if fresh:
+            self._stats.hits += 1
+        else:
+            self._stats.stale_hits += 1
+        memory = None if entry.memory is None else copy_memory(entry.memory)
+        return CachedMemory(memory=memory, etag=entry.etag, fresh=fresh)
+
+    def _persist(self, key: str, memory: Memory, etag: str | None) -> None:
+        if self._backend is None:
+            return
+        now = time.time()
+        row = BackendEntry(
+            key=key,
+            value=encode_memory_entry(memory, etag),
+            stored_at=now,
+            tag=memory.id,
+        )
+        self._call_backend(self._backend.set, _NAMESPACE, row, expires_at=now + self._ttl)
+
+    def _decode(self, row: BackendEntry) -> _Entry | None:
+        age = max(0.0, time.time() - row.stored_at)
+        if age > self._ttl:
+            return None
+        try:
+            memory, etag = decode_memory_entry(row.value)
+        except (ValueError, struct.error, UnicodeDecodeError):
+            with self._lock:
+                self._stats.backend_errors += 1
+            return None
+        return _Entry(memory.id, memory, etag, self._clock() - age)
+
+    def _call_backend(self, method: Callable[..., _T], *args: Any, **kwargs: Any) -> _T | None:
+        try:
+            return method(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._stats.backend_errors += 1
+            return None
+
+    def _store(self, key: str, entry: _Entry) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._keys_by_id.setdefault(entry.memory_id, set()).add(key)
+            self._stats.entries += 1
+            while len(self._entries) > self._max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        keys = self._keys_by_id[entry.memory_id]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_id[entry.memory_id]
+        self._stats.entries -= 1
@@ -0,0 +1,399 @@
+from __future__ import annotations
+
+import json
+import random
+import struct
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, replace
+from typing import Any, TypeVar
+
+from .._models import SearchResults, copy_results
+from ..errors import ValidationError
+from ._backend import BackendEntry, CacheBackend
+from ._codec import decode_results, encode_results
+from ._similarity import Signature, distance, minhash, query_shingles
+from ._stats import CacheStats
+
+Scope = tuple[str | None, str | None]
+_T = TypeVar("_T")
+
+_NAMESPACE = "search"
+
+# Rough fixed cost of a Memory object and its short fields, on top of its content.
+_MEMORY_OVERHEAD_BYTES = 400
+
+
+def search_cache_key(body: Mapping[str, Any]) -> str:
+    """Canonical cache key for a body produced by `build_search_body`.
+
+    Query whitespace and case are normalized and topics are treated as a set, so
+    trivially different spellings of the same search share an entry.
+    """
+    normalized = dict(body)
+    normalized["query"] = " ".join(str(body["query"]).split()).casefold()
+    topics = normalized.get("topics")
+    if topics is not None:
+        normalized["topics"] = sorted(set(topics))
+    return json.dumps(normalized, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def search_scope(body: Mapping[str, Any]) -> Scope:
+    return body.get("user_id"), body.get("group")
+
+
+def _encode_scope(scope: Scope) -> str:
+    return json.dumps(list(scope), separators=(",", ":"))
+
+
+def _decode_scope(value: str | None) -> Scope:
+    if value is None:
+        return None, None
+    user_id, group = json.loads(value)
+    return user_id, group
+
+
+def _near_fields(key: str) -> tuple[str, Signature] | None:
+    """The scope (everything but the query) and query fingerprint of a cache key."""
+    body = json.loads(key)
+    signature = minhash(query_shingles(body.pop("query")))
+    if signature is None:
+        return None
+    return json.dumps(body, sort_keys=True, separators=(",", ":")), signature
+
+
+def estimate_results_size(results: SearchResults) -> int:
+    return sum(_MEMORY_OVERHEAD_BYTES + len(m.content) + len(m.id) + len(m.topic) for m in results)
+
+
+@dataclass(slots=True)
+class _Entry:
+    results: SearchResults
+    scope: Scope
+    size: int
+    stored_at: float
+    near: tuple[str, Signature] | None = None
+
+
+@dataclass(slots=True)
+class _Partition:
+    keys: OrderedDict[str, None]
+    bytes: int = 0
+
+
+class SearchCache:
+    """In-memory LRU cache for `memories.search` results.
+
+    Entries are bounded globally by `max_entries`/`max_bytes` and, optionally, per
+    (`user_id`, `group`) scope by `max_entries_per_scope`/`max_bytes_per_scope`; the
+    least recently used entry is evicted first. An entry is fresh for `ttl` seconds.
+    For a further `stale_while_revalidate` seconds it is still served, and the client
+    refreshes it in the background.
+
+    Pass an instance as `search_cache=` to `EngramClient` or `AsyncEngramClient`. The
+    cache is thread-safe. It stores its own copy of each result and every hit returns a
+    fresh copy, so callers may modify what they get back.
+
+    With a `backend` (e.g. `SQLiteCacheBackend`) every stored result is also written to
+    it, in-memory misses fall back to it, and the client warm-loads the most recent
+    entries at startup, so results survive restarts and are shared between processes.
+    Backend failures are counted in `stats.backend_errors` and otherwise ignored.
+
+    Set `max_query_distance` (0-1, e.g. 0.5) to also serve rephrased queries: on an
+    exact miss, the cached query with the same scope, topics and retrieval config whose
+    words are closest (MinHash estimate of Jaccard distance, stopwords ignored) is
+    returned if it is within the distance. A `verify_near_hits` fraction of those hits
+    is reported as stale so the client fetches the exact query in the background;
+    `stats.mean_near_distance` and `stats.mean_near_overlap` show how good the
+    approximate hits are, to tune the threshold.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        max_bytes: int = 32 * 1024 * 1024,
+        ttl: float = 30.0,
+        stale_while_revalidate: float = 0.0,
+        max_entries_per_scope: int | None = None,
+        max_bytes_per_scope: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        backend: CacheBackend | None = None,
+        max_query_distance: float | None = None,
+        verify_near_hits: float = 0.0,
+    ) -> None:
+        if max_entries <= 0 or max_bytes <= 0:
+            raise ValidationError("max_entries and max_bytes must be greater than 0.")
+        if ttl <= 0:
+            raise ValidationError("ttl must be greater than 0.")
+        if stale_while_revalidate < 0:
+            raise ValidationError("stale_while_revalidate must not be negative.")
+        if max_query_distance is not None and not 0 <= max_query_distance < 1:
+            raise ValidationError("max_query_distance must be at least 0 and less than 1.")
+        if not 0 <= verify_near_hits <= 1:
+            raise ValidationError("verify_near_hits must be between 0 and 1.")
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._swr = stale_while_revalidate
+        self._scope_max_entries = max_entries_per_scope
+        self._scope_max_bytes = max_bytes_per_scope
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._partitions: dict[Scope, _Partition] = {}
+        self._refreshing: set[str] = set()
+        self._stats = CacheStats()
+        self._backend = backend
+        self._warmed = False
+        self._max_distance = max_query_distance
+        self._verify_rate = verify_near_hits
+        self._near_index: dict[str, dict[str, Signature]] = {}
+        # Keys served by a near-duplicate hit and awaiting their exact results.
+        self._near_pending: dict[str, frozenset[str]] = {}
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return replace(self._stats)
+
+    def get(self, key: str) -> tuple[SearchResults, bool] | None:
+        """Return ``(results, stale)`` for `key`, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = self._clock() - entry.stored_at
+                if age <= self._ttl + self._swr:
+                    self._touch(key, entry)
+                    return self._hit(entry.results, age)
+                self._remove(key)
+                self._stats.expirations += 1
+        loaded = self._load(key) if self._backend is not None else None
+        with self._lock:
+            if loaded is not None:
+                scope, results, age = loaded
+                self._insert(key, scope, results, self._clock() - age)
+                self._stats.backend_hits += 1
+                return self._hit(results, age)
+            near = self._get_near(key) if self._max_distance is not None else None
+            if near is None:
+                self._stats.misses += 1
+            return near
+
+    def put(self, key: str, scope: Scope, results: SearchResults) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+            served = self._near_pending.pop(key, None)
+            if served is not None:
+                exact = {m.id for m in results}
+                union = served | exact
+                self._stats.near_verified += 1
+                self._stats.near_overlap_total += len(served & exact) / len(union) if union else 1.0
+            self._insert(key, scope, copy_results(results, results.total), self._clock())
+        if self._backend is not None:
+            now = time.time()
+            entry = BackendEntry(
+                key=key,
+                value=encode_results(results),
+                stored_at=now,
+                scope=_encode_scope(scope),
+            )
+            self._call_backend(
+                self._backend.set, _NAMESPACE, entry, expires_at=now + self._ttl + self._swr
+            )
+
+    def warm(self, limit: int | None = None) -> int:
+        """Load the most recently stored backend entries into memory; returns how many.
+
+        The client calls this once at startup; later calls on the same cache do nothing.
+        """
+        if self._backend is None or self._warmed:
+            return 0
+        self._warmed = True
+        limit = self._max_entries if limit is None else min(limit, self._max_entries)
+        backend = self._backend
+        entries = self._call_backend(lambda: list(backend.scan(_NAMESPACE, limit))) or []
+        loaded = 0
+        # Oldest first, so the newest entries end up most recently used.
+        for entry in reversed(entries):
+            decoded = self._decode(entry)
+            if decoded is None:
+                continue
+            scope, results, age = decoded
+            with self._lock:
+                if entry.key not in self._entries:
+                    self._insert(entry.key, scope, results, self._clock() - age)
+                    loaded += 1
+        return loaded
+
+    def begin_refresh(self, key: str) -> bool:
+        """Claim the background refresh of a stale entry; False if one is in flight."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self._stats.refreshes += 1
+            return True
+
+    def refresh_failed(self, key: str) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+            self._near_pending.pop(key, None)
+            self._stats.refresh_errors += 1
+
+    def invalidate_scope(self, user_id: str | None, group: str | None) -> int:
+        """Drop every entry for the (`user_id`, `group`) scope.
+
+        Returns how many in-memory entries were dropped; backend rows for the scope are
+        deleted as well.
+        """
+        with self._lock:
+            partition = self._partitions.get((user_id, group))
+            keys = list(partition.keys) if partition is not None else []
+            for key in keys:
+                self._remove(key)
+            self._stats.invalidations += len(keys)
+        if self._backend is not None:
+            self._call_backend(
+                self._backend.delete_scope, _NAMESPACE, _encode_scope((user_id, group))
+            )
+        return len(keys)
+
+    def invalidate_user(self, user_id: str | None) -> int:
+        """Drop every entry for `user_id`, whatever its group.
+
+        Used when a run's group is not known. Backend rows are deleted for the scopes
+        held in memory and the scope without a group.
+        """
+        with self._lock:
+            scopes = {scope for scope in self._partitions if scope[0] == user_id}
+        scopes.add((user_id, None))
+        return sum(self.invalidate_scope(*scope) for scope in scopes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._partitions.clear()
+            self._refreshing.clear()
+            self._near_index.clear()
+            self._near_pending.clear()
+            self._stats.entries = 0
+            self._stats.bytes = 0
+        if self._backend is not None:
+            self._call_backend(self._backend.clear, _NAMESPACE)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _hit(self, results: SearchResults, age: float) -> tuple[SearchResults, bool]:
+        self._stats.hits += 1
+        stale = age > self._ttl
+        if stale:
+            self._stats.stale_hits += 1
+        return copy_results(results, results.total), stale
+
+    def _get_near(self, key: str) -> tuple[SearchResults, bool] | None:
+        assert self._max_distance is not None
+        near = _near_fields(key)
+        if near is None:
+            return None
+        near_scope, signature = near
+        best: tuple[float, str] | None = None
+        for other, other_signature in self._near_index.get(near_scope, {}).items():
+            d = distance(signature, other_signature)
+            if d <= self._max_distance and (best is None or d < best[0]):
+                best = (d, other)
+        if best is None:
+            return None
+        d, other = best
+        entry = self._entries[other]
+        age = self._clock() - entry.stored_at
+        if age > self._ttl + self._swr:
+            return None
+        self._touch(other, entry)
+        self._stats.near_hits += 1
+        self._stats.near_distance_total += d
+        results, stale = self._hit(entry.results, age)
+        if self._verify_rate and random.random() < self._verify_rate:
+            self._near_pending[key] = frozenset(m.id for m in results)
+            stale = True
+        return results, stale
+
+    def _insert(self, key: str, scope: Scope, results: SearchResults, stored_at: float) -> None:
+        if key in self._entries:
+            self._remove(key)
+        size = estimate_results_size(results)
+        if size > self._max_bytes:
+            return
+        near = _near_fields(key) if self._max_distance is not None else None
+        self._entries[key] = _Entry(
+            results=results, scope=scope, size=size, stored_at=stored_at, near=near
+        )
+        if near is not None:
+            self._near_index.setdefault(near[0], {})[key] = near[1]
+        partition = self._partitions.setdefault(scope, _Partition(keys=OrderedDict()))
+        partition.keys[key] = None
+        partition.bytes += size
+        self._stats.entries += 1
+        self._stats.bytes += size
+        self._enforce_scope_quota(scope, partition)
+        while len(self._entries) > self._max_entries or self._stats.bytes > self._max_bytes:
+            self._evict(next(iter(self._entries)))
+
+    def _load(self, key: str) -> tuple[Scope, SearchResults, float] | None:
+        assert self._backend is not None
+        entry = self._call_backend(self._backend.get, _NAMESPACE, key)
+        return None if entry is None else self._decode(entry)
+
+    def _decode(self, entry: BackendEntry) -> tuple[Scope, SearchResults, float] | None:
+        age = max(0.0, time.time() - entry.stored_at)
+        if age > self._ttl + self._swr:
+            return None
+        try:
+            return _decode_scope(entry.scope), decode_results(entry.value), age
+        except (ValueError, struct.error, UnicodeDecodeError):
+            with self._lock:
+                self._stats.backend_errors += 1
+            return None
+
+    def _call_backend(self, method: Callable[..., _T], *args: Any, **kwargs: Any) -> _T | None:
+        try:
+            return method(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._stats.backend_errors += 1
+            return None
+
+    def _touch(self, key: str, entry: _Entry) -> None:
+        self._entries.move_to_end(key)
+        self._partitions[entry.scope].keys.move_to_end(key)
+
+    def _enforce_scope_quota(self, scope: Scope, partition: _Partition) -> None:
+        max_entries = self._scope_max_entries
+        max_bytes = self._scope_max_bytes
+        while partition.keys and (
+            (max_entries is not None and len(partition.keys) > max_entries)
+            or (max_bytes is not None and partition.bytes > max_bytes)
+        ):
+            self._evict(next(iter(partition.keys)))
+
+    def _evict(self, key: str) -> None:
+        self._remove(key)
+        self._stats.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        if entry.near is not None:
+            signatures = self._near_index[entry.near[0]]
+            del signatures[key]
+            if not signatures:
+                del self._near_index[entry.near[0]]
+        partition = self._partitions[entry.scope]
+        del partition.keys[key]
+        partition.bytes -= entry.size
+        if not partition.keys:
+            del self._partitions[entry.scope]
+        self._stats.entries -= 1
+        self._stats.bytes -= entry.size
@@ -0,0 +1,46 @@
+"""MinHash fingerprints of search queries, used by `SearchCache` for near-duplicate hits."""
+
+from __future__ import annotations
+
+import hashlib
+import random
+
+from .._bm25 import tokenize
+
+# Words that carry no meaning in a memory lookup; dropping them keeps rephrasings close.
+_STOPWORDS = frozenset(
+    "a about an and are as at be by can do does for from has have how i in is it its me "
+    "my of on or our should that the their them they this to was we what when where "
+    "which who why will with you your".split()
+)
+
+_NUM_PERM = 64
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = tuple(
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(_NUM_PERM)
+)
+
+Signature = tuple[int, ...]
+
+
+def query_shingles(query: str) -> frozenset[str]:
+    """Word shingles of a query with stopwords removed."""
+    return frozenset(w for w in tokenize(query) if w not in _STOPWORDS)
+
+
+def minhash(shingles: frozenset[str]) -> Signature | None:
+    """MinHash signature of `shingles`, or None when there is nothing to compare."""
+    if not shingles:
+        return None
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little")
+        for s in shingles
+    ]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def distance(left: Signature, right: Signature) -> float:
+    """Estimated Jaccard distance (0 = same words, 1 = disjoint) of two signatures."""
+    same = sum(1 for x, y in zip(left, right, strict=True) if x == y)
+    return 1.0 - same / _NUM_PERM
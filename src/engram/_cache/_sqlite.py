@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+
+from ..errors import ValidationError
+from ._backend import BackendEntry
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    scope TEXT,
+    tag TEXT,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_scope ON entries (namespace, scope);
+CREATE INDEX IF NOT EXISTS entries_tag ON entries (namespace, tag);
+CREATE INDEX IF NOT EXISTS entries_stored_at ON entries (stored_at);
+"""
+
+# Expired rows and the size budget are enforced every this many writes, not per write.
+_MAINTENANCE_INTERVAL = 64
+
+
+class SQLiteCacheBackend:
+    """`CacheBackend` stored in a SQLite database, shared by every process that opens it.
+
+    The database runs in WAL mode, so readers never block the writer and several
+    worker processes can use the same file. Values are the compact binary rows written
+    by `SearchCache`/`MemoryCache`. Expired rows are purged, and once the stored values
+    exceed `max_bytes` the oldest are dropped first.
+
+    Pass an instance as ``backend=`` to `SearchCache` and/or `MemoryCache`; one backend
+    can serve both. Call `close()` when the caches are no longer used.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        max_bytes: int = 256 * 1024 * 1024,
+        busy_timeout: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValidationError("max_bytes must be greater than 0.")
+        self._max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(
+            os.fspath(path),
+            timeout=busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, namespace: str, key: str) -> BackendEntry | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at, scope, tag FROM entries"
+                " WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (namespace, key, self._clock()),
+            ).fetchone()
+        if row is None:
+            return None
+        return BackendEntry(key=key, value=row[0], stored_at=row[1], scope=row[2], tag=row[3])
+
+    def set(self, namespace: str, entry: BackendEntry, *, expires_at: float) -> None:
+        if len(entry.value) > self._max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries"
+                " (namespace, key, scope, tag, value, size, stored_at, expires_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    namespace,
+                    entry.key,
+                    entry.scope,
+                    entry.tag,
+                    entry.value,
+                    len(entry.value),
+                    entry.stored_at,
+                    expires_at,
+                ),
+            )
+            self._writes += 1
+            if self._writes % _MAINTENANCE_INTERVAL == 0:
+                self._maintain()
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+
+    def delete_scope(self, namespace: str, scope: str) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM entries WHERE namespace = ? AND scope = ?", (namespace, scope)
+            )
+            return cursor.rowcount
+
+    def delete_tag(self, namespace: str, tag: str) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM entries WHERE namespace = ? AND tag = ?", (namespace, tag)
+            )
+            return cursor.rowcount
+
+    def scan(self, namespace: str, limit: int) -> Iterator[BackendEntry]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value, stored_at, scope, tag FROM entries"
+                " WHERE namespace = ? AND expires_at > ? ORDER BY stored_at DESC LIMIT ?",
+                (namespace, self._clock(), limit),
+            ).fetchall()
+        for key, value, stored_at, scope, tag in rows:
+            yield BackendEntry(key=key, value=value, stored_at=stored_at, scope=scope, tag=tag)
+
+    def clear(self, namespace: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+
+    def purge(self) -> None:
+        """Drop expired rows and enforce `max_bytes` now rather than on a later write."""
+        with self._lock:
+            self._maintain()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _maintain(self) -> None:
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM entries WHERE expires_at <= ?", (self._clock(),))
+            (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+            if total > self._max_bytes:
+                # Delete the oldest rows until the running total fits the budget.
+                excess = total - self._max_bytes
+                conn.execute(
+                    "DELETE FROM entries WHERE (namespace, key) IN ("
+                    " SELECT namespace, key FROM ("
+                    "  SELECT namespace, key,"
+                    "   SUM(size) OVER (ORDER BY stored_at, namespace, key) AS running"
+                    "  FROM entries)"
+                    " WHERE running - size < ?)",
+                    (excess,),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def __enter__(self) -> SQLiteCacheBackend:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
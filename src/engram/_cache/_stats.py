@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Counters for a client-side cache. Read a snapshot via the cache's `stats`."""
+
+    hits: int = 0
+    misses: int = 0
+    stale_hits: int = 0
+    negative_hits: int = 0
+    not_modified: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+    backend_hits: int = 0
+    backend_errors: int = 0
+    near_hits: int = 0
+    near_distance_total: float = 0.0
+    near_verified: int = 0
+    near_overlap_total: float = 0.0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def mean_near_distance(self) -> float:
+        """Average query distance of near-duplicate hits (lower is closer)."""
+        return self.near_distance_total / self.near_hits if self.near_hits else 0.0
+
+    @property
+    def mean_near_overlap(self) -> float:
+        """How well verified near-duplicate hits matched the exact query's results.
+
+        Each verified hit contributes the Jaccard overlap of the two memory ID sets.
+        """
+        return self.near_overlap_total / self.near_verified if self.near_verified else 0.0
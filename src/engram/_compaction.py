@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, replace
+from typing import Any
+
+from ._models import AddInput, ConversationInput, MessageInput, ToolCallInput
+from .errors import ValidationError
+
+_CONTEXT_ROLES = ("system", "developer")
+_TRAILING_SPACE = re.compile(r"[ \t]+$", re.MULTILINE)
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+@dataclass(slots=True)
+class CompactionReport:
+    """What compaction did to one request, or (as `ConversationCompactor.stats`) to all.
+
+    Sizes are UTF-8 bytes of message content and tool-call arguments.
+    """
+
+    conversations: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    messages_removed: int = 0
+    outputs_truncated: int = 0
+    arguments_minified: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    def _merge(self, other: CompactionReport) -> None:
+        self.conversations += other.conversations
+        self.bytes_before += other.bytes_before
+        self.bytes_after += other.bytes_after
+        self.messages_removed += other.messages_removed
+        self.outputs_truncated += other.outputs_truncated
+        self.arguments_minified += other.arguments_minified
+
+
+def _size(text: str) -> int:
+    return len(text.encode())
+
+
+def _message_size(message: MessageInput) -> int:
+    size = _size(message.content)
+    for call in message.tool_calls or ():
+        if call.function is not None:
+            size += _size(call.function.arguments)
+        if call.custom is not None:
+            size += _size(call.custom.input)
+    return size
+
+
+class ConversationCompactor:
+    """Shrinks conversation inputs before `memories.add` uploads them.
+
+    Pass an instance as `conversation_compactor=` to `EngramClient` or
+    `AsyncEngramClient`; it then applies to every `ConversationInput` and message-dict
+    list sent with `memories.add`. Each step can be turned off:
+
+    - `dedupe_context`: drop system and developer messages identical to an earlier one.
+    - `minify_arguments`: re-encode tool-call argument JSON without whitespace.
+    - `max_tool_output`: cut tool results longer than this many characters to their
+      start and end, with a marker noting how much was left out (None keeps them).
+    - `strip_whitespace`: trim message content, trailing spaces on each line, and runs
+      of blank lines.
+
+    Every request's `CompactionReport` is passed to `on_report`, and `stats` totals them.
+    Generator-backed conversations are compacted as they are sent, so their report is
+    complete once the request has been made.
+    """
+
+    def __init__(
+        self,
+        *,
+        dedupe_context: bool = True,
+        minify_arguments: bool = True,
+        max_tool_output: int | None = 4000,
+        strip_whitespace: bool = True,
+        on_report: Callable[[CompactionReport], None] | None = None,
+    ) -> None:
+        if max_tool_output is not None and max_tool_output < 64:
+            raise ValidationError("max_tool_output must be at least 64 characters.")
+        self.dedupe_context = dedupe_context
+        self.minify_arguments = minify_arguments
+        self.max_tool_output = max_tool_output
+        self.strip_whitespace = strip_whitespace
+        self._on_report = on_report
+        self._lock = threading.Lock()
+        self._stats = CompactionReport()
+
+    @property
+    def stats(self) -> CompactionReport:
+        with self._lock:
+            return replace(self._stats)
+
+    def compact(self, input_data: AddInput) -> tuple[AddInput, CompactionReport]:
+        """Return the compacted input and its report; other input types pass through.
+
+        For generator-backed conversations the report fills in as the result is consumed.
+        """
+        if not isinstance(input_data, ConversationInput | list):
+            return input_data, CompactionReport()
+        report = CompactionReport(conversations=1)
+        if isinstance(input_data, ConversationInput):
+            messages: Iterable[MessageInput] = self._compact_messages(input_data.messages, report)
+            if isinstance(input_data.messages, Sequence):
+                messages = list(messages)
+            return replace(input_data, messages=messages), report
+        return list(self._compact_dicts(input_data, report)), report
+
+    def record(self, report: CompactionReport) -> None:
+        """Add a finished request's report to `stats` and pass it to `on_report`."""
+        if not report.conversations:
+            return
+        with self._lock:
+            self._stats._merge(report)
+        if self._on_report is not None:
+            self._on_report(report)
+
+    def _text(self, text: str, role: str, report: CompactionReport) -> str:
+        if self.strip_whitespace:
+            text = _BLANK_LINES.sub("\n\n", _TRAILING_SPACE.sub("", text)).strip()
+        limit = self.max_tool_output
+        if role == "tool" and limit is not None and len(text) > limit:
+            head = limit * 2 // 3
+            tail = limit - head
+            omitted = len(text) - head - tail
+            text = f"{text[:head]}\n[… {omitted} characters truncated …]\n{text[-tail:]}"
+            report.outputs_truncated += 1
+        return text
+
+    def _arguments(self, arguments: str, report: CompactionReport) -> str:
+        try:
+            minified = json.dumps(json.loads(arguments), separators=(",", ":"), ensure_ascii=False)
+        except ValueError:
+            return arguments
+        if len(minified) < len(arguments):
+            report.arguments_minified += 1
+            return minified
+        return arguments
+
+    def _tool_calls(
+        self, calls: list[ToolCallInput] | None, report: CompactionReport
+    ) -> list[ToolCallInput] | None:
+        if not calls or not self.minify_arguments:
+            return calls
+        return [
+            replace(
+                call,
+                function=replace(
+                    call.function, arguments=self._arguments(call.function.arguments, report)
+                ),
+            )
+            if call.function is not None
+            else call
+            for call in calls
+        ]
+
+    def _compact_messages(
+        self, messages: Iterable[MessageInput], report: CompactionReport
+    ) -> Iterator[MessageInput]:
+        seen: set[tuple[str, str]] = set()
+        for message in messages:
+            report.bytes_before += _message_size(message)
+            if self.dedupe_context and message.role in _CONTEXT_ROLES:
+                key = (message.role, message.content)
+                if key in seen:
+                    report.messages_removed += 1
+                    continue
+                seen.add(key)
+            compacted = replace(
+                message,
+                content=self._text(message.content, message.role, report),
+                tool_calls=self._tool_calls(message.tool_calls, report),
+            )
+            report.bytes_after += _message_size(compacted)
+            yield compacted
+
+    def _compact_dicts(
+        self, messages: list[dict[str, Any]], report: CompactionReport
+    ) -> Iterator[dict[str, Any]]:
+        seen: set[tuple[str, str]] = set()
+        for message in messages:
+            role = message.get("role", "")
+            content = message.get("content")
+            if not isinstance(content, str):
+                yield message
+                continue
+            report.bytes_before += _size(content)
+            if self.dedupe_context and role in _CONTEXT_ROLES:
+                if (role, content) in seen:
+                    report.messages_removed += 1
+                    continue
+                seen.add((role, content))
+            content = self._text(content, role, report)
+            report.bytes_after += _size(content)
+            yield {**message, "content": content}
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import gzip
+import importlib
+from collections.abc import Callable
+from typing import Literal, TypeAlias
+
+from .errors import ValidationError
+
+Compression: TypeAlias = Literal["gzip", "zstd"]
+
+DEFAULT_COMPRESSION_THRESHOLD = 1024
+
+
+def _load_zstd() -> Callable[[bytes], bytes] | None:
+    # Prefer the stdlib module (Python 3.14+), then the optional `zstandard` package.
+    try:
+        stdlib_zstd = importlib.import_module("compression.zstd")
+    except ImportError:
+        pass
+    else:
+        compress: Callable[[bytes], bytes] = stdlib_zstd.compress
+        return compress
+    try:
+        zstandard = importlib.import_module("zstandard")
+    except ImportError:
+        return None
+
+    def compress_with_zstandard(data: bytes) -> bytes:
+        # ZstdCompressor instances are not thread-safe; they are cheap to create.
+        result: bytes = zstandard.ZstdCompressor().compress(data)
+        return result
+
+    return compress_with_zstandard
+
+
+_zstd_compress = _load_zstd()
+
+
+def zstd_available() -> bool:
+    return _zstd_compress is not None
+
+
+def validate_compression(compression: Compression | None, threshold: int) -> None:
+    if compression not in (None, "gzip", "zstd"):
+        raise ValidationError(f"Unsupported compression: {compression!r}.")
+    if compression == "zstd" and not zstd_available():
+        raise ValidationError(
+            "zstd compression requires Python 3.14+ or the 'zstandard' package "
+            "(pip install zstandard)."
+        )
+    if threshold < 0:
+        raise ValidationError("compression_threshold must not be negative.")
+
+
+def compress_body(data: bytes, compression: Compression) -> bytes:
+    if compression == "gzip":
+        return gzip.compress(data, mtime=0)
+    if _zstd_compress is None:
+        raise ValidationError("zstd compression is not available.")
+    return _zstd_compress(data)
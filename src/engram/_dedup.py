@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, replace
+from typing import Any, TypeVar
+
+from ._cache import BackendEntry, CacheBackend
+from ._models import AddInput, ConversationInput, PreExtractedInput, RawConversationInput, Run
+from ._serialization._builders import _serialize_input
+from ._splitting import split_run_id
+from .errors import ValidationError
+
+_NAMESPACE = "adds"
+_T = TypeVar("_T")
+
+
+def _replayable(input_data: AddInput) -> bool:
+    """Whether hashing `input_data` leaves it intact for the request that follows."""
+    if isinstance(input_data, PreExtractedInput):
+        return isinstance(input_data.items, Sequence)
+    if isinstance(input_data, ConversationInput):
+        return isinstance(input_data.messages, Sequence)
+    return True
+
+
+@dataclass(slots=True)
+class DedupStats:
+    """Counters for an `AddDeduplicator`. Read a snapshot via its `stats`."""
+
+    checks: int = 0
+    duplicates: int = 0
+    recorded: int = 0
+    forgotten: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    backend_hits: int = 0
+    backend_errors: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def skip_rate(self) -> float:
+        return self.duplicates / self.checks if self.checks else 0.0
+
+
+@dataclass(slots=True)
+class _Entry:
+    run: Run
+    recorded_at: float
+
+
+class AddDeduplicator:
+    """Skips `memories.add` calls that repeat an earlier add within `window` seconds.
+
+    Pass an instance as `add_dedup=` to `EngramClient` or `AsyncEngramClient`. Each add
+    is keyed by a `digest_size`-byte BLAKE2b hash of its canonical request input plus
+    (`user_id`, `conversation_id`, `group`). A repeat returns the earlier `Run` without
+    a request. Adds whose run fails (as seen by `runs.get`/`wait`) are forgotten so they
+    can be retried, as are inputs backed by one-shot iterables, which are never hashed.
+
+    At most `max_entries` keys are kept in LRU order. Each costs about `digest_size`
+    bytes plus the run ID, and the chance that a new add is wrongly skipped is roughly
+    ``entries / 2 ** (8 * digest_size)`` (see `false_positive_rate`). With a `backend`
+    (e.g. `SQLiteCacheBackend`) keys are also persisted for `window` seconds, so repeats
+    are caught across processes and restarts.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: float = 600.0,
+        max_entries: int = 100_000,
+        digest_size: int = 16,
+        clock: Callable[[], float] = time.monotonic,
+        backend: CacheBackend | None = None,
+    ) -> None:
+        if window <= 0 or max_entries <= 0:
+            raise ValidationError("window and max_entries must be greater than 0.")
+        if not 8 <= digest_size <= 64:
+            raise ValidationError("digest_size must be between 8 and 64 bytes.")
+        self._window = window
+        self._max_entries = max_entries
+        self._digest_size = digest_size
+        self._clock = clock
+        self._backend = backend
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[bytes, _Entry] = OrderedDict()
+        self._keys_by_run: dict[str, bytes] = {}
+        self._stats = DedupStats()
+
+    @property
+    def stats(self) -> DedupStats:
+        with self._lock:
+            return replace(self._stats)
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Estimated chance that the next new add collides with a remembered one."""
+        return len(self._entries) / 2.0 ** (8 * self._digest_size)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(
+        self,
+        input_data: AddInput,
+        *,
+        user_id: str | None,
+        conversation_id: str | None,
+        group: str | None,
+    ) -> bytes | None:
+        """Digest of an add, or None if its input cannot be hashed without consuming it."""
+        if not _replayable(input_data):
+            return None
+        raw = b""
+        if isinstance(input_data, RawConversationInput):
+            # Hash the pre-encoded messages as they are instead of decoding them; the JSON
+            # array before them is self-delimiting, so the two parts cannot run together.
+            raw = input_data.messages
+            payload: dict[str, Any] = {
+                "raw_conversation": [
+                    input_data.metadata,
+                    input_data.created_at,
+                    input_data.updated_at,
+                ]
+            }
+        else:
+            payload = _serialize_input(input_data)
+        canonical = json.dumps(
+            [user_id, conversation_id, group, payload],
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        )
+        digest = hashlib.blake2b(canonical.encode(), digest_size=self._digest_size)
+        digest.update(raw)
+        return digest.digest()
+
+    def lookup(self, key: bytes) -> Run | None:
+        """The run of an earlier add with this key, if it is within the window."""
+        with self._lock:
+            self._stats.checks += 1
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._clock() - entry.recorded_at <= self._window:
+                    self._entries.move_to_end(key)
+                    self._stats.duplicates += 1
+                    return entry.run
+                self._remove(key)
+                self._stats.expirations += 1
+        if self._backend is None:
+            return None
+        row = self._call_backend(self._backend.get, _NAMESPACE, key.hex())
+        entry = self._decode(row) if row is not None else None
+        if entry is None:
+            return None
+        self._store(key, entry)
+        with self._lock:
+            self._stats.duplicates += 1
+            self._stats.backend_hits += 1
+        return entry.run
+
+    def record(self, key: bytes, run: Run) -> None:
+        """Remember an accepted add; failed runs are not remembered."""
+        if run.status == "failed":
+            return
+        self._store(key, _Entry(run, self._clock()))
+        with self._lock:
+            self._stats.recorded += 1
+        self._persist(key, run, age=0.0)
+
+    def forget(self, run_id: str) -> bool:
+        """Drop the add that started `run_id` (or a part of it, for a `CompositeRun`)."""
+        with self._lock:
+            key = self._keys_by_run.get(run_id)
+            if key is not None:
+                self._remove(key)
+                self._stats.forgotten += 1
+        if self._backend is not None:
+            self._call_backend(self._backend.delete_tag, _NAMESPACE, run_id)
+        return key is not None
+
+    def rekey(self, run_id: str, run: Run) -> None:
+        """Point the add that returned `run_id` at `run`, e.g. a spooled add's real run.
+
+        A failed `run` forgets the add instead, so it can be retried.
+        """
+        if run.status == "failed":
+            self.forget(run_id)
+            return
+        with self._lock:
+            key = self._keys_by_run.get(run_id)
+            entry = self._entries.get(key) if key is not None else None
+        if key is None or entry is None:
+            return
+        self._store(key, _Entry(run, entry.recorded_at))
+        if self._backend is not None:
+            self._call_backend(self._backend.delete_tag, _NAMESPACE, run_id)
+            self._persist(key, run, age=max(0.0, self._clock() - entry.recorded_at))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_run.clear()
+            self._stats.entries = 0
+            self._stats.bytes = 0
+        if self._backend is not None:
+            self._call_backend(self._backend.clear, _NAMESPACE)
+
+    def _persist(self, key: bytes, run: Run, *, age: float) -> None:
+        """Write an add recorded `age` seconds ago to the backend, if there is one."""
+        if self._backend is None:
+            return
+        stored_at = time.time() - age
+        row = BackendEntry(
+            key=key.hex(),
+            value=json.dumps([run.run_id, run.status, run.error]).encode(),
+            stored_at=stored_at,
+            tag=run.run_id,
+        )
+        self._call_backend(self._backend.set, _NAMESPACE, row, expires_at=stored_at + self._window)
+
+    def _store(self, key: bytes, entry: _Entry) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            for run_id in split_run_id(entry.run.run_id):
+                self._keys_by_run[run_id] = key
+            self._stats.entries += 1
+            self._stats.bytes += self._entry_size(entry)
+            while len(self._entries) > self._max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def _remove(self, key: bytes) -> None:
+        entry = self._entries.pop(key)
+        for run_id in split_run_id(entry.run.run_id):
+            if self._keys_by_run.get(run_id) == key:
+                del self._keys_by_run[run_id]
+        self._stats.entries -= 1
+        self._stats.bytes -= self._entry_size(entry)
+
+    def _entry_size(self, entry: _Entry) -> int:
+        return self._digest_size + len(entry.run.run_id)
+
+    def _decode(self, row: BackendEntry) -> _Entry | None:
+        age = max(0.0, time.time() - row.stored_at)
+        if age > self._window:
+            return None
+        try:
+            run_id, status, error = json.loads(row.value)
+        except (ValueError, TypeError):
+            with self._lock:
+                self._stats.backend_errors += 1
+            return None
+        return _Entry(Run(run_id=run_id, status=status, error=error), self._clock() - age)
+
+    def _call_backend(self, method: Callable[..., _T], *args: Any, **kwargs: Any) -> _T | None:
+        try:
+            return method(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._stats.backend_errors += 1
+            return None
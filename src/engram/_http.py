@@ -1,13 +1,22 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
-from typing import Any
+import asyncio
+import functools
+import time
+from collections.abc import AsyncIterable, Callable, Iterable, Mapping
+from typing import Any, TypeVar
 
 import httpx
 
+from ._compression import compress_body
+from ._serialization import encode_json
 from .errors import APIError, AuthenticationError
 from .errors import ConnectionError as EngramConnectionError
-from .types import ClientConfig
+from .types import ClientConfig, LoopBlockingStats
+
+_T = TypeVar("_T")
+
+RequestContent = bytes | Iterable[bytes] | AsyncIterable[bytes]
 
 
 class HttpTransport:
@@ -29,13 +38,59 @@ class HttpTransport:
         *,
         params: Mapping[str, Any] | None = None,
         json: Any | None = None,
+        content: RequestContent | None = None,
     ) -> dict[str, Any]:
-        req = self.build_request(method, path, params=params, json=json)
+        response = self.send(method, path, params=params, json=json, content=content)
+        return _process_response(response)
+
+    def send(
+        self,
+        method: str,
+        path: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        params: Mapping[str, Any] | None = None,
+        json: Any | None = None,
+        content: RequestContent | None = None,
+    ) -> httpx.Response:
+        """Send a request and return the read response; error statuses are raised."""
+        req = self.build_request(
+            method, path, headers=headers, params=params, json=json, content=content
+        )
         try:
             response = self._http_client.send(req)
         except httpx.ConnectError as exc:
             raise EngramConnectionError(str(exc)) from exc
-        return _process_response(response)
+        if response.status_code >= 400:
+            _process_response(response)
+        return response
+
+    def stream(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Mapping[str, Any] | None = None,
+        json: Any | None = None,
+        content: RequestContent | None = None,
+    ) -> httpx.Response:
+        """Send a request and return the response with its body still unread.
+
+        Error responses are read and raised exactly like `request()`. The caller owns
+        the returned response and must close it.
+        """
+        req = self.build_request(method, path, params=params, json=json, content=content)
+        try:
+            response = self._http_client.send(req, stream=True)
+        except httpx.ConnectError as exc:
+            raise EngramConnectionError(str(exc)) from exc
+        if response.status_code >= 400:
+            try:
+                response.read()
+            finally:
+                response.close()
+            _process_response(response)
+        return response
 
     def build_request(
         self,
@@ -45,10 +100,12 @@ class HttpTransport:
         headers: Mapping[str, str] | None = None,
         params: Mapping[str, Any] | None = None,
         json: Any | None = None,
+        content: RequestContent | None = None,
     ) -> httpx.Request:
         merged_headers = dict(self._config.headers)
         if headers:
             merged_headers.update(headers)
+        json, content = _compress_request_body(self._config, merged_headers, json, content)
         clean_path = path.lstrip("/")
         url = f"{self._config.base_url}/{clean_path}" if clean_path else self._config.base_url
         return self._http_client.build_request(
@@ -57,16 +114,24 @@ class HttpTransport:
             headers=merged_headers,
             params=params,
             json=json,
+            content=content,
         )
 
 
 class AsyncHttpTransport:
-    """Wraps an async httpx.AsyncClient and handles request building and response processing."""
+    """Wraps an async httpx.AsyncClient and handles request building and response processing.
+
+    Response bodies larger than `config.decode_offload_threshold` bytes are decoded and
+    parsed in `config.decode_executor` (the loop's default executor when unset) so that
+    large payloads do not stall other coroutines. Time spent on the loop is recorded in
+    `loop_stats`.
+    """
 
     def __init__(self, config: ClientConfig, http_client: httpx.AsyncClient | None = None) -> None:
         self._config = config
         self._owns_http_client = http_client is None
         self._http_client = http_client or httpx.AsyncClient(timeout=config.timeout)
+        self.loop_stats = LoopBlockingStats()
 
     async def close(self) -> None:
         if self._owns_http_client:
@@ -79,13 +144,152 @@ class AsyncHttpTransport:
         *,
         params: Mapping[str, Any] | None = None,
         json: Any | None = None,
+        content: RequestContent | None = None,
     ) -> dict[str, Any]:
-        req = self.build_request(method, path, params=params, json=json)
+        return await self.request_model(
+            method, path, _identity, params=params, json=json, content=content
+        )
+
+    async def send(
+        self,
+        method: str,
+        path: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        params: Mapping[str, Any] | None = None,
+        json: Any | None = None,
+        content: RequestContent | None = None,
+    ) -> httpx.Response:
+        """Send a request and return the read response; error statuses are raised."""
+        return await self.send_model(
+            method,
+            path,
+            _same_response,
+            headers=headers,
+            params=params,
+            json=json,
+            content=content,
+        )
+
+    async def send_model(
+        self,
+        method: str,
+        path: str,
+        parser: Callable[[httpx.Response], _T],
+        *,
+        headers: Mapping[str, str] | None = None,
+        params: Mapping[str, Any] | None = None,
+        json: Any | None = None,
+        content: RequestContent | None = None,
+    ) -> _T:
+        """Like `request_model`, but `parser` gets the response itself (status, headers).
+
+        Error statuses are raised before `parser` runs.
+        """
+        req, inline = self._timed_build(
+            method, path, headers=headers, params=params, json=json, content=content
+        )
+        response = await self._send(req, inline)
+        return await self._decode(response, functools.partial(_parse_read, parser=parser), inline)
+
+    async def request_model(
+        self,
+        method: str,
+        path: str,
+        parser: Callable[[dict[str, Any]], _T],
+        *,
+        params: Mapping[str, Any] | None = None,
+        json: Any | None = None,
+        content: RequestContent | None = None,
+    ) -> _T:
+        """Send a request and run `parser` over the decoded body, off the loop if large.
+
+        The encoding and any inline decoding are recorded in `loop_stats` as one inline
+        call per request.
+        """
+        req, inline = self._timed_build(method, path, params=params, json=json, content=content)
+        response = await self._send(req, inline)
+        return await self._decode(
+            response, functools.partial(_decode_response, parser=parser), inline
+        )
+
+    async def stream(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Mapping[str, Any] | None = None,
+        json: Any | None = None,
+        content: RequestContent | None = None,
+    ) -> httpx.Response:
+        """Send a request and return the response with its body still unread.
+
+        Error responses are read and raised exactly like `request()`. The caller owns
+        the returned response and must close it.
+        """
+        req, inline = self._timed_build(method, path, params=params, json=json, content=content)
+        response = await self._send(req, inline, stream=True)
+        if response.status_code < 400:
+            self.loop_stats.record_inline(inline)
+            return response
         try:
-            response = await self._http_client.send(req)
+            await response.aread()
+        except BaseException:
+            self.loop_stats.record_inline(inline)
+            raise
+        finally:
+            await response.aclose()
+        await self._decode(response, _process_response, inline)
+        return response
+
+    def _timed_build(
+        self,
+        method: str,
+        path: str,
+        **kwargs: Any,
+    ) -> tuple[httpx.Request, float]:
+        start = time.perf_counter()
+        req = self.build_request(method, path, **kwargs)
+        return req, time.perf_counter() - start
+
+    async def _send(
+        self, req: httpx.Request, inline: float, *, stream: bool = False
+    ) -> httpx.Response:
+        """Send `req`; on failure the request's `inline` loop time is recorded here."""
+        try:
+            return await self._http_client.send(req, stream=stream)
         except httpx.ConnectError as exc:
+            self.loop_stats.record_inline(inline)
             raise EngramConnectionError(str(exc)) from exc
-        return _process_response(response)
+        except BaseException:
+            self.loop_stats.record_inline(inline)
+            raise
+
+    async def _decode(
+        self, response: httpx.Response, decode: Callable[[httpx.Response], _T], inline: float
+    ) -> _T:
+        """Run `decode` over a read response, in the executor if the body is large.
+
+        `inline` is the loop time the request has taken so far; it is recorded, with
+        any inline decoding, as the request's one inline call.
+        """
+        threshold = self._config.decode_offload_threshold
+        start = time.perf_counter()
+        try:
+            if threshold is not None and len(response.content) > threshold:
+                loop = asyncio.get_running_loop()
+                try:
+                    return await loop.run_in_executor(
+                        self._config.decode_executor, decode, response
+                    )
+                finally:
+                    self.loop_stats.record_offloaded(time.perf_counter() - start)
+            try:
+                return decode(response)
+            finally:
+                inline += time.perf_counter() - start
+        finally:
+            self.loop_stats.record_inline(inline)
 
     def build_request(
         self,
@@ -95,10 +299,12 @@ class AsyncHttpTransport:
         headers: Mapping[str, str] | None = None,
         params: Mapping[str, Any] | None = None,
         json: Any | None = None,
+        content: RequestContent | None = None,
     ) -> httpx.Request:
         merged_headers = dict(self._config.headers)
         if headers:
             merged_headers.update(headers)
+        json, content = _compress_request_body(self._config, merged_headers, json, content)
         clean_path = path.lstrip("/")
         url = f"{self._config.base_url}/{clean_path}" if clean_path else self._config.base_url
         return self._http_client.build_request(
@@ -107,9 +313,48 @@ class AsyncHttpTransport:
             headers=merged_headers,
             params=params,
             json=json,
+            content=content,
         )
 
 
+def _compress_request_body(
+    config: ClientConfig,
+    headers: dict[str, str],
+    json: Any | None,
+    content: RequestContent | None,
+) -> tuple[Any | None, RequestContent | None]:
+    """Compress in-memory bodies above the configured threshold.
+
+    Streamed (iterable) bodies are sent as-is because their size is not known upfront.
+    """
+    if config.compression is None:
+        return json, content
+    if json is not None and content is None:
+        json, content = None, encode_json(json)
+    if isinstance(content, bytes) and len(content) > config.compression_threshold:
+        content = compress_body(content, config.compression)
+        headers["Content-Encoding"] = config.compression
+    return json, content
+
+
+def _identity(data: dict[str, Any]) -> dict[str, Any]:
+    return data
+
+
+def _decode_response(response: httpx.Response, parser: Callable[[dict[str, Any]], _T]) -> _T:
+    return parser(_process_response(response))
+
+
+def _parse_read(response: httpx.Response, parser: Callable[[httpx.Response], _T]) -> _T:
+    if response.status_code >= 400:
+        _process_response(response)
+    return parser(response)
+
+
+def _same_response(response: httpx.Response) -> httpx.Response:
+    return response
+
+
 def _process_response(response: httpx.Response) -> dict[str, Any]:
     data = _safe_json(response)
 
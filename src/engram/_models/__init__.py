@@ -1,28 +1,38 @@
 from .memory import (
     AddInput,
+    AddItem,
+    CompactSearchResults,
     ConversationInput,
     Memory,
     MessageInput,
     PreExtractedInput,
     PreExtractedItem,
+    RawConversationInput,
     RetrievalConfig,
     SearchResults,
     StringInput,
     ToolCallCustomInput,
     ToolCallFuncInput,
     ToolCallInput,
+    copy_memory,
+    copy_results,
 )
-from .run import CommittedOperation, CommittedOperations, Run, RunStatus
+from .run import AddResult, CommittedOperation, CommittedOperations, CompositeRun, Run, RunStatus
 
 __all__ = [
     "AddInput",
+    "AddItem",
+    "AddResult",
     "CommittedOperation",
     "CommittedOperations",
+    "CompactSearchResults",
+    "CompositeRun",
     "ConversationInput",
     "Memory",
     "MessageInput",
     "PreExtractedInput",
     "PreExtractedItem",
+    "RawConversationInput",
     "RetrievalConfig",
     "Run",
     "RunStatus",
@@ -31,4 +41,6 @@ __all__ = [
     "ToolCallCustomInput",
     "ToolCallFuncInput",
     "ToolCallInput",
+    "copy_memory",
+    "copy_results",
 ]
@@ -1,17 +1,20 @@
 from __future__ import annotations
 
-from collections.abc import Iterator, Sequence
-from dataclasses import dataclass
-from typing import Any, Literal, TypeAlias
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, replace
+from typing import Any, Literal, TypeAlias, overload
 
 
 @dataclass(slots=True)
 class PreExtractedInput:
     """Pre-extracted input that skips the extraction step continues through the pipeline as-is.
     Each individual item represents a separate memory.
+
+    `items` may be any iterable, including a generator; it is consumed once when sent.
     """
 
-    items: list[PreExtractedItem]
+    items: Iterable[PreExtractedItem]
 
 
 @dataclass(slots=True)
@@ -76,9 +79,26 @@ class MessageInput:
 
 @dataclass(slots=True)
 class ConversationInput:
-    """Conversation input that bypasses the extraction pipeline."""
+    """Conversation input that bypasses the extraction pipeline.
+
+    `messages` may be any iterable, including a generator; it is consumed once when sent.
+    """
 
-    messages: list[MessageInput]
+    messages: Iterable[MessageInput]
+    metadata: dict[str, Any] | None = None
+    created_at: str | None = None
+    updated_at: str | None = None
+
+
+@dataclass(slots=True)
+class RawConversationInput:
+    """Conversation input whose messages are already JSON-encoded.
+
+    `messages` must be a UTF-8 JSON array of messages in the same shape as
+    `MessageInput`; it is spliced into the request body without being decoded.
+    """
+
+    messages: bytes
     metadata: dict[str, Any] | None = None
     created_at: str | None = None
     updated_at: str | None = None
@@ -86,10 +106,25 @@ class ConversationInput:
 
 # Type alias for the input_data argument to memories.add()
 AddInput: TypeAlias = (
-    str | list[dict[str, str]] | PreExtractedInput | ConversationInput | StringInput
+    str
+    | list[dict[str, str]]
+    | PreExtractedInput
+    | ConversationInput
+    | StringInput
+    | RawConversationInput
 )
 
 
+@dataclass(slots=True)
+class AddItem:
+    """One add for `memories.add_many`: an input and the scope to add it under."""
+
+    input_data: AddInput
+    user_id: str | None = None
+    conversation_id: str | None = None
+    group: str | None = None
+
+
 @dataclass(slots=True)
 class RetrievalConfig:
     retrieval_type: Literal["vector", "bm25", "hybrid", "fetch"]
@@ -109,6 +144,18 @@ class Memory:
     conversation_id: str | None = None
     tags: list[str] | None = None
     score: float | None = None
+    # True for not-yet-committed content merged in by `WriteOverlay`; never sent by the server.
+    provisional: bool = False
+
+
+def copy_memory(memory: Memory) -> Memory:
+    """Return a copy of `memory` that shares no mutable state with it."""
+    return replace(memory, tags=None if memory.tags is None else list(memory.tags))
+
+
+def copy_results(results: Sequence[Memory], total: int) -> SearchResults:
+    """Return `SearchResults` holding copies of `results`, for handing out shared entries."""
+    return SearchResults([copy_memory(m) for m in results], total)
 
 
 class SearchResults(Sequence[Memory]):
@@ -129,3 +176,121 @@ class SearchResults(Sequence[Memory]):
 
     def __repr__(self) -> str:
         return f"SearchResults(total={self.total}, returned={len(self._memories)})"
+
+    def compact(self) -> CompactSearchResults:
+        """Return a column-oriented copy suited to long-lived caches."""
+        return CompactSearchResults(self._memories, self.total)
+
+
+class _DictColumn:
+    """Dictionary-encoded column for low-cardinality optional string fields."""
+
+    __slots__ = ("_codes", "_index", "_values")
+
+    def __init__(self) -> None:
+        self._values: list[str | None] = []
+        self._index: dict[str | None, int] = {}
+        self._codes = array("H")
+
+    def append(self, value: str | None) -> None:
+        code = self._index.get(value)
+        if code is None:
+            code = len(self._values)
+            if code > 0xFFFF and self._codes.typecode == "H":
+                self._codes = array("I", self._codes)
+            self._index[value] = code
+            self._values.append(value)
+        self._codes.append(code)
+
+    def __getitem__(self, index: int) -> str | None:
+        return self._values[self._codes[index]]
+
+
+class CompactSearchResults(Sequence[Memory]):
+    """Read-only, array-backed search results.
+
+    Scope fields (`project_id`, `topic`, `group`, `user_id`, `conversation_id`)
+    are dictionary-encoded and scores are stored in a flat float array, so a
+    cached result set costs a few bytes per row on top of the unique strings.
+    `Memory` objects are rebuilt on access.
+    """
+
+    __slots__ = (
+        "_content",
+        "_conversation_id",
+        "_created_at",
+        "_group",
+        "_ids",
+        "_project_id",
+        "_scores",
+        "_tags",
+        "_topic",
+        "_updated_at",
+        "_user_id",
+        "total",
+    )
+
+    def __init__(self, memories: Sequence[Memory], total: int) -> None:
+        self.total = total
+        self._ids = [m.id for m in memories]
+        self._content = [m.content for m in memories]
+        self._created_at = [m.created_at for m in memories]
+        self._updated_at = [m.updated_at for m in memories]
+        self._project_id = _DictColumn()
+        self._topic = _DictColumn()
+        self._group = _DictColumn()
+        self._user_id = _DictColumn()
+        self._conversation_id = _DictColumn()
+        # NaN marks a missing score; sparse tags are kept out of the hot columns.
+        self._scores = array("d")
+        self._tags: dict[int, list[str]] = {}
+        for i, m in enumerate(memories):
+            self._project_id.append(m.project_id)
+            self._topic.append(m.topic)
+            self._group.append(m.group)
+            self._user_id.append(m.user_id)
+            self._conversation_id.append(m.conversation_id)
+            self._scores.append(float("nan") if m.score is None else m.score)
+            if m.tags is not None:
+                self._tags[i] = m.tags
+
+    def _row(self, index: int) -> Memory:
+        score = self._scores[index]
+        return Memory(
+            id=self._ids[index],
+            project_id=self._project_id[index] or "",
+            content=self._content[index],
+            topic=self._topic[index] or "",
+            group=self._group[index] or "",
+            created_at=self._created_at[index],
+            updated_at=self._updated_at[index],
+            user_id=self._user_id[index],
+            conversation_id=self._conversation_id[index],
+            tags=self._tags.get(index),
+            score=None if score != score else score,
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> Memory: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Memory]: ...
+
+    def __getitem__(self, index: int | slice) -> Memory | list[Memory]:
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self._ids)))]
+        if index < 0:
+            index += len(self._ids)
+        if not 0 <= index < len(self._ids):
+            raise IndexError("CompactSearchResults index out of range")
+        return self._row(index)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[Memory]:
+        for i in range(len(self._ids)):
+            yield self._row(i)
+
+    def __repr__(self) -> str:
+        return f"CompactSearchResults(total={self.total}, returned={len(self._ids)})"
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 
+from .memory import AddItem
+
 
 @dataclass(slots=True)
 class Run:
@@ -12,6 +14,34 @@ class Run:
     error: str | None = None
 
 
+@dataclass(slots=True)
+class CompositeRun(Run):
+    """Returned from memories.add() when the input was split into several requests.
+
+    `run_id` joins the parts' IDs with commas; `client.runs.get`/`wait` accept it and
+    report the parts as one run.
+    """
+
+    runs: list[Run] = field(default_factory=list)
+
+    @property
+    def run_ids(self) -> list[str]:
+        return [run.run_id for run in self.runs]
+
+
+@dataclass(slots=True)
+class AddResult:
+    """Outcome of one item of `memories.add_many`: its `Run`, or the error it raised."""
+
+    item: AddItem
+    run: Run | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.run is not None
+
+
 @dataclass(slots=True)
 class CommittedOperation:
     memory_id: str
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from ._bm25 import BM25Index
+from ._models import (
+    AddInput,
+    ConversationInput,
+    Memory,
+    PreExtractedInput,
+    Run,
+    SearchResults,
+    StringInput,
+)
+from ._spool import is_spool_run_id
+from .errors import ValidationError
+
+Scope = tuple[str | None, str | None]
+
+# Runs polled per search at most, so a search never waits on many status requests.
+_MAX_POLLS_PER_SEARCH = 2
+
+
+def _pending_texts(input_data: AddInput) -> list[tuple[str, str]]:
+    """(content, topic) pairs a pending add is expected to produce, best effort.
+
+    Pre-extracted items are taken as-is. For conversations only the user's own messages
+    are used, since those carry the facts being remembered. Raw (pre-encoded)
+    conversations and one-shot iterables that were consumed by the request are skipped.
+    """
+    if isinstance(input_data, str):
+        return [(input_data, "")]
+    if isinstance(input_data, StringInput):
+        content = input_data.content
+        return [(c, "") for c in ([content] if isinstance(content, str) else content)]
+    if isinstance(input_data, PreExtractedInput):
+        items = input_data.items
+        return [(i.content, i.topic) for i in items] if isinstance(items, Sequence) else []
+    if isinstance(input_data, ConversationInput):
+        messages = input_data.messages
+        if not isinstance(messages, Sequence):
+            return []
+        return [(m.content, "") for m in messages if m.role == "user" and m.content]
+    if isinstance(input_data, list):
+        return [
+            (m["content"], "") for m in input_data if m.get("role") == "user" and m.get("content")
+        ]
+    return []
+
+
+@dataclass(slots=True)
+class _PendingRun:
+    scope: Scope
+    memory_ids: list[str]
+    added_at: float
+    # The server's run ID once a spooled add has been replayed.
+    replayed_as: str | None = None
+    polled_at: float | None = None
+
+
+class WriteOverlay:
+    """Read-your-writes overlay of adds whose pipeline run has not finished yet.
+
+    Pass an instance as `write_overlay=` to `EngramClient` or `AsyncEngramClient`. The
+    content of each successful `memories.add` is kept per (`user_id`, `group`) and
+    merged into `memories.search` results for the same scope as `Memory` objects with
+    ``provisional=True``, ahead of the server's results. Provisional memories match a
+    query by keyword (see `BM25Index`); a ``"fetch"`` search includes all of them.
+
+    An add is dropped once `client.runs.get`/`wait` sees its run completed or failed,
+    or after `max_age` seconds if its run is never polled. For an add written to an
+    `AddSpool`, that is the run its replay starts. A search also polls (at most two of)
+    the runs pending for longer than `poll_after` seconds, and skips provisional
+    memories whose content the server already returned. At most `max_pending`
+    provisional memories are kept, oldest runs being dropped first.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_age: float = 300.0,
+        max_pending: int = 10_000,
+        poll_after: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_age <= 0 or max_pending <= 0 or poll_after <= 0:
+            raise ValidationError("max_age, max_pending and poll_after must be greater than 0.")
+        self._max_age = max_age
+        self._poll_after = poll_after
+        self._max_pending = max_pending
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._runs: OrderedDict[str, _PendingRun] = OrderedDict()
+        self._indexes: dict[Scope, BM25Index] = {}
+        # Server run ID -> spool run ID, for replayed adds that are still pending.
+        self._aliases: dict[str, str] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Number of provisional memories currently held."""
+        return self._size
+
+    @property
+    def pending_runs(self) -> list[str]:
+        with self._lock:
+            self._expire()
+            return list(self._runs)
+
+    def record(
+        self,
+        run: Run,
+        input_data: AddInput,
+        *,
+        user_id: str | None,
+        conversation_id: str | None,
+        group: str | None,
+    ) -> int:
+        """Remember the content of an accepted add; returns how many memories it holds."""
+        if run.status in ("completed", "failed"):
+            return 0
+        texts = _pending_texts(input_data)
+        if not texts:
+            return 0
+        now = datetime.now(UTC).isoformat()
+        memories = [
+            Memory(
+                id=f"pending-{run.run_id}-{i}",
+                project_id="",
+                content=content,
+                topic=topic,
+                group=group or "",
+                created_at=now,
+                updated_at=now,
+                user_id=user_id,
+                conversation_id=conversation_id,
+                provisional=True,
+            )
+            for i, (content, topic) in enumerate(texts)
+        ]
+        scope = (user_id, group)
+        with self._lock:
+            self._discard(run.run_id)
+            index = self._indexes.setdefault(scope, BM25Index())
+            index.add_many(memories)
+            self._runs[run.run_id] = _PendingRun(scope, [m.id for m in memories], self._clock())
+            self._size += len(memories)
+            while self._size > self._max_pending and len(self._runs) > 1:
+                self._discard(next(iter(self._runs)))
+        return len(memories)
+
+    def resolve(self, run_id: str) -> int:
+        """Drop a finished run's provisional memories; returns how many were dropped."""
+        with self._lock:
+            return self._discard(self._aliases.get(run_id, run_id))
+
+    def rekey(self, run_id: str, run: Run) -> None:
+        """Track the add that returned `run_id` under `run`, e.g. a spooled add's real run.
+
+        A failed `run` drops the add's provisional memories at once.
+        """
+        with self._lock:
+            if run.status in ("completed", "failed"):
+                self._discard(run_id)
+                return
+            pending = self._runs.get(run_id)
+            if pending is not None:
+                pending.replayed_as = run.run_id
+                self._aliases[run.run_id] = run_id
+
+    def due_runs(self) -> list[str]:
+        """Run IDs to poll before a search: the oldest pending for over `poll_after`.
+
+        Each run is handed out at most once per `poll_after` seconds; spooled adds not
+        yet replayed are skipped.
+        """
+        now = self._clock()
+        deadline = now - self._poll_after
+        due: list[str] = []
+        with self._lock:
+            self._expire()
+            for run_id, pending in self._runs.items():
+                if pending.added_at > deadline or len(due) == _MAX_POLLS_PER_SEARCH:
+                    break
+                if pending.polled_at is not None and pending.polled_at > deadline:
+                    continue
+                if pending.replayed_as is None and is_spool_run_id(run_id):
+                    continue
+                pending.polled_at = now
+                due.append(pending.replayed_as or run_id)
+        return due
+
+    def clear(self) -> None:
+        with self._lock:
+            self._runs.clear()
+            self._indexes.clear()
+            self._aliases.clear()
+            self._size = 0
+
+    def merge(self, body: Mapping[str, Any], results: SearchResults) -> SearchResults:
+        """Prepend provisional memories matching a search body built by `build_search_body`.
+
+        Provisional memories whose content is among `results` have been committed and
+        are dropped; the merged results keep to the body's ``limit``, if any.
+        """
+        scope = (body.get("user_id"), body.get("group"))
+        retrieval = body.get("retrieval_config") or {}
+        committed = {m.content for m in results}
+        with self._lock:
+            self._expire()
+            index = self._indexes.get(scope)
+            if index is None:
+                return results
+            if retrieval.get("retrieval_type") == "fetch":
+                candidates = list(index)
+            else:
+                candidates = list(index.search(body["query"], limit=None))
+            for memory in candidates:
+                if memory.content in committed:
+                    self._discard_memory(memory.id)
+        topics = body.get("topics")
+        conversation_id = body.get("conversation_id")
+        pending = [
+            m
+            for m in candidates
+            if m.content not in committed
+            and (topics is None or m.topic in topics)
+            and (conversation_id is None or m.conversation_id == conversation_id)
+        ]
+        if not pending:
+            return results
+        merged = [*pending, *results]
+        limit = retrieval.get("limit")
+        if limit is not None:
+            merged = merged[:limit]
+        return SearchResults(merged, results.total + len(pending))
+
+    def _expire(self) -> None:
+        deadline = self._clock() - self._max_age
+        while self._runs:
+            run_id, pending = next(iter(self._runs.items()))
+            if pending.added_at > deadline:
+                break
+            self._discard(run_id)
+
+    def _discard_memory(self, memory_id: str) -> None:
+        # Provisional IDs are "pending-<run_id>-<n>", see `record`.
+        run_id = memory_id.removeprefix("pending-").rpartition("-")[0]
+        pending = self._runs.get(run_id)
+        if pending is None or memory_id not in pending.memory_ids:
+            return
+        if len(pending.memory_ids) == 1:
+            self._discard(run_id)
+            return
+        pending.memory_ids.remove(memory_id)
+        self._indexes[pending.scope].remove(memory_id)
+        self._size -= 1
+
+    def _discard(self, run_id: str) -> int:
+        pending = self._runs.pop(run_id, None)
+        if pending is None:
+            return 0
+        if pending.replayed_as is not None:
+            del self._aliases[pending.replayed_as]
+        index = self._indexes[pending.scope]
+        for memory_id in pending.memory_ids:
+            index.remove(memory_id)
+        if not len(index):
+            del self._indexes[pending.scope]
+        self._size -= len(pending.memory_ids)
+        return len(pending.memory_ids)
@@ -1,4 +1,21 @@
+from .buffered import AsyncWriteBuffer, WriteBuffer
 from .memories import AsyncMemories, Memories
+from .mirror import AsyncScopeMirror, ScopeMirror
+from .ordered import AsyncOrderedAddExecutor, OrderedAddExecutor
 from .runs import AsyncRuns, Runs
+from .session import AsyncConversationSession, ConversationSession
 
-__all__ = ["AsyncMemories", "AsyncRuns", "Memories", "Runs"]
+__all__ = [
+    "AsyncConversationSession",
+    "AsyncMemories",
+    "AsyncOrderedAddExecutor",
+    "AsyncRuns",
+    "AsyncScopeMirror",
+    "AsyncWriteBuffer",
+    "ConversationSession",
+    "Memories",
+    "OrderedAddExecutor",
+    "Runs",
+    "ScopeMirror",
+    "WriteBuffer",
+]
@@ -0,0 +1,200 @@
+"""Helpers shared by the sync and async resources for the optional client caches."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from uuid import UUID
+
+import httpx
+
+from .._cache import CachedMemory, MemoryCache, SearchCache
+from .._models import Memory, Run, RunStatus, SearchResults
+from .._serialization import parse_memory
+from .._splitting import split_run_id
+from ..errors import APIError
+
+
+def refresh_search(
+    cache: SearchCache,
+    key: str,
+    scope: tuple[str | None, str | None],
+    fetch: Callable[[], SearchResults],
+) -> None:
+    try:
+        results = fetch()
+    except Exception:
+        cache.refresh_failed(key)
+    else:
+        cache.put(key, scope, results)
+
+
+async def arefresh_search(
+    cache: SearchCache,
+    key: str,
+    scope: tuple[str | None, str | None],
+    fetch: Callable[[], Awaitable[SearchResults]],
+) -> None:
+    try:
+        results = await fetch()
+    except Exception:
+        cache.refresh_failed(key)
+    else:
+        cache.put(key, scope, results)
+
+
+def cached_memory_or_raise(cached: CachedMemory) -> Memory:
+    if cached.memory is None:
+        error = cached.error
+        status_code = error.status_code if error is not None else 404
+        body = error.body if error is not None else None
+        raise APIError(str(error or "Not found"), status_code=status_code, body=body)
+    return cached.memory
+
+
+def revalidation_headers(cached: CachedMemory | None) -> dict[str, str] | None:
+    if cached is not None and cached.etag is not None:
+        return {"If-None-Match": cached.etag}
+    return None
+
+
+def remember_missing(cache: MemoryCache, key: str, memory_id: object, exc: APIError) -> None:
+    if exc.status_code == 404:
+        cache.put_missing(key, str(memory_id), exc)
+
+
+def store_memory(
+    cache: MemoryCache,
+    key: str,
+    cached: CachedMemory | None,
+    response: httpx.Response,
+) -> Memory:
+    """Cache the memory from a (possibly conditional) GET response and return it."""
+    previous = cached.memory if cached is not None else None
+    if response.status_code == 304 and previous is not None:
+        cache.revalidated(key, changed=False)
+        return previous
+    memory = parse_memory(response.json())
+    if previous is not None:
+        changed = memory.updated_at != previous.updated_at
+        cache.revalidated(key, changed=changed)
+        if not changed:
+            memory = previous
+    cache.put(key, memory, response.headers.get("ETag"))
+    return memory
+
+
+# How many finished run IDs to remember so polling a finished run repeatedly does not
+# invalidate the caches again each time.
+_SEEN_RUNS_LIMIT = 1024
+
+
+def first_terminal_status(seen: OrderedDict[str, None], run_id: str) -> bool:
+    if run_id in seen:
+        return False
+    seen[run_id] = None
+    if len(seen) > _SEEN_RUNS_LIMIT:
+        seen.popitem(last=False)
+    return True
+
+
+# How many started runs to remember the `group` of until they finish.
+_RUN_GROUPS_LIMIT = 4096
+
+
+class RunGroups:
+    """The `group` each run started by this client was added under, by run ID.
+
+    `RunStatus` only carries the server's `group_id`, while the caches and mirrors are
+    keyed by the group name passed to `add`.
+    """
+
+    def __init__(self, limit: int = _RUN_GROUPS_LIMIT) -> None:
+        self._limit = limit
+        self._lock = threading.Lock()
+        self._groups: OrderedDict[str, str | None] = OrderedDict()
+
+    def record(self, run: Run, group: str | None) -> None:
+        with self._lock:
+            for run_id in split_run_id(run.run_id):
+                self._groups[run_id] = group
+            while len(self._groups) > self._limit:
+                self._groups.popitem(last=False)
+
+    def rekey(self, run_id: str, run: Run) -> None:
+        """Move the group of a spooled add's `run_id` over to the run its replay started."""
+        with self._lock:
+            if run_id not in self._groups:
+                return
+            group = self._groups.pop(run_id)
+        self.record(run, group)
+
+    def pop(self, run_id: str) -> tuple[bool, str | None]:
+        """Return ``(known, group)`` for a finished run and forget it."""
+        with self._lock:
+            if run_id not in self._groups:
+                return False, None
+            return True, self._groups.pop(run_id)
+
+
+def evict_deleted(
+    memory_id: str | UUID,
+    search_cache: SearchCache | None,
+    memory_cache: MemoryCache | None,
+    *,
+    user_id: str | None,
+    group: str | None,
+) -> None:
+    """Drop cache entries a `memories.delete` may have made stale.
+
+    Like `apply_run_status`, searches of the (`user_id`, `group`) scope and of the same
+    user without a group are invalidated; without a `group` the memory may be in any of
+    the user's groups, so every cached search of the user is.
+    """
+    if memory_cache is not None:
+        memory_cache.evict(memory_id)
+    if search_cache is None:
+        return
+    if group is None:
+        search_cache.invalidate_user(user_id)
+    else:
+        for scope_group in (group, None):
+            search_cache.invalidate_scope(user_id, scope_group)
+
+
+def apply_run_status(
+    status: RunStatus,
+    search_cache: SearchCache | None,
+    memory_cache: MemoryCache | None,
+    *,
+    group: str | None,
+    group_known: bool,
+) -> list[str]:
+    """Drop cache entries a finished run changed; returns created IDs to prefetch.
+
+    Every memory ID in `committed_operations` is evicted from the get cache, and search
+    results for the run's (`user_id`, `group`) scope, and for the same user without a
+    group, are invalidated. When the run was not started by this client its group is
+    unknown, so every cached search of the user is invalidated and nothing is
+    prefetched. A run without `committed_operations` is treated as having touched its
+    scope.
+    """
+    ops = status.committed_operations
+    changed = (
+        [op.memory_id for op in (*ops.created, *ops.updated, *ops.deleted)]
+        if ops is not None
+        else []
+    )
+    if memory_cache is not None:
+        for memory_id in changed:
+            memory_cache.evict(memory_id)
+    if search_cache is not None and (ops is None or changed):
+        if not group_known:
+            search_cache.invalidate_user(status.user_id)
+        else:
+            for user_id, scope_group in {(status.user_id, group), (status.user_id, None)}:
+                search_cache.invalidate_scope(user_id, scope_group)
+    if ops is None or not group_known or memory_cache is None or not memory_cache.prefetch_created:
+        return []
+    return [op.memory_id for op in ops.created]
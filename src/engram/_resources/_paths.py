@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+MEMORIES_PATH = "/v1/memories"
+MEMORIES_SEARCH_PATH = "/v1/memories/search"
+
+
+def memory_path(memory_id: str | UUID) -> str:
+    return f"{MEMORIES_PATH}/{memory_id}"
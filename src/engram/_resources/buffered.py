@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Literal
+
+from .._models import AddInput, PreExtractedInput, PreExtractedItem, Run, StringInput
+from ..errors import ValidationError
+
+if TYPE_CHECKING:
+    from .memories import AsyncMemories, Memories
+
+DEFAULT_MAX_ITEMS = 100
+DEFAULT_MAX_BYTES = 256 * 1024
+DEFAULT_MAX_DELAY = 0.05
+# Threads a sync buffer sends its batches on; adds and the timer never send themselves.
+_SEND_WORKERS = 4
+
+# (user_id, conversation_id, group, input kind): adds that can share one request.
+_GroupKey = tuple[str | None, str | None, str | None, Literal["string", "pre_extracted"]]
+
+
+@dataclass(slots=True)
+class _Batch:
+    created: float
+    strings: list[str] = field(default_factory=list)
+    items: list[PreExtractedItem] = field(default_factory=list)
+    size: int = 0
+    waiters: list[Future[Run]] = field(default_factory=list)
+    async_waiters: list[asyncio.Future[Run]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.strings) + len(self.items)
+
+
+def _validate_limits(max_items: int, max_bytes: int, max_delay: float) -> None:
+    if max_items <= 0 or max_bytes <= 0:
+        raise ValidationError("max_items and max_bytes must be greater than 0.")
+    if max_delay < 0:
+        raise ValidationError("max_delay must not be negative.")
+
+
+def _split(
+    input_data: AddInput,
+) -> tuple[Literal["string", "pre_extracted"], list[str], list[PreExtractedItem], int]:
+    """Classify a bufferable add and estimate its encoded size."""
+    if isinstance(input_data, str):
+        return "string", [input_data], [], len(input_data.encode())
+    if isinstance(input_data, StringInput):
+        content = input_data.content
+        strings = [content] if isinstance(content, str) else list(content)
+        return "string", strings, [], sum(len(s.encode()) for s in strings)
+    if isinstance(input_data, PreExtractedInput):
+        items = list(input_data.items)
+        size = sum(len(i.content.encode()) + len(i.topic.encode()) for i in items)
+        return "pre_extracted", [], items, size
+    raise ValidationError(
+        "Only string, StringInput and PreExtractedInput adds can be buffered; "
+        "send conversations with memories.add()."
+    )
+
+
+def _batch_input(key: _GroupKey, batch: _Batch) -> AddInput:
+    if key[3] == "string":
+        return StringInput(content=batch.strings)
+    return PreExtractedInput(items=batch.items)
+
+
+class _BufferBase:
+    def __init__(self, max_items: int, max_bytes: int, max_delay: float) -> None:
+        _validate_limits(max_items, max_bytes, max_delay)
+        self._max_items = max_items
+        self._max_bytes = max_bytes
+        self._max_delay = max_delay
+        self._groups: dict[_GroupKey, _Batch] = {}
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        """Adds waiting to be sent."""
+        return sum(len(batch) for batch in self._groups.values())
+
+    def _enqueue(
+        self,
+        input_data: AddInput,
+        user_id: str | None,
+        conversation_id: str | None,
+        group: str | None,
+    ) -> tuple[_GroupKey, _Batch, list[_Batch]]:
+        """Append to the group's batch; returns it and the group's batches to send now.
+
+        A batch the add would push past `max_bytes` is sent as it is and the add starts
+        a new one, which is sent too if the add alone fills it.
+        """
+        if self._closed:
+            raise ValidationError("The write buffer is closed.")
+        kind, strings, items, size = _split(input_data)
+        key: _GroupKey = (user_id, conversation_id, group, kind)
+        ready: list[_Batch] = []
+        batch = self._groups.get(key)
+        if batch is not None and batch.size + size > self._max_bytes:
+            ready.append(self._groups.pop(key))
+            batch = None
+        if batch is None:
+            batch = self._groups[key] = _Batch(created=time.monotonic())
+        batch.strings.extend(strings)
+        batch.items.extend(items)
+        batch.size += size
+        if len(batch) >= self._max_items or batch.size >= self._max_bytes:
+            ready.append(self._groups.pop(key))
+        return key, batch, ready
+
+
+class WriteBuffer(_BufferBase):
+    """Merges small string and pre-extracted adds into fewer `memories.add` requests.
+
+    Created by `client.memories.buffered()`. Adds are grouped by (`user_id`,
+    `conversation_id`, `group`) and input type. A group is sent as one request, and so
+    one pipeline run, once it holds `max_items` adds, before an add would take it past
+    `max_bytes` of content, or `max_delay` seconds after its first add. Requests are
+    sent by a few background threads, so `add()` never waits on one; it returns a
+    `Future` that resolves to the shared `Run` (or the request's error). Call `flush()`
+    to send everything now; `close()` (or leaving the ``with`` block) flushes and stops
+    the buffer. Closing the client closes its open buffers the same way.
+    """
+
+    def __init__(
+        self,
+        memories: Memories,
+        *,
+        max_items: int = DEFAULT_MAX_ITEMS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ) -> None:
+        super().__init__(max_items, max_bytes, max_delay)
+        self._memories = memories
+        self._cond = threading.Condition()
+        self._timer: threading.Thread | None = None
+        self._senders: ThreadPoolExecutor | None = None
+        self._in_flight: set[Future[None]] = set()
+
+    def add(
+        self,
+        input_data: AddInput,
+        *,
+        user_id: str | None = None,
+        conversation_id: str | None = None,
+        group: str | None = None,
+    ) -> Future[Run]:
+        future: Future[Run] = Future()
+        with self._cond:
+            key, batch, ready = self._enqueue(input_data, user_id, conversation_id, group)
+            batch.waiters.append(future)
+            if self._groups.get(key) is batch:
+                self._start_timer()
+                self._cond.notify()
+            for full in ready:
+                self._submit(key, full)
+        return future
+
+    def flush(self) -> None:
+        """Send every pending group now and wait for all requests to finish."""
+        with self._cond:
+            groups, self._groups = self._groups, {}
+            for key, batch in groups.items():
+                self._submit(key, batch)
+            in_flight = list(self._in_flight)
+        wait(in_flight)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self.flush()
+        if self._timer is not None:
+            self._timer.join()
+        if self._senders is not None:
+            self._senders.shutdown()
+
+    def __enter__(self) -> WriteBuffer:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
+
+    def _start_timer(self) -> None:
+        if self._timer is None:
+            self._timer = threading.Thread(
+                target=self._run_timer, name="engram-write-buffer", daemon=True
+            )
+            self._timer.start()
+
+    def _run_timer(self) -> None:
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+                now = time.monotonic()
+                due = {
+                    key: batch
+                    for key, batch in self._groups.items()
+                    if now - batch.created >= self._max_delay
+                }
+                for key, batch in due.items():
+                    del self._groups[key]
+                    self._submit(key, batch)
+                if not due:
+                    oldest = min((b.created for b in self._groups.values()), default=None)
+                    timeout = None if oldest is None else oldest + self._max_delay - now
+                    self._cond.wait(timeout)
+
+    def _submit(self, key: _GroupKey, batch: _Batch) -> None:
+        """Hand a batch to the sender threads; called with `_cond` held."""
+        if self._senders is None:
+            self._senders = ThreadPoolExecutor(
+                _SEND_WORKERS, thread_name_prefix="engram-write-buffer-send"
+            )
+        sent = self._senders.submit(self._send, key, batch)
+        self._in_flight.add(sent)
+        sent.add_done_callback(self._sent)
+
+    def _sent(self, sent: Future[None]) -> None:
+        with self._cond:
+            self._in_flight.discard(sent)
+
+    def _send(self, key: _GroupKey, batch: _Batch) -> None:
+        user_id, conversation_id, group, _ = key
+        try:
+            run = self._memories.add(
+                _batch_input(key, batch),
+                user_id=user_id,
+                conversation_id=conversation_id,
+                group=group,
+            )
+        except Exception as exc:
+            for future in batch.waiters:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for future in batch.waiters:
+                if not future.done():
+                    future.set_result(run)
+
+
+class AsyncWriteBuffer(_BufferBase):
+    """Merges small string and pre-extracted adds into fewer `memories.add` requests.
+
+    Created by the async `client.memories.buffered()`. Adds are grouped by (`user_id`,
+    `conversation_id`, `group`) and input type. A group is sent as one request, and so
+    one pipeline run, once it holds `max_items` adds, before an add would take it past
+    `max_bytes` of content, or `max_delay` seconds after its first add. `add()` returns
+    an `asyncio.Future` that resolves to the shared `Run` (or the request's error).
+    Await `flush()` to send everything now; `aclose()` (or leaving the ``async with``
+    block) flushes and stops the buffer. Closing the client closes its open buffers
+    the same way.
+    """
+
+    def __init__(
+        self,
+        memories: AsyncMemories,
+        *,
+        max_items: int = DEFAULT_MAX_ITEMS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ) -> None:
+        super().__init__(max_items, max_bytes, max_delay)
+        self._memories = memories
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def add(
+        self,
+        input_data: AddInput,
+        *,
+        user_id: str | None = None,
+        conversation_id: str | None = None,
+        group: str | None = None,
+    ) -> asyncio.Future[Run]:
+        """Queue an add; must be called from a running event loop."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Run] = loop.create_future()
+        key, batch, ready = self._enqueue(input_data, user_id, conversation_id, group)
+        batch.async_waiters.append(future)
+        for full in ready:
+            self._spawn(key, full)
+        if self._groups.get(key) is batch and len(batch.async_waiters) == 1:
+            loop.call_later(self._max_delay, self._send_if_pending, key, batch)
+        return future
+
+    async def flush(self) -> None:
+        """Send every pending group now and wait for all requests to finish."""
+        groups, self._groups = self._groups, {}
+        for key, batch in groups.items():
+            self._spawn(key, batch)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def aclose(self) -> None:
+        self._closed = True
+        await self.flush()
+
+    async def __aenter__(self) -> AsyncWriteBuffer:
+        return self
+
+    async def __aexit__(self, exc_type: object, exc: object, tb: object) -> None:
+        await self.aclose()
+
+    def _send_if_pending(self, key: _GroupKey, batch: _Batch) -> None:
+        if self._groups.get(key) is batch:
+            del self._groups[key]
+            self._spawn(key, batch)
+
+    def _spawn(self, key: _GroupKey, batch: _Batch) -> None:
+        task = asyncio.get_running_loop().create_task(self._send(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, key: _GroupKey, batch: _Batch) -> None:
+        user_id, conversation_id, group, _ = key
+        try:
+            run = await self._memories.add(
+                _batch_input(key, batch),
+                user_id=user_id,
+                conversation_id=conversation_id,
+                group=group,
+            )
+        except Exception as exc:
+            for future in batch.async_waiters:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for future in batch.async_waiters:
+                if not future.done():
+                    future.set_result(run)
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import threading
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Generator,
+    Iterable,
+)
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from typing import TYPE_CHECKING
+
+from .._models import AddItem, AddResult, RunStatus
+from ..errors import AddManyError, AddSkippedError, ValidationError
+
+if TYPE_CHECKING:
+    from .memories import AsyncMemories, Memories
+
+DEFAULT_CONCURRENCY = 8
+
+# Called with (completed, total) after each item that was sent.
+ProgressCallback = Callable[[int, int], None]
+
+
+def _results(items: Iterable[AddItem], concurrency: int) -> list[AddResult]:
+    if concurrency <= 0:
+        raise ValidationError("concurrency must be greater than 0.")
+    return [AddResult(item) for item in items]
+
+
+def _skipped() -> AddSkippedError:
+    return AddSkippedError("Not sent: an earlier add failed and fail_fast is set.")
+
+
+def send_many(
+    memories: Memories,
+    items: Iterable[AddItem],
+    *,
+    concurrency: int,
+    fail_fast: bool,
+    on_progress: ProgressCallback | None,
+) -> list[AddResult]:
+    results = _results(items, concurrency)
+    if not results:
+        return results
+    stop = threading.Event()
+    first_error: list[Exception] = []
+
+    def send(result: AddResult) -> bool:
+        if stop.is_set():
+            result.error = _skipped()
+            return False
+        item = result.item
+        try:
+            result.run = memories.add(
+                item.input_data,
+                user_id=item.user_id,
+                conversation_id=item.conversation_id,
+                group=item.group,
+            )
+        except Exception as exc:
+            result.error = exc
+            if fail_fast and not stop.is_set():
+                stop.set()
+                first_error.append(exc)
+        return True
+
+    workers = min(concurrency, len(results))
+    with ThreadPoolExecutor(workers, thread_name_prefix="engram-add-many") as pool:
+        futures = [pool.submit(send, result) for result in results]
+        completed = 0
+        for future in as_completed(futures):
+            if future.result():
+                completed += 1
+                if on_progress is not None:
+                    on_progress(completed, len(results))
+    if first_error:
+        raise AddManyError(first_error[0], results) from first_error[0]
+    return results
+
+
+async def async_send_many(
+    memories: AsyncMemories,
+    items: Iterable[AddItem],
+    *,
+    concurrency: int,
+    fail_fast: bool,
+    on_progress: ProgressCallback | None,
+) -> list[AddResult]:
+    results = _results(items, concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    first_error: list[Exception] = []
+    completed = 0
+
+    async def send(result: AddResult) -> None:
+        nonlocal completed
+        async with semaphore:
+            if first_error:
+                result.error = _skipped()
+                return
+            item = result.item
+            try:
+                result.run = await memories.add(
+                    item.input_data,
+                    user_id=item.user_id,
+                    conversation_id=item.conversation_id,
+                    group=item.group,
+                )
+            except Exception as exc:
+                result.error = exc
+                if fail_fast and not first_error:
+                    first_error.append(exc)
+        completed += 1
+        if on_progress is not None:
+            on_progress(completed, len(results))
+
+    async with asyncio.TaskGroup() as group:
+        for result in results:
+            group.create_task(send(result))
+    if first_error:
+        raise AddManyError(first_error[0], results) from first_error[0]
+    return results
+
+
+def _validate_stream(max_in_flight: int, timeout: float, poll_interval: float) -> None:
+    if max_in_flight <= 0:
+        raise ValidationError("max_in_flight must be greater than 0.")
+    if timeout <= 0 or poll_interval <= 0:
+        raise ValidationError("timeout and poll_interval must be greater than 0.")
+
+
+def stream_adds(
+    memories: Memories,
+    items: Iterable[AddItem],
+    *,
+    max_in_flight: int,
+    timeout: float,
+    poll_interval: float,
+) -> Generator[tuple[AddItem, RunStatus]]:
+    _validate_stream(max_in_flight, timeout, poll_interval)
+    runs = memories._runs()
+
+    def add_and_wait(item: AddItem) -> RunStatus:
+        run = memories.add(
+            item.input_data,
+            user_id=item.user_id,
+            conversation_id=item.conversation_id,
+            group=item.group,
+        )
+        return runs.wait(run.run_id, timeout=timeout, interval=poll_interval)
+
+    def generate() -> Generator[tuple[AddItem, RunStatus]]:
+        source = iter(items)
+        pool = ThreadPoolExecutor(max_in_flight, thread_name_prefix="engram-add-stream")
+        pending: dict[Future[RunStatus], AddItem] = {}
+        try:
+            while True:
+                for item in itertools.islice(source, max_in_flight - len(pending)):
+                    pending[pool.submit(add_and_wait, item)] = item
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+        finally:
+            # Adds already sent are not undone; only their waits are abandoned.
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    return generate()
+
+
+async def _async_items(items: Iterable[AddItem] | AsyncIterable[AddItem]) -> AsyncIterator[AddItem]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+def async_stream_adds(
+    memories: AsyncMemories,
+    items: Iterable[AddItem] | AsyncIterable[AddItem],
+    *,
+    max_in_flight: int,
+    timeout: float,
+    poll_interval: float,
+) -> AsyncGenerator[tuple[AddItem, RunStatus]]:
+    _validate_stream(max_in_flight, timeout, poll_interval)
+    runs = memories._runs()
+
+    async def add_and_wait(item: AddItem) -> RunStatus:
+        run = await memories.add(
+            item.input_data,
+            user_id=item.user_id,
+            conversation_id=item.conversation_id,
+            group=item.group,
+        )
+        return await runs.wait(run.run_id, timeout=timeout, interval=poll_interval)
+
+    async def generate() -> AsyncGenerator[tuple[AddItem, RunStatus]]:
+        source = _async_items(items)
+        pending: dict[asyncio.Task[RunStatus], AddItem] = {}
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < max_in_flight:
+                    try:
+                        item = await anext(source)
+                    except StopAsyncIteration:
+                        exhausted = True
+                    else:
+                        pending[asyncio.create_task(add_and_wait(item))] = item
+                if not pending:
+                    return
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield pending.pop(task), task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    return generate()
@@ -1,31 +1,165 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+)
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 from uuid import UUID
 
+from .._cache import (
+    MemoryCache,
+    SearchCache,
+    memory_cache_key,
+    search_cache_key,
+    search_scope,
+)
+from .._compaction import ConversationCompactor
+from .._dedup import AddDeduplicator
 from .._http import AsyncHttpTransport, HttpTransport
-from .._models import AddInput, Memory, RetrievalConfig, Run, SearchResults
+from .._models import (
+    AddInput,
+    AddItem,
+    AddResult,
+    Memory,
+    RawConversationInput,
+    RetrievalConfig,
+    Run,
+    RunStatus,
+    SearchResults,
+)
+from .._overlay import WriteOverlay
 from .._serialization import (
+    SearchBodyTemplate,
     build_add_body,
     build_memory_params,
     build_search_body,
+    encode_add_body,
+    iter_add_body,
     parse_memory,
     parse_run,
     parse_search_results,
 )
+from .._splitting import AddSplitting, settle_parts
+from .._spool import AddSpool
+from .._throttle import RunThrottle
+from ..errors import APIError, EngramError, ValidationError
+from ._caching import (
+    RunGroups,
+    apply_run_status,
+    arefresh_search,
+    cached_memory_or_raise,
+    evict_deleted,
+    first_terminal_status,
+    refresh_search,
+    remember_missing,
+    revalidation_headers,
+    store_memory,
+)
+from ._paths import MEMORIES_PATH, MEMORIES_SEARCH_PATH, memory_path
+from .buffered import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_DELAY,
+    DEFAULT_MAX_ITEMS,
+    AsyncWriteBuffer,
+    WriteBuffer,
+)
+from .bulk import (
+    DEFAULT_CONCURRENCY,
+    ProgressCallback,
+    async_send_many,
+    async_stream_adds,
+    send_many,
+    stream_adds,
+)
+from .mirror import AsyncScopeMirror, ScopeMirror, local_mirror, server_unavailable
+from .ordered import (
+    DEFAULT_ORDERED_CONCURRENCY,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_WAIT_TIMEOUT,
+    AsyncOrderedAddExecutor,
+    OrderedAddExecutor,
+    OrderKey,
+    default_order_key,
+)
+from .raw import AsyncRawMemories, RawMemories
+from .runs import AsyncRuns, Runs
+from .session import DEFAULT_CONTEXT_MESSAGES, AsyncConversationSession, ConversationSession
+from .streaming import AsyncSearchStream, SearchStream
 
-_MEMORIES_PATH = "/v1/memories"
-_MEMORIES_SEARCH_PATH = "/v1/memories/search"
+# Conversation sessions remembered per client; the least recently used are forgotten.
+_MAX_SESSIONS = 1024
+_SessionKey = tuple[str | None, str, str | None]
 
 
-def _memory_path(memory_id: str | UUID) -> str:
-    return f"{_MEMORIES_PATH}/{memory_id}"
+async def _aiter_chunks(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+def _context_messages(requested: int | None) -> int:
+    return DEFAULT_CONTEXT_MESSAGES if requested is None else requested
+
+
+def _check_context_messages(
+    session: ConversationSession | AsyncConversationSession, requested: int | None
+) -> None:
+    if requested is not None and requested != session.context_messages:
+        raise ValidationError(
+            f"Session {session.conversation_id!r} already keeps {session.context_messages} "
+            f"context messages, not {requested}."
+        )
 
 
 class Memories:
     """Sync sub-resource for memory operations: client.memories.*"""
 
-    def __init__(self, transport: HttpTransport) -> None:
+    def __init__(
+        self,
+        transport: HttpTransport,
+        *,
+        search_cache: SearchCache | None = None,
+        memory_cache: MemoryCache | None = None,
+        write_overlay: WriteOverlay | None = None,
+        add_dedup: AddDeduplicator | None = None,
+        conversation_compactor: ConversationCompactor | None = None,
+        add_splitting: AddSplitting | None = None,
+        add_spool: AddSpool | None = None,
+        add_throttle: RunThrottle | None = None,
+    ) -> None:
         self._transport = transport
+        self._search_cache = search_cache
+        self._memory_cache = memory_cache
+        self._overlay = write_overlay
+        self._dedup = add_dedup
+        self._compactor = conversation_compactor
+        self._splitting = add_splitting
+        self._spool = add_spool
+        self._throttle = add_throttle
+        self._seen_runs: OrderedDict[str, None] = OrderedDict()
+        self._run_groups = RunGroups()
+        self._mirrors: weakref.WeakSet[ScopeMirror] = weakref.WeakSet()
+        self._buffers: weakref.WeakSet[WriteBuffer] = weakref.WeakSet()
+        self._sessions: OrderedDict[_SessionKey, ConversationSession] = OrderedDict()
+        # session() may be called from several user threads sharing this client.
+        self._sessions_lock = threading.Lock()
+
+    @property
+    def with_raw_response(self) -> RawMemories:
+        """Variants of `get` and `search` that return the undecoded response."""
+        return RawMemories(self)
 
     def add(
         self,
@@ -34,15 +168,175 @@ class Memories:
         user_id: str | None = None,
         conversation_id: str | None = None,
         group: str | None = None,
+        stream_body: bool = False,
     ) -> Run:
-        body = build_add_body(
-            input_data,
+        """Add memories from `input_data`.
+
+        With `stream_body=True` the request body is encoded incrementally and sent
+        chunked, so very large (or generator-backed) conversations and pre-extracted
+        batches are never held in memory as a whole.
+
+        With a `ConversationCompactor` on the client, conversations are compacted before
+        they are sent. With an `AddDeduplicator`, a repeat of a recent add returns the
+        earlier `Run` without a request. With `AddSplitting`, a large string list or
+        pre-extracted batch is sent as several concurrent requests and a `CompositeRun`
+        is returned. If some parts fail, a `SplitAddError` carrying the accepted parts' run
+        is raised once all have finished (the first error, if none was accepted).
+        With an `AddSpool`, the add is written to the local spool instead and replayed
+        in the background; a ``"spooled"`` placeholder `Run` is returned. With a
+        `RunThrottle`, the add first waits while too many of the client's runs are
+        unfinished.
+        """
+        compactor = self._compactor
+        if compactor is not None:
+            input_data, report = compactor.compact(input_data)
+        dedup = self._dedup
+        dedup_key = None
+        if dedup is not None:
+            dedup_key = dedup.key(
+                input_data, user_id=user_id, conversation_id=conversation_id, group=group
+            )
+            if dedup_key is not None and (earlier := dedup.lookup(dedup_key)) is not None:
+                return earlier
+        send = functools.partial(
+            self._send_add,
             user_id=user_id,
             conversation_id=conversation_id,
             group=group,
+            stream_body=stream_body,
+        )
+        splitting = self._splitting
+        throttle = self._throttle if self._spool is None else None
+        if throttle is not None:
+            throttle.admit(self._poll_run)
+        failure = None
+        try:
+            if self._spool is not None:
+                run = self._spool_add(input_data, user_id, conversation_id, group)
+            elif splitting is None or (parts := splitting.split(input_data)) is None:
+                run = send(input_data)
+            else:
+                workers = min(splitting.concurrency, len(parts))
+                with ThreadPoolExecutor(workers, thread_name_prefix="engram-add") as pool:
+                    futures = [pool.submit(send, part) for part in parts]
+                outcomes = [future.exception() or future.result() for future in futures]
+                run, failure = settle_parts(parts, outcomes)
+        except BaseException:
+            if throttle is not None:
+                throttle.release()
+            raise
+        if throttle is not None:
+            throttle.record(run)
+        self._run_groups.record(run, group)
+        if failure is not None:
+            raise failure from failure.error
+        if compactor is not None:
+            compactor.record(report)
+        if dedup is not None and dedup_key is not None:
+            dedup.record(dedup_key, run)
+        return run
+
+    def _spool_add(
+        self,
+        input_data: AddInput,
+        user_id: str | None,
+        conversation_id: str | None,
+        group: str | None,
+    ) -> Run:
+        assert self._spool is not None
+        body = encode_add_body(
+            input_data, user_id=user_id, conversation_id=conversation_id, group=group
+        )
+        run = self._spool.append(body)
+        if self._overlay is not None:
+            self._overlay.record(
+                run, input_data, user_id=user_id, conversation_id=conversation_id, group=group
+            )
+        return run
+
+    def _send_add(
+        self,
+        input_data: AddInput,
+        *,
+        user_id: str | None,
+        conversation_id: str | None,
+        group: str | None,
+        stream_body: bool,
+    ) -> Run:
+        if stream_body:
+            chunks = iter_add_body(
+                input_data,
+                user_id=user_id,
+                conversation_id=conversation_id,
+                group=group,
+            )
+            data = self._transport.request("POST", MEMORIES_PATH, content=chunks)
+        elif isinstance(input_data, RawConversationInput):
+            content = encode_add_body(
+                input_data,
+                user_id=user_id,
+                conversation_id=conversation_id,
+                group=group,
+            )
+            data = self._transport.request("POST", MEMORIES_PATH, content=content)
+        else:
+            body = build_add_body(
+                input_data,
+                user_id=user_id,
+                conversation_id=conversation_id,
+                group=group,
+            )
+            data = self._transport.request("POST", MEMORIES_PATH, json=body)
+        run = parse_run(data)
+        if self._overlay is not None:
+            self._overlay.record(
+                run, input_data, user_id=user_id, conversation_id=conversation_id, group=group
+            )
+        return run
+
+    def add_many(
+        self,
+        items: Iterable[AddItem],
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        fail_fast: bool = False,
+        on_progress: ProgressCallback | None = None,
+    ) -> list[AddResult]:
+        """Add every item with up to `concurrency` adds in flight on a thread pool.
+
+        Returns one `AddResult` per item, in input order, holding its `Run` or the error
+        its add raised. With `fail_fast=True` no further items are sent after the first
+        error: once the adds in flight have finished, an `AddManyError` holding that
+        error and the results is raised, and unsent items carry an `AddSkippedError`.
+        `on_progress` is called with (completed, total) after each add.
+        """
+        return send_many(
+            self, items, concurrency=concurrency, fail_fast=fail_fast, on_progress=on_progress
+        )
+
+    def add_stream(
+        self,
+        items: Iterable[AddItem],
+        *,
+        max_in_flight: int = DEFAULT_CONCURRENCY,
+        timeout: float = DEFAULT_WAIT_TIMEOUT,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> Generator[tuple[AddItem, RunStatus]]:
+        """Add each item and yield (item, `RunStatus`) as each run finishes.
+
+        At most `max_in_flight` items are taken from `items` at a time; the next is only
+        read once one of them has finished, so an unbounded source is never read ahead
+        further than that. Runs are yielded in completion order, including failed
+        runs. An add error, or a run that does not finish within `timeout` seconds, is
+        raised from the iterator and stops it; adds already sent are not undone.
+        """
+        return stream_adds(
+            self,
+            items,
+            max_in_flight=max_in_flight,
+            timeout=timeout,
+            poll_interval=poll_interval,
         )
-        data = self._transport.request("POST", _MEMORIES_PATH, json=body)
-        return parse_run(data)
 
     def get(
         self,
@@ -55,8 +349,25 @@ class Memories:
             user_id=user_id,
             group=group,
         )
-        data = self._transport.request("GET", _memory_path(memory_id), params=params)
-        return parse_memory(data)
+        cache = self._memory_cache
+        if cache is None:
+            data = self._transport.request("GET", memory_path(memory_id), params=params)
+            return parse_memory(data)
+        key = memory_cache_key(memory_id, user_id, group)
+        cached = cache.get(key)
+        if cached is not None and cached.fresh:
+            return cached_memory_or_raise(cached)
+        try:
+            response = self._transport.send(
+                "GET",
+                memory_path(memory_id),
+                headers=revalidation_headers(cached),
+                params=params,
+            )
+        except APIError as exc:
+            remember_missing(cache, key, memory_id, exc)
+            raise
+        return store_memory(cache, key, cached, response)
 
     def delete(
         self,
@@ -69,7 +380,57 @@ class Memories:
             user_id=user_id,
             group=group,
         )
-        self._transport.request("DELETE", _memory_path(memory_id), params=params)
+        try:
+            self._transport.request("DELETE", memory_path(memory_id), params=params)
+        finally:
+            evict_deleted(
+                memory_id, self._search_cache, self._memory_cache, user_id=user_id, group=group
+            )
+
+    def _on_spool_replayed(self, spool_run_id: str, run: Run) -> None:
+        """Move local state for a spooled add over to the run its replay started.
+
+        Called on the spool's replay thread.
+        """
+        self._run_groups.rekey(spool_run_id, run)
+        if self._overlay is not None:
+            self._overlay.rekey(spool_run_id, run)
+        if self._dedup is not None:
+            self._dedup.rekey(spool_run_id, run)
+
+    def _runs(self) -> Runs:
+        """A `Runs` over this resource's transport that reports back to it."""
+        return Runs(self._transport, on_finished=self._on_run_finished, spool=self._spool)
+
+    def _poll_run(self, run_id: str) -> None:
+        self._runs().get(run_id)
+
+    def _on_run_finished(self, status: RunStatus) -> None:
+        if self._throttle is not None:
+            self._throttle.finished(status.run_id)
+        if self._overlay is not None:
+            self._overlay.resolve(status.run_id)
+        if self._dedup is not None and status.status == "failed":
+            self._dedup.forget(status.run_id)
+        group_known, group = self._run_groups.pop(status.run_id)
+        if self._search_cache is None and self._memory_cache is None and not self._mirrors:
+            return
+        if not first_terminal_status(self._seen_runs, status.run_id):
+            return
+        for mirror in list(self._mirrors):
+            mirror._apply(status, group_known=group_known, group=group)
+        created = apply_run_status(
+            status,
+            self._search_cache,
+            self._memory_cache,
+            group=group,
+            group_known=group_known,
+        )
+        for memory_id in created:
+            try:
+                self.get(memory_id, user_id=status.user_id, group=group)
+            except EngramError:
+                pass
 
     def search(
         self,
@@ -89,15 +450,251 @@ class Memories:
             group=group,
             retrieval_config=retrieval_config,
         )
-        data = self._transport.request("POST", _MEMORIES_SEARCH_PATH, json=body)
-        return parse_search_results(data)
+
+        mirror = local_mirror(self._mirrors, body)
+        if mirror is not None and mirror.serves_searches:
+            return self._with_pending(body, mirror._search_body(body))
+
+        def fetch() -> SearchResults:
+            data = self._transport.request("POST", MEMORIES_SEARCH_PATH, json=body)
+            return parse_search_results(data)
+
+        try:
+            results = self._cached_search(body, fetch)
+        except Exception as exc:
+            if mirror is None or not server_unavailable(exc):
+                raise
+            results = mirror._search_body(body)
+        return self._with_pending(body, results)
+
+    def _with_pending(self, body: dict[str, Any], results: SearchResults) -> SearchResults:
+        overlay = self._overlay
+        if overlay is None:
+            return results
+        for run_id in overlay.due_runs():
+            try:
+                self._poll_run(run_id)
+            except EngramError:
+                pass
+        return overlay.merge(body, results)
+
+    def _cached_search(
+        self, body: dict[str, Any], fetch: Callable[[], SearchResults]
+    ) -> SearchResults:
+        cache = self._search_cache
+        if cache is None:
+            return fetch()
+        key = search_cache_key(body)
+        scope = search_scope(body)
+        hit = cache.get(key)
+        if hit is not None:
+            results, stale = hit
+            if stale and cache.begin_refresh(key):
+                thread = threading.Thread(
+                    target=refresh_search, args=(cache, key, scope, fetch), daemon=True
+                )
+                thread.start()
+            return results
+        results = fetch()
+        cache.put(key, scope, results)
+        return results
+
+    def search_stream(
+        self,
+        *,
+        query: str,
+        topics: list[str] | None = None,
+        user_id: str | None = None,
+        conversation_id: str | None = None,
+        group: str | None = None,
+        retrieval_config: RetrievalConfig | None = None,
+    ) -> SearchStream:
+        """Search memories, yielding each `Memory` as soon as it has been received.
+
+        Use as a context manager (or exhaust the iterator) so the connection is released.
+        """
+        body = build_search_body(
+            query=query,
+            topics=topics,
+            user_id=user_id,
+            conversation_id=conversation_id,
+            group=group,
+            retrieval_config=retrieval_config,
+        )
+        response = self._transport.stream("POST", MEMORIES_SEARCH_PATH, json=body)
+        return SearchStream(response)
+
+    def prepare_search(
+        self,
+        *,
+        topics: list[str] | None = None,
+        user_id: str | None = None,
+        conversation_id: str | None = None,
+        group: str | None = None,
+        retrieval_config: RetrievalConfig | None = None,
+    ) -> PreparedSearch:
+        """Build a reusable search with a fixed scope.
+
+        The scope part of the request body is encoded once; each
+        `PreparedSearch.search(query)` call only encodes the query.
+        """
+        template = SearchBodyTemplate(
+            topics=topics,
+            user_id=user_id,
+            conversation_id=conversation_id,
+            group=group,
+            retrieval_config=retrieval_config,
+        )
+        return PreparedSearch(self, template)
+
+    def mirror(
+        self,
+        *,
+        user_id: str | None = None,
+        group: str | None = None,
+        limit: int | None = None,
+        resync_interval: float | None = None,
+    ) -> ScopeMirror:
+        """Keep a local copy of one scope; see `ScopeMirror`.
+
+        The scope is loaded on the first read. Finished runs seen by `client.runs` are
+        applied to the mirror for as long as it is referenced.
+        """
+        mirror = ScopeMirror(
+            self,
+            user_id=user_id,
+            group=group,
+            limit=limit,
+            resync_interval=resync_interval,
+        )
+        self._mirrors.add(mirror)
+        return mirror
+
+    def buffered(
+        self,
+        *,
+        max_items: int = DEFAULT_MAX_ITEMS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ) -> WriteBuffer:
+        """Return a `WriteBuffer` that merges small adds into fewer requests."""
+        buffer = WriteBuffer(self, max_items=max_items, max_bytes=max_bytes, max_delay=max_delay)
+        self._buffers.add(buffer)
+        return buffer
+
+    def _close_buffers(self) -> None:
+        """Flush and close the write buffers still open; called when the client closes."""
+        for buffer in list(self._buffers):
+            buffer.close()
+
+    def ordered(
+        self,
+        *,
+        concurrency: int = DEFAULT_ORDERED_CONCURRENCY,
+        key: OrderKey = default_order_key,
+        wait_for_completion: bool = False,
+        wait_timeout: float = DEFAULT_WAIT_TIMEOUT,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> OrderedAddExecutor:
+        """Return an `OrderedAddExecutor` that keeps adds in order per conversation."""
+        return OrderedAddExecutor(
+            self,
+            concurrency=concurrency,
+            key=key,
+            wait_for_completion=wait_for_completion,
+            wait_timeout=wait_timeout,
+            poll_interval=poll_interval,
+        )
+
+    def session(
+        self,
+        conversation_id: str,
+        *,
+        user_id: str | None = None,
+        group: str | None = None,
+        context_messages: int | None = None,
+    ) -> ConversationSession:
+        """Return the `ConversationSession` for this conversation, creating it if needed.
+
+        The same session is returned for the same (`user_id`, `conversation_id`,
+        `group`) while it is among the 1024 most recently used sessions. A new session
+        keeps `context_messages` messages of context (2 if None); asking for an existing
+        session with a different value raises `ValidationError`.
+        """
+        key = (user_id, conversation_id, group)
+        with self._sessions_lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = ConversationSession(
+                    self,
+                    conversation_id,
+                    user_id=user_id,
+                    group=group,
+                    context_messages=_context_messages(context_messages),
+                )
+                while len(self._sessions) > _MAX_SESSIONS:
+                    self._sessions.popitem(last=False)
+            else:
+                _check_context_messages(session, context_messages)
+                self._sessions.move_to_end(key)
+        return session
+
+
+class PreparedSearch:
+    """A search with a fixed scope, created by `Memories.prepare_search()`."""
+
+    def __init__(self, memories: Memories, template: SearchBodyTemplate) -> None:
+        self._memories = memories
+        self._template = template
+
+    def search(self, query: str) -> SearchResults:
+        transport = self._memories._transport
+        content = self._template.render(query)
+
+        def fetch() -> SearchResults:
+            data = transport.request("POST", MEMORIES_SEARCH_PATH, content=content)
+            return parse_search_results(data)
+
+        body = {"query": query, **self._template.fields}
+        return self._memories._with_pending(body, self._memories._cached_search(body, fetch))
 
 
 class AsyncMemories:
     """Async sub-resource for memory operations: client.memories.*"""
 
-    def __init__(self, transport: AsyncHttpTransport) -> None:
+    def __init__(
+        self,
+        transport: AsyncHttpTransport,
+        *,
+        search_cache: SearchCache | None = None,
+        memory_cache: MemoryCache | None = None,
+        write_overlay: WriteOverlay | None = None,
+        add_dedup: AddDeduplicator | None = None,
+        conversation_compactor: ConversationCompactor | None = None,
+        add_splitting: AddSplitting | None = None,
+        add_spool: AddSpool | None = None,
+        add_throttle: RunThrottle | None = None,
+    ) -> None:
         self._transport = transport
+        self._search_cache = search_cache
+        self._memory_cache = memory_cache
+        self._overlay = write_overlay
+        self._dedup = add_dedup
+        self._compactor = conversation_compactor
+        self._splitting = add_splitting
+        self._spool = add_spool
+        self._throttle = add_throttle
+        self._seen_runs: OrderedDict[str, None] = OrderedDict()
+        self._run_groups = RunGroups()
+        self._mirrors: weakref.WeakSet[AsyncScopeMirror] = weakref.WeakSet()
+        self._buffers: weakref.WeakSet[AsyncWriteBuffer] = weakref.WeakSet()
+        self._sessions: OrderedDict[_SessionKey, AsyncConversationSession] = OrderedDict()
+        self._background: set[asyncio.Task[None]] = set()
+
+    @property
+    def with_raw_response(self) -> AsyncRawMemories:
+        """Variants of `get` and `search` that return the undecoded response."""
+        return AsyncRawMemories(self)
 
     async def add(
         self,
@@ -106,15 +703,181 @@ class AsyncMemories:
         user_id: str | None = None,
         conversation_id: str | None = None,
         group: str | None = None,
+        stream_body: bool = False,
     ) -> Run:
-        body = build_add_body(
-            input_data,
+        """Add memories from `input_data`.
+
+        With `stream_body=True` the request body is encoded incrementally and sent
+        chunked, so very large (or generator-backed) conversations and pre-extracted
+        batches are never held in memory as a whole.
+
+        With a `ConversationCompactor` on the client, conversations are compacted before
+        they are sent. With an `AddDeduplicator`, a repeat of a recent add returns the
+        earlier `Run` without a request. With `AddSplitting`, a large string list or
+        pre-extracted batch is sent as several concurrent requests and a `CompositeRun`
+        is returned. If some parts fail, a `SplitAddError` carrying the accepted parts' run
+        is raised once all have finished (the first error, if none was accepted).
+        With an `AddSpool`, the add is written to the local spool instead and replayed
+        in the background; a ``"spooled"`` placeholder `Run` is returned. With a
+        `RunThrottle`, the add first waits while too many of the client's runs are
+        unfinished.
+        """
+        compactor = self._compactor
+        if compactor is not None:
+            input_data, report = compactor.compact(input_data)
+        dedup = self._dedup
+        dedup_key = None
+        if dedup is not None:
+            dedup_key = dedup.key(
+                input_data, user_id=user_id, conversation_id=conversation_id, group=group
+            )
+            if dedup_key is not None and (earlier := dedup.lookup(dedup_key)) is not None:
+                return earlier
+        send = functools.partial(
+            self._send_add,
             user_id=user_id,
             conversation_id=conversation_id,
             group=group,
+            stream_body=stream_body,
+        )
+        splitting = self._splitting
+        throttle = self._throttle if self._spool is None else None
+        if throttle is not None:
+            await throttle.async_admit(self._poll_run)
+        failure = None
+        try:
+            if self._spool is not None:
+                run = self._spool_add(input_data, user_id, conversation_id, group)
+            elif splitting is None or (parts := splitting.split(input_data)) is None:
+                run = await send(input_data)
+            else:
+                semaphore = asyncio.Semaphore(splitting.concurrency)
+
+                async def send_part(part: AddInput) -> Run:
+                    async with semaphore:
+                        return await send(part)
+
+                outcomes = await asyncio.gather(*map(send_part, parts), return_exceptions=True)
+                run, failure = settle_parts(parts, outcomes)
+        except BaseException:
+            if throttle is not None:
+                throttle.release()
+            raise
+        if throttle is not None:
+            throttle.record(run)
+        self._run_groups.record(run, group)
+        if failure is not None:
+            raise failure from failure.error
+        if compactor is not None:
+            compactor.record(report)
+        if dedup is not None and dedup_key is not None:
+            dedup.record(dedup_key, run)
+        return run
+
+    def _spool_add(
+        self,
+        input_data: AddInput,
+        user_id: str | None,
+        conversation_id: str | None,
+        group: str | None,
+    ) -> Run:
+        assert self._spool is not None
+        body = encode_add_body(
+            input_data, user_id=user_id, conversation_id=conversation_id, group=group
+        )
+        run = self._spool.append(body)
+        if self._overlay is not None:
+            self._overlay.record(
+                run, input_data, user_id=user_id, conversation_id=conversation_id, group=group
+            )
+        return run
+
+    async def _send_add(
+        self,
+        input_data: AddInput,
+        *,
+        user_id: str | None,
+        conversation_id: str | None,
+        group: str | None,
+        stream_body: bool,
+    ) -> Run:
+        if stream_body:
+            chunks = iter_add_body(
+                input_data,
+                user_id=user_id,
+                conversation_id=conversation_id,
+                group=group,
+            )
+            run = await self._transport.request_model(
+                "POST", MEMORIES_PATH, parse_run, content=_aiter_chunks(chunks)
+            )
+        elif isinstance(input_data, RawConversationInput):
+            content = encode_add_body(
+                input_data,
+                user_id=user_id,
+                conversation_id=conversation_id,
+                group=group,
+            )
+            run = await self._transport.request_model(
+                "POST", MEMORIES_PATH, parse_run, content=content
+            )
+        else:
+            body = build_add_body(
+                input_data,
+                user_id=user_id,
+                conversation_id=conversation_id,
+                group=group,
+            )
+            run = await self._transport.request_model("POST", MEMORIES_PATH, parse_run, json=body)
+        if self._overlay is not None:
+            self._overlay.record(
+                run, input_data, user_id=user_id, conversation_id=conversation_id, group=group
+            )
+        return run
+
+    async def add_many(
+        self,
+        items: Iterable[AddItem],
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        fail_fast: bool = False,
+        on_progress: ProgressCallback | None = None,
+    ) -> list[AddResult]:
+        """Add every item with up to `concurrency` adds in flight.
+
+        Returns one `AddResult` per item, in input order, holding its `Run` or the error
+        its add raised. With `fail_fast=True` no further items are sent after the first
+        error: once the adds in flight have finished, an `AddManyError` holding that
+        error and the results is raised, and unsent items carry an `AddSkippedError`.
+        `on_progress` is called with (completed, total) after each add.
+        """
+        return await async_send_many(
+            self, items, concurrency=concurrency, fail_fast=fail_fast, on_progress=on_progress
+        )
+
+    def add_stream(
+        self,
+        items: Iterable[AddItem] | AsyncIterable[AddItem],
+        *,
+        max_in_flight: int = DEFAULT_CONCURRENCY,
+        timeout: float = DEFAULT_WAIT_TIMEOUT,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> AsyncGenerator[tuple[AddItem, RunStatus]]:
+        """Add each item (sync or async) and yield (item, `RunStatus`) as each run finishes.
+
+        At most `max_in_flight` items are taken from `items` at a time; the next is only
+        read once one of them has finished, so an unbounded source is never read ahead
+        further than that. Runs are yielded in completion order, including failed
+        runs. An add error, or a run that does not finish within `timeout` seconds, is
+        raised from the iterator and stops it; adds already sent are not undone.
+        """
+        return async_stream_adds(
+            self,
+            items,
+            max_in_flight=max_in_flight,
+            timeout=timeout,
+            poll_interval=poll_interval,
         )
-        data = await self._transport.request("POST", _MEMORIES_PATH, json=body)
-        return parse_run(data)
 
     async def get(
         self,
@@ -127,8 +890,26 @@ class AsyncMemories:
             user_id=user_id,
             group=group,
         )
-        data = await self._transport.request("GET", _memory_path(memory_id), params=params)
-        return parse_memory(data)
+        cache = self._memory_cache
+        if cache is None:
+            return await self._transport.request_model(
+                "GET", memory_path(memory_id), parse_memory, params=params
+            )
+        key = memory_cache_key(memory_id, user_id, group)
+        cached = cache.get(key)
+        if cached is not None and cached.fresh:
+            return cached_memory_or_raise(cached)
+        try:
+            return await self._transport.send_model(
+                "GET",
+                memory_path(memory_id),
+                functools.partial(store_memory, cache, key, cached),
+                headers=revalidation_headers(cached),
+                params=params,
+            )
+        except APIError as exc:
+            remember_missing(cache, key, memory_id, exc)
+            raise
 
     async def delete(
         self,
@@ -141,7 +922,57 @@ class AsyncMemories:
             user_id=user_id,
             group=group,
         )
-        await self._transport.request("DELETE", _memory_path(memory_id), params=params)
+        try:
+            await self._transport.request("DELETE", memory_path(memory_id), params=params)
+        finally:
+            evict_deleted(
+                memory_id, self._search_cache, self._memory_cache, user_id=user_id, group=group
+            )
+
+    def _on_spool_replayed(self, spool_run_id: str, run: Run) -> None:
+        """Move local state for a spooled add over to the run its replay started.
+
+        Called on the spool's replay thread.
+        """
+        self._run_groups.rekey(spool_run_id, run)
+        if self._overlay is not None:
+            self._overlay.rekey(spool_run_id, run)
+        if self._dedup is not None:
+            self._dedup.rekey(spool_run_id, run)
+
+    def _runs(self) -> AsyncRuns:
+        """An `AsyncRuns` over this resource's transport that reports back to it."""
+        return AsyncRuns(self._transport, on_finished=self._on_run_finished, spool=self._spool)
+
+    async def _poll_run(self, run_id: str) -> None:
+        await self._runs().get(run_id)
+
+    async def _on_run_finished(self, status: RunStatus) -> None:
+        if self._throttle is not None:
+            self._throttle.finished(status.run_id)
+        if self._overlay is not None:
+            self._overlay.resolve(status.run_id)
+        if self._dedup is not None and status.status == "failed":
+            self._dedup.forget(status.run_id)
+        group_known, group = self._run_groups.pop(status.run_id)
+        if self._search_cache is None and self._memory_cache is None and not self._mirrors:
+            return
+        if not first_terminal_status(self._seen_runs, status.run_id):
+            return
+        for mirror in list(self._mirrors):
+            await mirror._apply(status, group_known=group_known, group=group)
+        created = apply_run_status(
+            status,
+            self._search_cache,
+            self._memory_cache,
+            group=group,
+            group_known=group_known,
+        )
+        # Prefetch failures are not the caller's problem: a later get() retries.
+        await asyncio.gather(
+            *(self.get(memory_id, user_id=status.user_id, group=group) for memory_id in created),
+            return_exceptions=True,
+        )
 
     async def search(
         self,
@@ -161,5 +992,214 @@ class AsyncMemories:
             group=group,
             retrieval_config=retrieval_config,
         )
-        data = await self._transport.request("POST", _MEMORIES_SEARCH_PATH, json=body)
-        return parse_search_results(data)
+
+        mirror = local_mirror(self._mirrors, body)
+        if mirror is not None and mirror.serves_searches:
+            return await self._with_pending(body, mirror._search_body(body))
+
+        def fetch() -> Awaitable[SearchResults]:
+            return self._transport.request_model(
+                "POST", MEMORIES_SEARCH_PATH, parse_search_results, json=body
+            )
+
+        try:
+            results = await self._cached_search(body, fetch)
+        except Exception as exc:
+            if mirror is None or not server_unavailable(exc):
+                raise
+            results = mirror._search_body(body)
+        return await self._with_pending(body, results)
+
+    async def _with_pending(self, body: dict[str, Any], results: SearchResults) -> SearchResults:
+        overlay = self._overlay
+        if overlay is None:
+            return results
+        for run_id in overlay.due_runs():
+            try:
+                await self._poll_run(run_id)
+            except EngramError:
+                pass
+        return overlay.merge(body, results)
+
+    async def _cached_search(
+        self, body: dict[str, Any], fetch: Callable[[], Awaitable[SearchResults]]
+    ) -> SearchResults:
+        cache = self._search_cache
+        if cache is None:
+            return await fetch()
+        key = search_cache_key(body)
+        scope = search_scope(body)
+        hit = cache.get(key)
+        if hit is not None:
+            results, stale = hit
+            if stale and cache.begin_refresh(key):
+                task = asyncio.create_task(arefresh_search(cache, key, scope, fetch))
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+            return results
+        results = await fetch()
+        cache.put(key, scope, results)
+        return results
+
+    async def search_stream(
+        self,
+        *,
+        query: str,
+        topics: list[str] | None = None,
+        user_id: str | None = None,
+        conversation_id: str | None = None,
+        group: str | None = None,
+        retrieval_config: RetrievalConfig | None = None,
+    ) -> AsyncSearchStream:
+        """Search memories, yielding each `Memory` as soon as it has been received.
+
+        Use as an async context manager (or exhaust the iterator) so the connection is
+        released.
+        """
+        body = build_search_body(
+            query=query,
+            topics=topics,
+            user_id=user_id,
+            conversation_id=conversation_id,
+            group=group,
+            retrieval_config=retrieval_config,
+        )
+        response = await self._transport.stream("POST", MEMORIES_SEARCH_PATH, json=body)
+        return AsyncSearchStream(response)
+
+    def prepare_search(
+        self,
+        *,
+        topics: list[str] | None = None,
+        user_id: str | None = None,
+        conversation_id: str | None = None,
+        group: str | None = None,
+        retrieval_config: RetrievalConfig | None = None,
+    ) -> AsyncPreparedSearch:
+        """Build a reusable search with a fixed scope.
+
+        The scope part of the request body is encoded once; each
+        `AsyncPreparedSearch.search(query)` call only encodes the query.
+        """
+        template = SearchBodyTemplate(
+            topics=topics,
+            user_id=user_id,
+            conversation_id=conversation_id,
+            group=group,
+            retrieval_config=retrieval_config,
+        )
+        return AsyncPreparedSearch(self, template)
+
+    def mirror(
+        self,
+        *,
+        user_id: str | None = None,
+        group: str | None = None,
+        limit: int | None = None,
+        resync_interval: float | None = None,
+    ) -> AsyncScopeMirror:
+        """Keep a local copy of one scope; see `AsyncScopeMirror`.
+
+        The scope is loaded on the first read. Finished runs seen by `client.runs` are
+        applied to the mirror for as long as it is referenced.
+        """
+        mirror = AsyncScopeMirror(
+            self,
+            user_id=user_id,
+            group=group,
+            limit=limit,
+            resync_interval=resync_interval,
+        )
+        self._mirrors.add(mirror)
+        return mirror
+
+    def buffered(
+        self,
+        *,
+        max_items: int = DEFAULT_MAX_ITEMS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ) -> AsyncWriteBuffer:
+        """Return a `AsyncWriteBuffer` that merges small adds into fewer requests."""
+        buffer = AsyncWriteBuffer(
+            self, max_items=max_items, max_bytes=max_bytes, max_delay=max_delay
+        )
+        self._buffers.add(buffer)
+        return buffer
+
+    async def _close_buffers(self) -> None:
+        """Flush and close the write buffers still open; called when the client closes."""
+        for buffer in list(self._buffers):
+            await buffer.aclose()
+
+    def ordered(
+        self,
+        *,
+        concurrency: int = DEFAULT_ORDERED_CONCURRENCY,
+        key: OrderKey = default_order_key,
+        wait_for_completion: bool = False,
+        wait_timeout: float = DEFAULT_WAIT_TIMEOUT,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> AsyncOrderedAddExecutor:
+        """Return an `AsyncOrderedAddExecutor` that keeps adds in order per conversation."""
+        return AsyncOrderedAddExecutor(
+            self,
+            concurrency=concurrency,
+            key=key,
+            wait_for_completion=wait_for_completion,
+            wait_timeout=wait_timeout,
+            poll_interval=poll_interval,
+        )
+
+    def session(
+        self,
+        conversation_id: str,
+        *,
+        user_id: str | None = None,
+        group: str | None = None,
+        context_messages: int | None = None,
+    ) -> AsyncConversationSession:
+        """Return the `AsyncConversationSession` for this conversation, creating it if needed.
+
+        The same session is returned for the same (`user_id`, `conversation_id`,
+        `group`) while it is among the 1024 most recently used sessions. A new session
+        keeps `context_messages` messages of context (2 if None); asking for an existing
+        session with a different value raises `ValidationError`.
+        """
+        key = (user_id, conversation_id, group)
+        session = self._sessions.get(key)
+        if session is None:
+            session = self._sessions[key] = AsyncConversationSession(
+                self,
+                conversation_id,
+                user_id=user_id,
+                group=group,
+                context_messages=_context_messages(context_messages),
+            )
+            while len(self._sessions) > _MAX_SESSIONS:
+                self._sessions.popitem(last=False)
+        else:
+            _check_context_messages(session, context_messages)
+            self._sessions.move_to_end(key)
+        return session
+
+
+class AsyncPreparedSearch:
+    """A search with a fixed scope, created by `AsyncMemories.prepare_search()`."""
+
+    def __init__(self, memories: AsyncMemories, template: SearchBodyTemplate) -> None:
+        self._memories = memories
+        self._template = template
+
+    async def search(self, query: str) -> SearchResults:
+        transport = self._memories._transport
+        content = self._template.render(query)
+
+        def fetch() -> Awaitable[SearchResults]:
+            return transport.request_model(
+                "POST", MEMORIES_SEARCH_PATH, parse_search_results, content=content
+            )
+
+        body = {"query": query, **self._template.fields}
+        results = await self._memories._cached_search(body, fetch)
+        return await self._memories._with_pending(body, results)
@@ -0,0 +1,449 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping
+from typing import TYPE_CHECKING, Any, TypeVar
+from uuid import UUID
+
+import httpx
+
+from .._bm25 import BM25Index
+from .._models import Memory, RetrievalConfig, RunStatus, SearchResults, copy_memory, copy_results
+from .._serialization import (
+    build_memory_params,
+    build_search_body,
+    parse_memory,
+    parse_search_results,
+)
+from ..errors import APIError, ConnectionError, EngramError
+from ._paths import MEMORIES_SEARCH_PATH, memory_path
+
+if TYPE_CHECKING:
+    from .memories import AsyncMemories, Memories
+
+# A change to the mirror: the memory ID and its new value, or None once deleted.
+_Change = tuple[str, Memory | None]
+_M = TypeVar("_M", bound="_MirrorBase")
+
+_DEFAULT_SEARCH_LIMIT = 10
+
+
+class _MirrorState:
+    """The local copy behind `ScopeMirror`/`AsyncScopeMirror`, without any I/O."""
+
+    def __init__(
+        self,
+        *,
+        user_id: str | None,
+        group: str | None,
+        limit: int | None,
+        resync_interval: float | None,
+        clock: Callable[[], float],
+    ) -> None:
+        self.user_id = user_id
+        self.group = group
+        self.limit = limit
+        self.resync_interval = resync_interval
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.memories: dict[str, Memory] = {}
+        # Built on the first keyword search, then kept up to date incrementally.
+        self.index: BM25Index | None = None
+        self.total = 0
+        self.synced_at: float | None = None
+        self.dirty = True
+        # Changes applied while a resync is in flight, replayed onto its snapshot.
+        self.replay: list[_Change] | None = None
+
+    def resync_due(self) -> bool:
+        if self.dirty or self.synced_at is None:
+            return True
+        interval = self.resync_interval
+        return interval is not None and self.clock() - self.synced_at >= interval
+
+    def search_body(self) -> dict[str, Any]:
+        return build_search_body(
+            query="",
+            topics=None,
+            user_id=self.user_id,
+            conversation_id=None,
+            group=self.group,
+            retrieval_config=RetrievalConfig(retrieval_type="fetch", limit=self.limit),
+        )
+
+    def begin_resync(self) -> None:
+        with self.lock:
+            self.replay = []
+
+    def finish_resync(self, results: SearchResults | None) -> None:
+        with self.lock:
+            replay, self.replay = self.replay or [], None
+            if results is None:
+                return
+            memories = {m.id: m for m in results}
+            for memory_id, memory in replay:
+                _set(memories, memory_id, memory)
+            self.memories = memories
+            self.index = None
+            self.total = results.total
+            self.synced_at = self.clock()
+            self.dirty = False
+
+    def matches(self, status: RunStatus, *, group_known: bool, group: str | None) -> bool:
+        """Whether a finished run may have changed this scope.
+
+        `group` is the name the run was added under; `status.group_id` is a server ID
+        and cannot be compared with it. A run of unknown group matches on `user_id`
+        alone: its memories are refetched within the scope, so those of other groups
+        come back 404 and are skipped.
+        """
+        if status.user_id != self.user_id:
+            return False
+        return self.group is None or not group_known or group == self.group
+
+    def apply(self, changes: Iterable[_Change]) -> None:
+        with self.lock:
+            for memory_id, memory in changes:
+                _set(self.memories, memory_id, memory)
+                if self.index is not None:
+                    if memory is None:
+                        self.index.remove(memory_id)
+                    else:
+                        self.index.add(memory)
+                if self.replay is not None:
+                    self.replay.append((memory_id, memory))
+
+    def get(self, memory_id: str | UUID) -> Memory | None:
+        memory = self.memories.get(str(memory_id))
+        return None if memory is None else copy_memory(memory)
+
+    def fetch(self, topics: list[str] | None, limit: int | None) -> SearchResults:
+        memories: Iterable[Memory] = self.memories.values()
+        if topics is not None:
+            wanted = set(topics)
+            memories = [m for m in memories if m.topic in wanted]
+        selected = list(memories)
+        return copy_results(selected[:limit] if limit is not None else selected, len(selected))
+
+    def search(self, query: str, topics: list[str] | None, limit: int | None) -> SearchResults:
+        with self.lock:
+            if self.index is None:
+                self.index = BM25Index(self.memories.values())
+            results = self.index.search(query, topics=topics, limit=limit)
+        return copy_results(results, results.total)
+
+    @property
+    def staleness(self) -> float:
+        return math.inf if self.synced_at is None else self.clock() - self.synced_at
+
+
+def local_mirror(mirrors: Iterable[_M], body: Mapping[str, Any]) -> _M | None:
+    """A loaded mirror of the scope of a ``"bm25"`` search body, if there is one.
+
+    Searches within one conversation are left to the server.
+    """
+    retrieval = body.get("retrieval_config")
+    if retrieval is None or retrieval["retrieval_type"] != "bm25" or "conversation_id" in body:
+        return None
+    for mirror in mirrors:
+        state = mirror._state
+        if (
+            state.synced_at is not None
+            and state.user_id == body.get("user_id")
+            and state.group == body.get("group")
+        ):
+            return mirror
+    return None
+
+
+def server_unavailable(exc: Exception) -> bool:
+    """Whether a failed search may be answered from a mirror instead."""
+    if isinstance(exc, APIError):
+        status = exc.status_code
+        return status is None or status >= 500 or status == 429
+    return isinstance(exc, ConnectionError | httpx.TransportError)
+
+
+def _set(memories: dict[str, Memory], memory_id: str, memory: Memory | None) -> None:
+    if memory is None:
+        memories.pop(memory_id, None)
+    else:
+        memories[memory_id] = memory
+
+
+def _changed_ids(status: RunStatus) -> tuple[list[str], list[str]]:
+    """IDs to refetch and IDs to drop for a finished run."""
+    ops = status.committed_operations
+    if ops is None:
+        return [], []
+    deleted = {op.memory_id for op in ops.deleted}
+    upserted = [op.memory_id for op in (*ops.created, *ops.updated)]
+    return [i for i in dict.fromkeys(upserted) if i not in deleted], list(deleted)
+
+
+class _MirrorBase:
+    _state: _MirrorState
+
+    @property
+    def user_id(self) -> str | None:
+        return self._state.user_id
+
+    @property
+    def group(self) -> str | None:
+        return self._state.group
+
+    @property
+    def staleness(self) -> float:
+        """Seconds since the last full resync (``inf`` before the first one)."""
+        return self._state.staleness
+
+    @property
+    def needs_resync(self) -> bool:
+        """True if the next read reloads the scope first.
+
+        That is the case before the first load, after a run could not be applied, and
+        once `resync_interval` has passed.
+        """
+        return self._state.resync_due()
+
+    @property
+    def complete(self) -> bool:
+        """False if the bulk load was cut off by `limit` or the server's page size."""
+        return self._state.synced_at is not None and len(self._state.memories) >= (
+            self._state.total
+        )
+
+    @property
+    def serves_searches(self) -> bool:
+        """True if ``"bm25"`` searches of this scope are answered from the mirror.
+
+        That is the case while it is complete and needs no resync; otherwise they go to
+        the server and fall back to the mirror only if it is unavailable.
+        """
+        return self.complete and not self._state.resync_due()
+
+    def __len__(self) -> int:
+        return len(self._state.memories)
+
+    def _search_body(self, body: Mapping[str, Any]) -> SearchResults:
+        limit = body["retrieval_config"]["limit"]
+        return self._state.search(
+            body["query"],
+            body.get("topics"),
+            _DEFAULT_SEARCH_LIMIT if limit is None else limit,
+        )
+
+    def __contains__(self, memory_id: object) -> bool:
+        return str(memory_id) in self._state.memories
+
+
+class ScopeMirror(_MirrorBase):
+    """A local copy of every memory in one (`user_id`, `group`) scope.
+
+    Created by `client.memories.mirror()`. The first read bulk-loads the scope with a
+    ``"fetch"`` search; `get()`, `fetch()` and keyword `search()` are then answered
+    from memory. Finished runs seen by `client.runs.get`/`wait` (or passed to
+    `apply()`) are applied by refetching the created and updated memories and dropping
+    the deleted ones. With `resync_interval`, the next read after that many seconds
+    reloads the whole scope; `staleness` reports the seconds since the last full load.
+    Once loaded, it also answers ``"bm25"`` `client.memories.search` calls for its
+    scope; see `serves_searches`.
+    """
+
+    def __init__(
+        self,
+        memories: Memories,
+        *,
+        user_id: str | None = None,
+        group: str | None = None,
+        limit: int | None = None,
+        resync_interval: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._memories = memories
+        self._state = _MirrorState(
+            user_id=user_id,
+            group=group,
+            limit=limit,
+            resync_interval=resync_interval,
+            clock=clock,
+        )
+
+    def resync(self) -> None:
+        """Reload the whole scope from the server."""
+        state = self._state
+        state.begin_resync()
+        results = None
+        try:
+            data = self._memories._transport.request(
+                "POST", MEMORIES_SEARCH_PATH, json=state.search_body()
+            )
+            results = parse_search_results(data)
+        finally:
+            state.finish_resync(results)
+
+    def apply(self, status: RunStatus) -> None:
+        """Apply a finished run's committed operations if it belongs to this scope.
+
+        The run's group is not known here, so for a mirror of one group every created
+        or updated memory of the user is refetched within the scope. A memory that
+        cannot be refetched marks the mirror for a full resync on the next read
+        instead of raising.
+        """
+        self._apply(status, group_known=False, group=None)
+
+    def _apply(self, status: RunStatus, *, group_known: bool, group: str | None) -> None:
+        state = self._state
+        if not state.matches(status, group_known=group_known, group=group):
+            return
+        upserted, deleted = _changed_ids(status)
+        changes: list[_Change] = [(memory_id, None) for memory_id in deleted]
+        for memory_id in upserted:
+            try:
+                changes.append((memory_id, self._fetch_one(memory_id)))
+            except APIError as exc:
+                if exc.status_code == 404:
+                    changes.append((memory_id, None))
+                else:
+                    state.dirty = True
+            except EngramError:
+                state.dirty = True
+        state.apply(changes)
+
+    def get(self, memory_id: str | UUID) -> Memory | None:
+        """The mirrored memory, or None if the scope has no such memory."""
+        self._ensure_fresh()
+        return self._state.get(memory_id)
+
+    def fetch(self, *, topics: list[str] | None = None, limit: int | None = None) -> SearchResults:
+        """Answer a ``"fetch"`` search for this scope locally, optionally by topic."""
+        self._ensure_fresh()
+        return self._state.fetch(topics, limit)
+
+    def search(
+        self,
+        query: str,
+        *,
+        topics: list[str] | None = None,
+        limit: int | None = _DEFAULT_SEARCH_LIMIT,
+    ) -> SearchResults:
+        """Answer a ``"bm25"`` search for this scope locally; see `BM25Index`."""
+        self._ensure_fresh()
+        return self._state.search(query, topics, limit)
+
+    def _ensure_fresh(self) -> None:
+        if self._state.resync_due():
+            self.resync()
+
+    def _fetch_one(self, memory_id: str) -> Memory:
+        params = build_memory_params(user_id=self._state.user_id, group=self._state.group)
+        data = self._memories._transport.request("GET", memory_path(memory_id), params=params)
+        return parse_memory(data)
+
+
+class AsyncScopeMirror(_MirrorBase):
+    """A local copy of every memory in one (`user_id`, `group`) scope.
+
+    Created by the async `client.memories.mirror()`. The first read bulk-loads the
+    scope with a ``"fetch"`` search; `get()`, `fetch()` and keyword `search()` are
+    then answered from memory. Finished runs seen by `client.runs.get`/`wait` (or
+    passed to `apply()`) are applied by refetching the created and updated memories and
+    dropping the deleted ones. With `resync_interval`, the next read after that many
+    seconds reloads the whole scope; `staleness` reports the seconds since the last
+    full load. Once loaded, it also answers ``"bm25"`` `client.memories.search` calls
+    for its scope; see `serves_searches`.
+    """
+
+    def __init__(
+        self,
+        memories: AsyncMemories,
+        *,
+        user_id: str | None = None,
+        group: str | None = None,
+        limit: int | None = None,
+        resync_interval: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._memories = memories
+        self._state = _MirrorState(
+            user_id=user_id,
+            group=group,
+            limit=limit,
+            resync_interval=resync_interval,
+            clock=clock,
+        )
+
+    async def resync(self) -> None:
+        """Reload the whole scope from the server."""
+        state = self._state
+        state.begin_resync()
+        results = None
+        try:
+            results = await self._memories._transport.request_model(
+                "POST", MEMORIES_SEARCH_PATH, parse_search_results, json=state.search_body()
+            )
+        finally:
+            state.finish_resync(results)
+
+    async def apply(self, status: RunStatus) -> None:
+        """Apply a finished run's committed operations if it belongs to this scope.
+
+        The run's group is not known here, so for a mirror of one group every created
+        or updated memory of the user is refetched within the scope. A memory that
+        cannot be refetched marks the mirror for a full resync on the next read
+        instead of raising.
+        """
+        await self._apply(status, group_known=False, group=None)
+
+    async def _apply(self, status: RunStatus, *, group_known: bool, group: str | None) -> None:
+        state = self._state
+        if not state.matches(status, group_known=group_known, group=group):
+            return
+        upserted, deleted = _changed_ids(status)
+        changes: list[_Change] = [(memory_id, None) for memory_id in deleted]
+        for memory_id in upserted:
+            try:
+                changes.append((memory_id, await self._fetch_one(memory_id)))
+            except APIError as exc:
+                if exc.status_code == 404:
+                    changes.append((memory_id, None))
+                else:
+                    state.dirty = True
+            except EngramError:
+                state.dirty = True
+        state.apply(changes)
+
+    async def get(self, memory_id: str | UUID) -> Memory | None:
+        """The mirrored memory, or None if the scope has no such memory."""
+        await self._ensure_fresh()
+        return self._state.get(memory_id)
+
+    async def fetch(
+        self, *, topics: list[str] | None = None, limit: int | None = None
+    ) -> SearchResults:
+        """Answer a ``"fetch"`` search for this scope locally, optionally by topic."""
+        await self._ensure_fresh()
+        return self._state.fetch(topics, limit)
+
+    async def search(
+        self,
+        query: str,
+        *,
+        topics: list[str] | None = None,
+        limit: int | None = _DEFAULT_SEARCH_LIMIT,
+    ) -> SearchResults:
+        """Answer a ``"bm25"`` search for this scope locally; see `BM25Index`."""
+        await self._ensure_fresh()
+        return self._state.search(query, topics, limit)
+
+    async def _ensure_fresh(self) -> None:
+        if self._state.resync_due():
+            await self.resync()
+
+    async def _fetch_one(self, memory_id: str) -> Memory:
+        params = build_memory_params(user_id=self._state.user_id, group=self._state.group)
+        return await self._memories._transport.request_model(
+            "GET", memory_path(memory_id), parse_memory, params=params
+        )
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import threading
+from collections import deque
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from .._models import AddInput, AddItem, Run
+from ..errors import ValidationError
+from .runs import _TERMINAL_STATUSES
+
+if TYPE_CHECKING:
+    from .memories import AsyncMemories, Memories
+
+DEFAULT_ORDERED_CONCURRENCY = 8
+DEFAULT_WAIT_TIMEOUT = 300.0
+DEFAULT_POLL_INTERVAL = 0.5
+
+OrderKey = Callable[[AddItem], Hashable | None]
+
+
+def default_order_key(item: AddItem) -> Hashable | None:
+    """Orders adds per conversation, or per user for adds without a conversation."""
+    if item.conversation_id is not None:
+        return ("conversation", item.group, item.conversation_id)
+    if item.user_id is not None:
+        return ("user", item.group, item.user_id)
+    return None
+
+
+def _validate(concurrency: int, wait_timeout: float, poll_interval: float) -> None:
+    if concurrency <= 0:
+        raise ValidationError("concurrency must be greater than 0.")
+    if wait_timeout <= 0 or poll_interval <= 0:
+        raise ValidationError("wait_timeout and poll_interval must be greater than 0.")
+
+
+def _finished(run: Run, status: str, error: str | None) -> Run:
+    return dataclasses.replace(run, status=status, error=error)
+
+
+class _OrderedBase:
+    def __init__(
+        self,
+        *,
+        concurrency: int,
+        key: OrderKey,
+        wait_for_completion: bool,
+        wait_timeout: float,
+        poll_interval: float,
+    ) -> None:
+        _validate(concurrency, wait_timeout, poll_interval)
+        self._key = key
+        self._wait_for_completion = wait_for_completion
+        self._wait_timeout = wait_timeout
+        self._poll_interval = poll_interval
+        self._closed = False
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Adds submitted but not yet finished."""
+        return self._pending
+
+    def _order_key(self, item: AddItem) -> Hashable:
+        key = self._key(item)
+        # Adds without a key are not ordered against anything, so each gets its own.
+        return object() if key is None else key
+
+    def _should_wait(self, run: Run) -> bool:
+        return self._wait_for_completion and run.status not in _TERMINAL_STATUSES
+
+
+class OrderedAddExecutor(_OrderedBase):
+    """Sends adds in submission order per key and in parallel across keys.
+
+    Created by `client.memories.ordered()`. Each add is assigned a key by `key`
+    (by default its `conversation_id`, or its `user_id` if it has no conversation, within
+    its `group`). Adds with the same key are sent one at a time, in the order they were
+    submitted; adds with different keys run concurrently, at most `concurrency` at a
+    time, with keys taking turns. With `wait_for_completion=True` the next add for a
+    key is only sent once the previous run has completed or failed, and its future
+    resolves to the `Run` with that terminal status.
+
+    `submit()` returns a `Future` that resolves to the add's `Run` (or its error). An
+    error does not stop later adds for the same key. `flush()` waits for everything
+    submitted so far; `close()` (or leaving the ``with`` block) flushes and stops the
+    executor.
+    """
+
+    def __init__(
+        self,
+        memories: Memories,
+        *,
+        concurrency: int = DEFAULT_ORDERED_CONCURRENCY,
+        key: OrderKey = default_order_key,
+        wait_for_completion: bool = False,
+        wait_timeout: float = DEFAULT_WAIT_TIMEOUT,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        super().__init__(
+            concurrency=concurrency,
+            key=key,
+            wait_for_completion=wait_for_completion,
+            wait_timeout=wait_timeout,
+            poll_interval=poll_interval,
+        )
+        self._memories = memories
+        self._runs = memories._runs()
+        self._pool = ThreadPoolExecutor(concurrency, thread_name_prefix="engram-ordered")
+        self._cond = threading.Condition()
+        self._queues: dict[Hashable, deque[tuple[AddItem, Future[Run]]]] = {}
+
+    def submit(
+        self,
+        input_data: AddInput,
+        *,
+        user_id: str | None = None,
+        conversation_id: str | None = None,
+        group: str | None = None,
+    ) -> Future[Run]:
+        item = AddItem(input_data, user_id, conversation_id, group)
+        key = self._order_key(item)
+        future: Future[Run] = Future()
+        with self._cond:
+            if self._closed:
+                raise ValidationError("The ordered add executor is closed.")
+            self._pending += 1
+            queue = self._queues.get(key)
+            if queue is not None:
+                queue.append((item, future))
+                return future
+            self._queues[key] = deque()
+        self._pool.submit(self._step, key, item, future)
+        return future
+
+    def flush(self) -> None:
+        """Wait until every add submitted so far has finished."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending == 0)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+        self.flush()
+        self._pool.shutdown()
+
+    def __enter__(self) -> OrderedAddExecutor:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
+
+    def _step(self, key: Hashable, item: AddItem, future: Future[Run]) -> None:
+        self._send(item, future)
+        with self._cond:
+            self._pending -= 1
+            queue = self._queues[key]
+            if not queue:
+                del self._queues[key]
+                self._cond.notify_all()
+                return
+            item, future = queue.popleft()
+        # Resubmit rather than loop, so that other keys waiting for a worker get a turn.
+        self._pool.submit(self._step, key, item, future)
+
+    def _send(self, item: AddItem, future: Future[Run]) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            run = self._memories.add(
+                item.input_data,
+                user_id=item.user_id,
+                conversation_id=item.conversation_id,
+                group=item.group,
+            )
+            if self._should_wait(run):
+                status = self._runs.wait(
+                    run.run_id, timeout=self._wait_timeout, interval=self._poll_interval
+                )
+                run = _finished(run, status.status, status.error)
+        except Exception as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(run)
+
+
+class AsyncOrderedAddExecutor(_OrderedBase):
+    """Sends adds in submission order per key and in parallel across keys.
+
+    Created by the async `client.memories.ordered()`. Each add is assigned a key by
+    `key` (by default its `conversation_id`, or its `user_id` if it has no conversation,
+    within its `group`). Adds with the same key are sent one at a time, in the order they
+    were submitted; adds with different keys run concurrently, at most `concurrency` at
+    a time. With `wait_for_completion=True` the next add for a key is only sent once the
+    previous run has completed or failed, and its future resolves to the `Run` with that
+    terminal status.
+
+    `submit()` returns an `asyncio.Future` that resolves to the add's `Run` (or its
+    error). An error does not stop later adds for the same key. Await `flush()` to wait
+    for everything submitted so far; `aclose()` (or leaving the ``async with`` block)
+    flushes and stops the executor.
+    """
+
+    def __init__(
+        self,
+        memories: AsyncMemories,
+        *,
+        concurrency: int = DEFAULT_ORDERED_CONCURRENCY,
+        key: OrderKey = default_order_key,
+        wait_for_completion: bool = False,
+        wait_timeout: float = DEFAULT_WAIT_TIMEOUT,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        super().__init__(
+            concurrency=concurrency,
+            key=key,
+            wait_for_completion=wait_for_completion,
+            wait_timeout=wait_timeout,
+            poll_interval=poll_interval,
+        )
+        self._memories = memories
+        self._runs = memories._runs()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._queues: dict[Hashable, deque[tuple[AddItem, asyncio.Future[Run]]]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def submit(
+        self,
+        input_data: AddInput,
+        *,
+        user_id: str | None = None,
+        conversation_id: str | None = None,
+        group: str | None = None,
+    ) -> asyncio.Future[Run]:
+        """Queue an add; must be called from a running event loop."""
+        if self._closed:
+            raise ValidationError("The ordered add executor is closed.")
+        item = AddItem(input_data, user_id, conversation_id, group)
+        key = self._order_key(item)
+        future: asyncio.Future[Run] = asyncio.get_running_loop().create_future()
+        self._pending += 1
+        queue = self._queues.get(key)
+        if queue is not None:
+            queue.append((item, future))
+        else:
+            self._queues[key] = deque()
+            self._spawn(key, item, future)
+        return future
+
+    async def flush(self) -> None:
+        """Wait until every add submitted so far has finished."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def aclose(self) -> None:
+        self._closed = True
+        await self.flush()
+
+    async def __aenter__(self) -> AsyncOrderedAddExecutor:
+        return self
+
+    async def __aexit__(self, exc_type: object, exc: object, tb: object) -> None:
+        await self.aclose()
+
+    def _spawn(self, key: Hashable, item: AddItem, future: asyncio.Future[Run]) -> None:
+        task = asyncio.get_running_loop().create_task(self._step(key, item, future))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _step(self, key: Hashable, item: AddItem, future: asyncio.Future[Run]) -> None:
+        async with self._semaphore:
+            await self._send(item, future)
+        self._pending -= 1
+        queue = self._queues[key]
+        if queue:
+            self._spawn(key, *queue.popleft())
+        else:
+            del self._queues[key]
+
+    async def _send(self, item: AddItem, future: asyncio.Future[Run]) -> None:
+        if future.done():
+            return
+        try:
+            run = await self._memories.add(
+                item.input_data,
+                user_id=item.user_id,
+                conversation_id=item.conversation_id,
+                group=item.group,
+            )
+            if self._should_wait(run):
+                status = await self._runs.wait(
+                    run.run_id, timeout=self._wait_timeout, interval=self._poll_interval
+                )
+                run = _finished(run, status.status, status.error)
+        except Exception as exc:
+            if not future.done():
+                future.set_exception(exc)
+        else:
+            if not future.done():
+                future.set_result(run)
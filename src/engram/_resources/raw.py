@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from .._models import RetrievalConfig
+from .._response import AsyncRawResponse, RawResponse
+from .._serialization import build_memory_params, build_search_body
+from ._paths import MEMORIES_SEARCH_PATH, memory_path
+
+if TYPE_CHECKING:
+    from .memories import AsyncMemories, Memories
+
+
+class RawMemories:
+    """Memory reads that return the undecoded response: client.memories.with_raw_response.*
+
+    Non-2xx responses still raise the SDK's usual errors. With ``stream=True`` the body
+    is left unread so it can be forwarded chunk by chunk.
+    """
+
+    def __init__(self, memories: Memories) -> None:
+        self._memories = memories
+
+    def get(
+        self,
+        memory_id: str | UUID,
+        *,
+        user_id: str | None = None,
+        group: str | None = None,
+        stream: bool = False,
+    ) -> RawResponse:
+        params = build_memory_params(
+            user_id=user_id,
+            group=group,
+        )
+        transport = self._memories._transport
+        response = transport.stream("GET", memory_path(memory_id), params=params)
+        if not stream:
+            try:
+                response.read()
+            finally:
+                response.close()
+        return RawResponse(response)
+
+    def search(
+        self,
+        *,
+        query: str,
+        topics: list[str] | None = None,
+        user_id: str | None = None,
+        conversation_id: str | None = None,
+        group: str | None = None,
+        retrieval_config: RetrievalConfig | None = None,
+        stream: bool = False,
+    ) -> RawResponse:
+        body = build_search_body(
+            query=query,
+            topics=topics,
+            user_id=user_id,
+            conversation_id=conversation_id,
+            group=group,
+            retrieval_config=retrieval_config,
+        )
+        response = self._memories._transport.stream("POST", MEMORIES_SEARCH_PATH, json=body)
+        if not stream:
+            try:
+                response.read()
+            finally:
+                response.close()
+        return RawResponse(response)
+
+
+class AsyncRawMemories:
+    """Memory reads that return the undecoded response: client.memories.with_raw_response.*
+
+    Non-2xx responses still raise the SDK's usual errors. With ``stream=True`` the body
+    is left unread so it can be forwarded chunk by chunk.
+    """
+
+    def __init__(self, memories: AsyncMemories) -> None:
+        self._memories = memories
+
+    async def get(
+        self,
+        memory_id: str | UUID,
+        *,
+        user_id: str | None = None,
+        group: str | None = None,
+        stream: bool = False,
+    ) -> AsyncRawResponse:
+        params = build_memory_params(
+            user_id=user_id,
+            group=group,
+        )
+        transport = self._memories._transport
+        response = await transport.stream("GET", memory_path(memory_id), params=params)
+        if not stream:
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
+        return AsyncRawResponse(response)
+
+    async def search(
+        self,
+        *,
+        query: str,
+        topics: list[str] | None = None,
+        user_id: str | None = None,
+        conversation_id: str | None = None,
+        group: str | None = None,
+        retrieval_config: RetrievalConfig | None = None,
+        stream: bool = False,
+    ) -> AsyncRawResponse:
+        body = build_search_body(
+            query=query,
+            topics=topics,
+            user_id=user_id,
+            conversation_id=conversation_id,
+            group=group,
+            retrieval_config=retrieval_config,
+        )
+        transport = self._memories._transport
+        response = await transport.stream("POST", MEMORIES_SEARCH_PATH, json=body)
+        if not stream:
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
+        return AsyncRawResponse(response)
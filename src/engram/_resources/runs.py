@@ -2,11 +2,18 @@ from __future__ import annotations
 
 import asyncio
 import time
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
 
 from .._http import AsyncHttpTransport, HttpTransport
-from .._models import RunStatus
+from .._models import Run, RunStatus
 from .._serialization import parse_run_status
-from ..errors import EngramTimeoutError
+from .._splitting import COMPOSITE_RUN_SEPARATOR, merge_run_statuses, split_run_id
+from .._spool import is_spool_run_id
+from ..errors import EngramTimeoutError, ValidationError
+
+if TYPE_CHECKING:
+    from .._spool import AddSpool
 
 _RUNS_PATH = "/v1/runs"
 
@@ -17,15 +24,70 @@ def _run_path(run_id: str) -> str:
     return f"{_RUNS_PATH}/{run_id}"
 
 
+def _rejected_status(run: Run) -> RunStatus:
+    """The final status of a spooled add the server rejected; it never had a server run."""
+    return RunStatus(
+        run_id=run.run_id,
+        status="failed",
+        group_id="",
+        starting_step=0,
+        input_type="",
+        created_at="",
+        updated_at="",
+        error=run.error,
+    )
+
+
+def _resolved(spool: AddSpool, run_id: str) -> Run:
+    run = spool.resolve(run_id)
+    if run is None:
+        raise ValidationError(
+            f"Run {run_id!r} has not been replayed from the add spool yet; use runs.wait()."
+        )
+    return run
+
+
+def _finished_status(run_id: str, parts: list[str], finished: dict[str, RunStatus]) -> RunStatus:
+    if len(parts) == 1:
+        return finished[run_id]
+    return merge_run_statuses(run_id, [finished[part] for part in parts])
+
+
 class Runs:
-    """Sync sub-resource for run operations: client.runs.*"""
+    """Sync sub-resource for run operations: client.runs.*
+
+    `on_finished` is called with every completed or failed status `get` returns; the
+    client uses it to keep its memory caches consistent with the run's writes.
+
+    The ``run_id`` of a `CompositeRun` is accepted too: its parts are fetched and
+    reported as one `RunStatus`, which finishes once every part has. So are the
+    ``"spool-<n>"`` IDs of an `AddSpool`: `wait` first waits for the add to be
+    replayed, and both then report the server's run. An add the server rejected on
+    replay reports a ``"failed"`` status under its spool ID.
+    """
 
-    def __init__(self, transport: HttpTransport) -> None:
+    def __init__(
+        self,
+        transport: HttpTransport,
+        *,
+        on_finished: Callable[[RunStatus], None] | None = None,
+        spool: AddSpool | None = None,
+    ) -> None:
         self._transport = transport
+        self._on_finished = on_finished
+        self._spool = spool
 
     def get(self, run_id: str) -> RunStatus:
+        if self._spool is not None and is_spool_run_id(run_id):
+            run = _resolved(self._spool, run_id)
+            return _rejected_status(run) if run.run_id == run_id else self.get(run.run_id)
+        if COMPOSITE_RUN_SEPARATOR in run_id:
+            return merge_run_statuses(run_id, [self.get(part) for part in split_run_id(run_id)])
         data = self._transport.request("GET", _run_path(run_id))
-        return parse_run_status(data)
+        status = parse_run_status(data)
+        if self._on_finished is not None and status.status in _TERMINAL_STATUSES:
+            self._on_finished(status)
+        return status
 
     def wait(
         self,
@@ -35,24 +97,63 @@ class Runs:
         interval: float = 0.5,
     ) -> RunStatus:
         deadline = time.monotonic() + timeout
+        if self._spool is not None and is_spool_run_id(run_id):
+            run = self._spool.wait_resolved(run_id, timeout)
+            if run is None:
+                raise EngramTimeoutError(run_id, timeout)
+            if run.run_id == run_id:
+                return _rejected_status(run)
+            run_id = run.run_id
+        parts = split_run_id(run_id)
+        finished: dict[str, RunStatus] = {}
         while True:
-            status = self.get(run_id)
-            if status.status in _TERMINAL_STATUSES:
-                return status
+            for part in parts:
+                if part not in finished:
+                    status = self.get(part)
+                    if status.status in _TERMINAL_STATUSES:
+                        finished[part] = status
+            if len(finished) == len(parts):
+                return _finished_status(run_id, parts, finished)
             if time.monotonic() + interval > deadline:
                 raise EngramTimeoutError(run_id, timeout)
             time.sleep(interval)
 
 
 class AsyncRuns:
-    """Async sub-resource for run operations: client.runs.*"""
+    """Async sub-resource for run operations: client.runs.*
+
+    `on_finished` is awaited with every completed or failed status `get` returns; the
+    client uses it to keep its memory caches consistent with the run's writes.
 
-    def __init__(self, transport: AsyncHttpTransport) -> None:
+    The ``run_id`` of a `CompositeRun` is accepted too: its parts are fetched and
+    reported as one `RunStatus`, which finishes once every part has. So are the
+    ``"spool-<n>"`` IDs of an `AddSpool`: `wait` first waits for the add to be
+    replayed, and both then report the server's run. An add the server rejected on
+    replay reports a ``"failed"`` status under its spool ID.
+    """
+
+    def __init__(
+        self,
+        transport: AsyncHttpTransport,
+        *,
+        on_finished: Callable[[RunStatus], Awaitable[None]] | None = None,
+        spool: AddSpool | None = None,
+    ) -> None:
         self._transport = transport
+        self._on_finished = on_finished
+        self._spool = spool
 
     async def get(self, run_id: str) -> RunStatus:
-        data = await self._transport.request("GET", _run_path(run_id))
-        return parse_run_status(data)
+        if self._spool is not None and is_spool_run_id(run_id):
+            run = _resolved(self._spool, run_id)
+            return _rejected_status(run) if run.run_id == run_id else await self.get(run.run_id)
+        if COMPOSITE_RUN_SEPARATOR in run_id:
+            parts = await asyncio.gather(*(self.get(part) for part in split_run_id(run_id)))
+            return merge_run_statuses(run_id, list(parts))
+        status = await self._transport.request_model("GET", _run_path(run_id), parse_run_status)
+        if self._on_finished is not None and status.status in _TERMINAL_STATUSES:
+            await self._on_finished(status)
+        return status
 
     async def wait(
         self,
@@ -63,10 +164,23 @@ class AsyncRuns:
     ) -> RunStatus:
         loop = asyncio.get_running_loop()
         deadline = loop.time() + timeout
+        if self._spool is not None and is_spool_run_id(run_id):
+            run = await asyncio.to_thread(self._spool.wait_resolved, run_id, timeout)
+            if run is None:
+                raise EngramTimeoutError(run_id, timeout)
+            if run.run_id == run_id:
+                return _rejected_status(run)
+            run_id = run.run_id
+        parts = split_run_id(run_id)
+        finished: dict[str, RunStatus] = {}
         while True:
-            status = await self.get(run_id)
-            if status.status in _TERMINAL_STATUSES:
-                return status
+            pending = [part for part in parts if part not in finished]
+            statuses = await asyncio.gather(*(self.get(part) for part in pending))
+            for part, status in zip(pending, statuses, strict=True):
+                if status.status in _TERMINAL_STATUSES:
+                    finished[part] = status
+            if len(finished) == len(parts):
+                return _finished_status(run_id, parts, finished)
             if loop.time() + interval > deadline:
                 raise EngramTimeoutError(run_id, timeout)
             await asyncio.sleep(interval)
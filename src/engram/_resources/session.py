@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from .._models import ConversationInput, MessageInput, Run
+from .._serialization._builders import _serialize_message
+from ..errors import ValidationError
+
+if TYPE_CHECKING:
+    from .memories import AsyncMemories, Memories
+
+DEFAULT_CONTEXT_MESSAGES = 2
+_CONTEXT_ROLES = ("system", "developer")
+
+
+def _message_hash(message: MessageInput) -> bytes:
+    encoded = json.dumps(_serialize_message(message), sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode(), digest_size=16).digest()
+
+
+def _messages(conversation: ConversationInput | Sequence[MessageInput]) -> Sequence[MessageInput]:
+    messages = (
+        conversation.messages if isinstance(conversation, ConversationInput) else conversation
+    )
+    if not isinstance(messages, Sequence):
+        raise ValidationError("Session conversations must be a sequence of messages.")
+    return messages
+
+
+class _SessionState:
+    """Which messages of a conversation were uploaded, and what the next upload needs."""
+
+    def __init__(self, context_messages: int) -> None:
+        if context_messages < 0:
+            raise ValidationError("context_messages must not be negative.")
+        self.context_messages = context_messages
+        self.sent: list[bytes] = []
+        self.delta_uploads = 0
+        self.full_uploads = 0
+        self.messages_skipped = 0
+
+    def plan(
+        self, messages: Sequence[MessageInput]
+    ) -> tuple[list[bytes], list[MessageInput], bool]:
+        """Hash `messages` and pick what to send; returns (hashes, to_send, is_delta)."""
+        hashes = [_message_hash(m) for m in messages]
+        done = len(self.sent)
+        if not done or len(hashes) < done or hashes[:done] != self.sent:
+            return hashes, list(messages), False
+        if len(hashes) == done:
+            return hashes, [], True
+        keep = set(range(done, len(messages)))
+        keep.update(range(max(0, done - self.context_messages), done))
+        answered = {m.tool_call_id for m in messages[done:] if m.role == "tool" and m.tool_call_id}
+        for i in range(done):
+            message = messages[i]
+            if message.role in _CONTEXT_ROLES:
+                keep.add(i)
+            elif message.tool_calls and any(c.id in answered for c in message.tool_calls):
+                keep.add(i)
+        return hashes, [messages[i] for i in sorted(keep)], True
+
+    def commit(self, hashes: list[bytes], sent: int, delta: bool) -> None:
+        self.sent = hashes
+        if delta:
+            self.delta_uploads += 1
+            self.messages_skipped += len(hashes) - sent
+        else:
+            self.full_uploads += 1
+
+    def reset(self) -> None:
+        self.sent = []
+
+
+def _with_messages(
+    conversation: ConversationInput | Sequence[MessageInput], messages: list[MessageInput]
+) -> ConversationInput:
+    if isinstance(conversation, ConversationInput):
+        return ConversationInput(
+            messages=messages,
+            metadata=conversation.metadata,
+            created_at=conversation.created_at,
+            updated_at=conversation.updated_at,
+        )
+    return ConversationInput(messages=messages)
+
+
+class _SessionBase:
+    def __init__(
+        self,
+        conversation_id: str,
+        *,
+        user_id: str | None,
+        group: str | None,
+        context_messages: int,
+    ) -> None:
+        self.conversation_id = conversation_id
+        self.user_id = user_id
+        self.group = group
+        self._state = _SessionState(context_messages)
+
+    @property
+    def context_messages(self) -> int:
+        return self._state.context_messages
+
+    @property
+    def sent(self) -> int:
+        """Number of messages the server has seen so far."""
+        return len(self._state.sent)
+
+    @property
+    def delta_uploads(self) -> int:
+        return self._state.delta_uploads
+
+    @property
+    def full_uploads(self) -> int:
+        return self._state.full_uploads
+
+    @property
+    def messages_skipped(self) -> int:
+        """Messages left out of delta uploads because the server already had them."""
+        return self._state.messages_skipped
+
+    def reset(self) -> None:
+        """Forget what was sent, so the next `add` uploads the whole conversation."""
+        self._state.reset()
+
+
+class ConversationSession(_SessionBase):
+    """Uploads an ongoing conversation to `memories.add` one new tail at a time.
+
+    Created by `client.memories.session()`. Pass the whole conversation so far to
+    `add()` each turn. The session remembers a hash of every message already sent for
+    its `conversation_id` and uploads only the new messages, plus the context the
+    extractor needs to read them: system and developer messages, the
+    `context_messages` messages just before the tail, and the assistant messages whose
+    tool calls the tail answers. If an earlier message was edited or removed, the
+    whole conversation is uploaded again. `add()` returns None when there is nothing
+    new to send.
+    """
+
+    def __init__(
+        self,
+        memories: Memories,
+        conversation_id: str,
+        *,
+        user_id: str | None = None,
+        group: str | None = None,
+        context_messages: int = DEFAULT_CONTEXT_MESSAGES,
+    ) -> None:
+        super().__init__(
+            conversation_id, user_id=user_id, group=group, context_messages=context_messages
+        )
+        self._memories = memories
+        self._lock = threading.Lock()
+
+    def add(self, conversation: ConversationInput | Sequence[MessageInput]) -> Run | None:
+        messages = _messages(conversation)
+        with self._lock:
+            hashes, to_send, delta = self._state.plan(messages)
+            if not to_send:
+                return None
+            run = self._memories.add(
+                _with_messages(conversation, to_send),
+                user_id=self.user_id,
+                conversation_id=self.conversation_id,
+                group=self.group,
+            )
+            self._state.commit(hashes, len(to_send), delta)
+            return run
+
+
+class AsyncConversationSession(_SessionBase):
+    """Uploads an ongoing conversation to `memories.add` one new tail at a time.
+
+    The async counterpart of `ConversationSession`, created by the async
+    `client.memories.session()`. Turns of one session are uploaded one at a time.
+    """
+
+    def __init__(
+        self,
+        memories: AsyncMemories,
+        conversation_id: str,
+        *,
+        user_id: str | None = None,
+        group: str | None = None,
+        context_messages: int = DEFAULT_CONTEXT_MESSAGES,
+    ) -> None:
+        super().__init__(
+            conversation_id, user_id=user_id, group=group, context_messages=context_messages
+        )
+        self._memories = memories
+        self._lock = asyncio.Lock()
+
+    async def add(self, conversation: ConversationInput | Sequence[MessageInput]) -> Run | None:
+        messages = _messages(conversation)
+        async with self._lock:
+            hashes, to_send, delta = self._state.plan(messages)
+            if not to_send:
+                return None
+            run = await self._memories.add(
+                _with_messages(conversation, to_send),
+                user_id=self.user_id,
+                conversation_id=self.conversation_id,
+                group=self.group,
+            )
+            self._state.commit(hashes, len(to_send), delta)
+            return run
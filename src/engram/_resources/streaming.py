@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+import httpx
+
+from .._models import Memory
+from .._serialization import SearchResultsDecoder, parse_memory
+from ..errors import APIError
+
+
+def _malformed(response: httpx.Response, exc: ValueError) -> APIError:
+    return APIError(str(exc), status_code=response.status_code)
+
+
+class SearchStream(Iterator[Memory]):
+    """Iterator over search results parsed incrementally from the response body.
+
+    `total` is None until the server's ``total`` field has been received. The
+    underlying response is closed when iteration finishes or on `close()`.
+    """
+
+    def __init__(self, response: httpx.Response) -> None:
+        self._response = response
+        self._chunks = response.iter_bytes()
+        self._decoder = SearchResultsDecoder()
+        self._pending: deque[dict[str, Any]] = deque()
+        self._finished = False
+
+    @property
+    def total(self) -> int | None:
+        return self._decoder.total
+
+    def __iter__(self) -> SearchStream:
+        return self
+
+    def __next__(self) -> Memory:
+        while not self._pending:
+            if self._finished:
+                raise StopIteration
+            chunk = next(self._chunks, None)
+            try:
+                if chunk is None:
+                    self._pending.extend(self._decoder.close())
+                    self.close()
+                else:
+                    self._pending.extend(self._decoder.feed(chunk))
+            except ValueError as exc:
+                self.close()
+                raise _malformed(self._response, exc) from exc
+        return parse_memory(self._pending.popleft())
+
+    def close(self) -> None:
+        self._finished = True
+        self._response.close()
+
+    def __enter__(self) -> SearchStream:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
+
+
+class AsyncSearchStream(AsyncIterator[Memory]):
+    """Async iterator over search results parsed incrementally from the response body.
+
+    `total` is None until the server's ``total`` field has been received. The
+    underlying response is closed when iteration finishes or on `aclose()`.
+    """
+
+    def __init__(self, response: httpx.Response) -> None:
+        self._response = response
+        self._chunks = response.aiter_bytes()
+        self._decoder = SearchResultsDecoder()
+        self._pending: deque[dict[str, Any]] = deque()
+        self._finished = False
+
+    @property
+    def total(self) -> int | None:
+        return self._decoder.total
+
+    def __aiter__(self) -> AsyncSearchStream:
+        return self
+
+    async def __anext__(self) -> Memory:
+        while not self._pending:
+            if self._finished:
+                raise StopAsyncIteration
+            chunk = await anext(self._chunks, None)
+            try:
+                if chunk is None:
+                    self._pending.extend(self._decoder.close())
+                    await self.aclose()
+                else:
+                    self._pending.extend(self._decoder.feed(chunk))
+            except ValueError as exc:
+                await self.aclose()
+                raise _malformed(self._response, exc) from exc
+        return parse_memory(self._pending.popleft())
+
+    async def aclose(self) -> None:
+        self._finished = True
+        await self._response.aclose()
+
+    async def __aenter__(self) -> AsyncSearchStream:
+        return self
+
+    async def __aexit__(self, exc_type: object, exc: object, tb: object) -> None:
+        await self.aclose()
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator, Mapping
+from typing import Any
+
+import httpx
+
+# Headers that describe the upstream connection or encoding rather than the body we
+# re-emit; httpx has already removed any content-encoding from the bytes we yield.
+_HOP_HEADERS = frozenset(
+    (
+        "connection",
+        "content-encoding",
+        "content-length",
+        "keep-alive",
+        "transfer-encoding",
+    )
+)
+
+WSGIStartResponse = Callable[[str, list[tuple[str, str]]], Any]
+ASGISend = Callable[[Mapping[str, Any]], Awaitable[None]]
+
+
+def _forward_headers(headers: httpx.Headers) -> list[tuple[str, str]]:
+    return [(k, v) for k, v in headers.items() if k.lower() not in _HOP_HEADERS]
+
+
+class RawResponse:
+    """Undecoded successful response from `client.memories.with_raw_response`.
+
+    Error statuses are raised as `APIError` before this object is returned. When the
+    body was requested with ``stream=True`` it has not been read yet: iterate it with
+    `iter_bytes()` or hand it to a WSGI server with `to_wsgi()`, and close it when done.
+    """
+
+    def __init__(self, response: httpx.Response) -> None:
+        self._response = response
+
+    @property
+    def status_code(self) -> int:
+        return self._response.status_code
+
+    @property
+    def reason_phrase(self) -> str:
+        return self._response.reason_phrase
+
+    @property
+    def headers(self) -> httpx.Headers:
+        return self._response.headers
+
+    @property
+    def content(self) -> bytes:
+        """The full body, reading it first if it is still streaming."""
+        return self._response.read()
+
+    def iter_bytes(self, chunk_size: int | None = None) -> Iterator[bytes]:
+        """Yield the body as it arrives and close the response afterwards."""
+        try:
+            yield from self._response.iter_bytes(chunk_size)
+        finally:
+            self._response.close()
+
+    def to_wsgi(self, start_response: WSGIStartResponse) -> Iterator[bytes]:
+        """Start a WSGI response with this status and headers and return the body iterable."""
+        start_response(
+            f"{self.status_code} {self.reason_phrase}",
+            _forward_headers(self.headers),
+        )
+        return self.iter_bytes()
+
+    def close(self) -> None:
+        self._response.close()
+
+    def __enter__(self) -> RawResponse:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"RawResponse(status_code={self.status_code})"
+
+
+class AsyncRawResponse:
+    """Undecoded successful response from the async `client.memories.with_raw_response`.
+
+    Error statuses are raised as `APIError` before this object is returned. When the
+    body was requested with ``stream=True`` it has not been read yet: iterate it with
+    `aiter_bytes()` or send it to an ASGI server with `to_asgi()`, and close it when done.
+    """
+
+    def __init__(self, response: httpx.Response) -> None:
+        self._response = response
+
+    @property
+    def status_code(self) -> int:
+        return self._response.status_code
+
+    @property
+    def reason_phrase(self) -> str:
+        return self._response.reason_phrase
+
+    @property
+    def headers(self) -> httpx.Headers:
+        return self._response.headers
+
+    async def read(self) -> bytes:
+        """The full body, reading it first if it is still streaming."""
+        return await self._response.aread()
+
+    async def aiter_bytes(self, chunk_size: int | None = None) -> AsyncIterator[bytes]:
+        """Yield the body as it arrives and close the response afterwards."""
+        try:
+            async for chunk in self._response.aiter_bytes(chunk_size):
+                yield chunk
+        finally:
+            await self._response.aclose()
+
+    async def to_asgi(self, send: ASGISend) -> None:
+        """Send this status, headers and body as an ASGI HTTP response."""
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": [
+                    (k.encode("latin-1"), v.encode("latin-1"))
+                    for k, v in _forward_headers(self.headers)
+                ],
+            }
+        )
+        async for chunk in self.aiter_bytes():
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def aclose(self) -> None:
+        await self._response.aclose()
+
+    async def __aenter__(self) -> AsyncRawResponse:
+        return self
+
+    async def __aexit__(self, exc_type: object, exc: object, tb: object) -> None:
+        await self.aclose()
+
+    def __repr__(self) -> str:
+        return f"AsyncRawResponse(status_code={self.status_code})"
@@ -3,17 +3,24 @@ from ._builders import (
     build_memory_params,
     build_search_body,
 )
+from ._encoders import SearchBodyTemplate, encode_add_body, encode_json, iter_add_body
 from ._parsers import (
     parse_memory,
     parse_run,
     parse_run_status,
     parse_search_results,
 )
+from ._stream import SearchResultsDecoder
 
 __all__ = [
+    "SearchBodyTemplate",
+    "SearchResultsDecoder",
     "build_add_body",
     "build_memory_params",
     "build_search_body",
+    "encode_add_body",
+    "encode_json",
+    "iter_add_body",
     "parse_memory",
     "parse_run",
     "parse_run_status",
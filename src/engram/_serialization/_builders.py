@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import json
 from typing import Any
 
 from .._models import (
     AddInput,
     ConversationInput,
+    MessageInput,
     PreExtractedInput,
+    PreExtractedItem,
+    RawConversationInput,
     RetrievalConfig,
     StringInput,
     ToolCallInput,
@@ -31,7 +35,7 @@ def _serialize_input(input_data: AddInput) -> dict[str, Any]:
         else:
             return {"string": {"content": [input_data.content]}}
     if isinstance(input_data, PreExtractedInput):
-        items = [{"content": item.content, "topic": item.topic} for item in input_data.items]
+        items = [_serialize_pre_extracted_item(item) for item in input_data.items]
         return {"pre_extracted": {"items": items}}
     if isinstance(input_data, list):
         return {
@@ -39,46 +43,76 @@ def _serialize_input(input_data: AddInput) -> dict[str, Any]:
         }
     if isinstance(input_data, ConversationInput):
         return _serialize_conversation_content(input_data)
+    if isinstance(input_data, RawConversationInput):
+        conversation = {"messages": json.loads(input_data.messages)}
+        conversation.update(_serialize_conversation_fields(input_data))
+        return {"conversation": conversation}
     raise TypeError(f"Unsupported input type: {type(input_data)}")  # pragma: no cover
 
 
-def _serialize_conversation_content(content: ConversationInput) -> dict[str, Any]:
-    messages = []
-    for msg in content.messages:
-        m: dict[str, Any] = {"role": msg.role, "content": msg.content}
-        if msg.created_at is not None:
-            m["created_at"] = msg.created_at
-        if msg.tool_call_id is not None:
-            m["tool_call_id"] = msg.tool_call_id
-        if msg.name is not None:
-            m["name"] = msg.name
-        if msg.tool_calls is not None:
-            m["tool_calls"] = [_serialize_tool_call(tc) for tc in msg.tool_calls]
-        messages.append(m)
-    conversation: dict[str, Any] = {"messages": messages}
+def _serialize_message(msg: MessageInput) -> dict[str, Any]:
+    m: dict[str, Any] = {"role": msg.role, "content": msg.content}
+    if msg.created_at is not None:
+        m["created_at"] = msg.created_at
+    if msg.tool_call_id is not None:
+        m["tool_call_id"] = msg.tool_call_id
+    if msg.name is not None:
+        m["name"] = msg.name
+    if msg.tool_calls is not None:
+        m["tool_calls"] = [_serialize_tool_call(tc) for tc in msg.tool_calls]
+    return m
+
+
+def _serialize_pre_extracted_item(item: PreExtractedItem) -> dict[str, Any]:
+    return {"content": item.content, "topic": item.topic}
+
+
+def _serialize_conversation_fields(
+    content: ConversationInput | RawConversationInput,
+) -> dict[str, Any]:
+    """Conversation-level fields that follow the message list."""
+    fields: dict[str, Any] = {}
     if content.metadata is not None:
-        conversation["metadata"] = content.metadata
+        fields["metadata"] = content.metadata
     if content.created_at is not None:
-        conversation["created_at"] = content.created_at
+        fields["created_at"] = content.created_at
     if content.updated_at is not None:
-        conversation["updated_at"] = content.updated_at
+        fields["updated_at"] = content.updated_at
+    return fields
+
+
+def _serialize_conversation_content(content: ConversationInput) -> dict[str, Any]:
+    messages = [_serialize_message(msg) for msg in content.messages]
+    conversation: dict[str, Any] = {"messages": messages}
+    conversation.update(_serialize_conversation_fields(content))
     return {"conversation": conversation}
 
 
-def build_add_body(
-    input_data: AddInput,
+def _build_scope_fields(
     *,
     user_id: str | None,
     conversation_id: str | None,
     group: str | None,
 ) -> dict[str, Any]:
-    body: dict[str, Any] = {"input": _serialize_input(input_data)}
+    fields: dict[str, Any] = {}
     if user_id is not None:
-        body["user_id"] = user_id
+        fields["user_id"] = user_id
     if conversation_id is not None:
-        body["conversation_id"] = conversation_id
+        fields["conversation_id"] = conversation_id
     if group is not None:
-        body["group"] = group
+        fields["group"] = group
+    return fields
+
+
+def build_add_body(
+    input_data: AddInput,
+    *,
+    user_id: str | None,
+    conversation_id: str | None,
+    group: str | None,
+) -> dict[str, Any]:
+    body: dict[str, Any] = {"input": _serialize_input(input_data)}
+    body.update(_build_scope_fields(user_id=user_id, conversation_id=conversation_id, group=group))
     return body
 
 
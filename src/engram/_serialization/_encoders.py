@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from .._models import (
+    AddInput,
+    ConversationInput,
+    PreExtractedInput,
+    RawConversationInput,
+    RetrievalConfig,
+)
+from ..errors import ValidationError
+from ._builders import (
+    _build_scope_fields,
+    _serialize_conversation_fields,
+    _serialize_input,
+    _serialize_message,
+    _serialize_pre_extracted_item,
+    build_add_body,
+    build_search_body,
+)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Same compact form httpx uses for `json=` bodies.
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+
+
+def encode_json(value: Any) -> bytes:
+    return _encoder.encode(value).encode("utf-8")
+
+
+def _iter_array(values: Iterable[Any]) -> Iterator[str]:
+    yield "["
+    first = True
+    for value in values:
+        if not first:
+            yield ","
+        first = False
+        yield _encoder.encode(value)
+    yield "]"
+
+
+def _iter_object_tail(fields: dict[str, Any]) -> Iterator[str]:
+    """Encode `fields` as the remainder of an already-open object, closing it."""
+    for key, value in fields.items():
+        yield f",{_encoder.encode(key)}:{_encoder.encode(value)}"
+    yield "}"
+
+
+def _raw_messages(input_data: RawConversationInput) -> bytes:
+    messages = input_data.messages
+    if not messages.lstrip().startswith(b"["):
+        raise ValidationError("RawConversationInput.messages must be a JSON array.")
+    return messages
+
+
+def _iter_input(input_data: AddInput) -> Iterator[str | bytes]:
+    if isinstance(input_data, RawConversationInput):
+        yield '{"conversation":{"messages":'
+        yield _raw_messages(input_data)
+        yield from _iter_object_tail(_serialize_conversation_fields(input_data))
+        yield "}"
+    elif isinstance(input_data, ConversationInput):
+        yield '{"conversation":{"messages":'
+        yield from _iter_array(_serialize_message(msg) for msg in input_data.messages)
+        yield from _iter_object_tail(_serialize_conversation_fields(input_data))
+        yield "}"
+    elif isinstance(input_data, PreExtractedInput):
+        yield '{"pre_extracted":{"items":'
+        yield from _iter_array(_serialize_pre_extracted_item(item) for item in input_data.items)
+        yield "}}"
+    elif isinstance(input_data, list):
+        yield '{"conversation":{"messages":'
+        yield from _iter_array(input_data)
+        yield "}}"
+    else:
+        yield _encoder.encode(_serialize_input(input_data))
+
+
+def iter_add_body(
+    input_data: AddInput,
+    *,
+    user_id: str | None,
+    conversation_id: str | None,
+    group: str | None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Encode the same body as `build_add_body` as a stream of UTF-8 chunks.
+
+    Messages and pre-extracted items are serialized one at a time as the stream is
+    consumed, so neither the nested dict nor the full JSON document is ever built.
+    Output is coalesced into chunks of roughly `chunk_size` bytes.
+    """
+    parts: list[bytes] = []
+    size = 0
+    scope = _build_scope_fields(user_id=user_id, conversation_id=conversation_id, group=group)
+
+    def pieces() -> Iterator[str | bytes]:
+        yield '{"input":'
+        yield from _iter_input(input_data)
+        yield from _iter_object_tail(scope)
+
+    for piece in pieces():
+        data = piece.encode("utf-8") if isinstance(piece, str) else piece
+        parts.append(data)
+        size += len(data)
+        if size >= chunk_size:
+            yield b"".join(parts)
+            parts.clear()
+            size = 0
+    if parts:
+        yield b"".join(parts)
+
+
+def encode_add_body(
+    input_data: AddInput,
+    *,
+    user_id: str | None,
+    conversation_id: str | None,
+    group: str | None,
+) -> bytes:
+    """Encode the add body to JSON bytes, splicing in pre-encoded raw messages as-is."""
+    if isinstance(input_data, RawConversationInput):
+        chunks = iter_add_body(
+            input_data,
+            user_id=user_id,
+            conversation_id=conversation_id,
+            group=group,
+            chunk_size=len(input_data.messages) + DEFAULT_CHUNK_SIZE,
+        )
+        return b"".join(chunks)
+    return encode_json(
+        build_add_body(input_data, user_id=user_id, conversation_id=conversation_id, group=group)
+    )
+
+
+class SearchBodyTemplate:
+    """Pre-encoded search body for a fixed scope; only the query is encoded per call."""
+
+    __slots__ = ("_suffix", "fields")
+
+    def __init__(
+        self,
+        *,
+        topics: list[str] | None,
+        user_id: str | None,
+        conversation_id: str | None,
+        group: str | None,
+        retrieval_config: RetrievalConfig | None,
+    ) -> None:
+        fields = build_search_body(
+            query="",
+            topics=topics,
+            user_id=user_id,
+            conversation_id=conversation_id,
+            group=group,
+            retrieval_config=retrieval_config,
+        )
+        del fields["query"]
+        self.fields = fields
+        self._suffix = "".join(_iter_object_tail(fields)).encode("utf-8")
+
+    def render(self, query: str) -> bytes:
+        return b'{"query":' + encode_json(query) + self._suffix
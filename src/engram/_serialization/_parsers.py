@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any
+import sys
+from typing import Any, overload
 
 from .._models import (
     CommittedOperation,
@@ -20,17 +21,35 @@ def parse_run(data: dict[str, Any]) -> Run:
     )
 
 
+@overload
+def _intern(value: str) -> str: ...
+
+
+@overload
+def _intern(value: None) -> None: ...
+
+
+def _intern(value: str | None) -> str | None:
+    """Intern low-cardinality scope fields so repeated values share one string.
+
+    Anything but a string (a null from the server, say) is returned as is.
+    """
+    if type(value) is str:
+        return sys.intern(value)
+    return value
+
+
 def parse_memory(data: dict[str, Any]) -> Memory:
     return Memory(
         id=data["id"],
-        project_id=data["project_id"],
+        project_id=_intern(data["project_id"]),
         content=data["content"],
-        topic=data["topic"],
-        group=data["group"],
+        topic=_intern(data["topic"]),
+        group=_intern(data["group"]),
         created_at=data["created_at"],
         updated_at=data["updated_at"],
-        user_id=data.get("user_id"),
-        conversation_id=data.get("conversation_id"),
+        user_id=_intern(data.get("user_id")),
+        conversation_id=_intern(data.get("conversation_id")),
         tags=data.get("tags"),
         score=data.get("score"),
     )
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any
+
+_WHITESPACE = " \t\n\r"
+
+_DECODER = json.JSONDecoder()
+
+
+class SearchResultsDecoder:
+    """Incrementally decodes a search response body of the form
+    ``{"memories": [...], "total": N}``.
+
+    Feed raw body chunks with `feed()`; each call returns the memory objects that
+    became complete. Keys other than ``memories`` are decoded whole, so `total`
+    is available as soon as its value has been received, before or after the
+    array.
+    """
+
+    def __init__(self) -> None:
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"
+        self._key: str | None = None
+        self.total: int | None = None
+
+    @property
+    def done(self) -> bool:
+        return self._state == "done"
+
+    def feed(self, chunk: bytes) -> list[dict[str, Any]]:
+        self._buf = self._buf[self._pos :] + self._utf8.decode(chunk)
+        self._pos = 0
+        return self._drain(final=False)
+
+    def close(self) -> list[dict[str, Any]]:
+        """Flush the decoder at end of body; raises ValueError if it was truncated."""
+        self._buf = self._buf[self._pos :] + self._utf8.decode(b"", final=True)
+        self._pos = 0
+        items = self._drain(final=True)
+        if self._state != "done":
+            raise ValueError("Search response body ended before the JSON object was complete")
+        return items
+
+    def _skip_whitespace(self) -> bool:
+        buf, pos = self._buf, self._pos
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return pos < len(buf)
+
+    def _value(self, final: bool) -> tuple[bool, Any]:
+        try:
+            value, end = _DECODER.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise ValueError("Malformed search response body") from None
+            return False, None
+        # A bare scalar at the end of the buffer may still be growing ("12" -> "123").
+        if end == len(self._buf) and not final and not isinstance(value, dict | list | str):
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _expect(self, *chars: str) -> str:
+        char = self._buf[self._pos]
+        if char not in chars:
+            raise ValueError(f"Unexpected {char!r} in search response body")
+        self._pos += 1
+        return char
+
+    def _drain(self, *, final: bool) -> list[dict[str, Any]]:
+        items: list[dict[str, Any]] = []
+        while self._state != "done" and self._skip_whitespace():
+            state = self._state
+            if state == "start":
+                self._expect("{")
+                self._state = "key_or_end"
+            elif state in ("key_or_end", "key"):
+                if state == "key_or_end" and self._buf[self._pos] == "}":
+                    self._pos += 1
+                    self._state = "done"
+                    continue
+                ok, key = self._value(final)
+                if not ok:
+                    break
+                if not isinstance(key, str):
+                    raise ValueError("Expected an object key in search response body")
+                self._key = key
+                self._state = "colon"
+            elif state == "colon":
+                self._expect(":")
+                if self._key == "memories":
+                    self._state = "array_start"
+                else:
+                    self._state = "value"
+            elif state == "value":
+                ok, value = self._value(final)
+                if not ok:
+                    break
+                if self._key == "total":
+                    self.total = value
+                self._state = "after_value"
+            elif state == "after_value":
+                self._state = "key" if self._expect(",", "}") == "," else "done"
+            elif state == "array_start":
+                self._expect("[")
+                self._state = "item_or_end"
+            elif state in ("item_or_end", "item"):
+                if state == "item_or_end" and self._buf[self._pos] == "]":
+                    self._pos += 1
+                    self._state = "after_value"
+                    continue
+                ok, item = self._value(final)
+                if not ok:
+                    break
+                items.append(item)
+                self._state = "after_item"
+            elif state == "after_item":
+                self._state = "item" if self._expect(",", "]") == "," else "after_value"
+        return items
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TypeVar
+
+from ._models import (
+    AddInput,
+    CommittedOperations,
+    CompositeRun,
+    PreExtractedInput,
+    Run,
+    RunStatus,
+    StringInput,
+)
+from .errors import SplitAddError, ValidationError
+
+COMPOSITE_RUN_SEPARATOR = ","
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True, slots=True)
+class AddSplitting:
+    """Splits large `memories.add` inputs into several concurrent requests.
+
+    Pass an instance as `add_splitting=` to `EngramClient` or `AsyncEngramClient`. A
+    `StringInput` list or a `PreExtractedInput` item sequence with more than
+    `max_items` entries or `max_bytes` of content is sent as consecutive parts within
+    both limits, at most `concurrency` at a time. `memories.add` then returns a
+    `CompositeRun` covering every part. Conversations are never split, since each part
+    would lose the context of the others.
+    """
+
+    max_items: int = 1000
+    max_bytes: int = 1024 * 1024
+    concurrency: int = 4
+
+    def __post_init__(self) -> None:
+        if self.max_items <= 0 or self.max_bytes <= 0 or self.concurrency <= 0:
+            raise ValidationError("max_items, max_bytes and concurrency must be greater than 0.")
+
+    def split(self, input_data: AddInput) -> list[AddInput] | None:
+        """The parts to send, or None if `input_data` fits in one request."""
+        if isinstance(input_data, StringInput) and isinstance(input_data.content, list):
+            strings = input_data.content
+            sizes = [len(s.encode()) for s in strings]
+            return [StringInput(part) for part in self._chunks(strings, sizes)] or None
+        if isinstance(input_data, PreExtractedInput) and isinstance(input_data.items, Sequence):
+            items = input_data.items
+            sizes = [len(i.content.encode()) + len(i.topic.encode()) for i in items]
+            return [PreExtractedInput(part) for part in self._chunks(items, sizes)] or None
+        return None
+
+    def _chunks(self, entries: Sequence[_T], sizes: list[int]) -> list[list[_T]]:
+        """Consecutive chunks within both limits; empty if everything fits in one."""
+        if len(entries) <= self.max_items and sum(sizes) <= self.max_bytes:
+            return []
+        chunks: list[list[_T]] = []
+        start = 0
+        total = 0
+        for i, size in enumerate(sizes):
+            if i > start and (i - start >= self.max_items or total + size > self.max_bytes):
+                chunks.append(list(entries[start:i]))
+                start = i
+                total = 0
+            total += size
+        chunks.append(list(entries[start:]))
+        return chunks
+
+
+def composite_run(runs: list[Run]) -> CompositeRun:
+    """One handle for the runs of a split add; its status is the least advanced part's."""
+    errors = [run.error for run in runs if run.error]
+    statuses = {run.status for run in runs}
+    return CompositeRun(
+        run_id=COMPOSITE_RUN_SEPARATOR.join(run.run_id for run in runs),
+        status=runs[0].status if len(statuses) == 1 else _combined_status(statuses),
+        error="; ".join(errors) if errors else None,
+        runs=runs,
+    )
+
+
+def settle_parts(
+    parts: list[AddInput], outcomes: Sequence[Run | BaseException]
+) -> tuple[CompositeRun, SplitAddError | None]:
+    """Combine the outcomes of a split add's parts, in order.
+
+    Returns the `CompositeRun` of the accepted parts and, if some part failed, the
+    `SplitAddError` to raise once that run is recorded. If no part was accepted (or a
+    part was cancelled) the first error is raised as is.
+    """
+    runs = [outcome for outcome in outcomes if isinstance(outcome, Run)]
+    failed = [
+        (part, outcome)
+        for part, outcome in zip(parts, outcomes, strict=True)
+        if isinstance(outcome, BaseException)
+    ]
+    if not failed:
+        return composite_run(runs), None
+    error = failed[0][1]
+    if not runs or not all(isinstance(o, Exception) for _, o in failed):
+        raise error
+    assert isinstance(error, Exception)
+    run = composite_run(runs)
+    return run, SplitAddError(error, run, [part for part, _ in failed])
+
+
+# How far an unfinished run has got; statuses not listed rank as least advanced.
+_PENDING_RANK = {"queued": 1, "running": 2}
+
+
+def _combined_status(statuses: set[str]) -> str:
+    pending = statuses - {"completed", "failed"}
+    if pending:
+        return min(pending, key=lambda status: (_PENDING_RANK.get(status, 0), status))
+    return "failed"
+
+
+def split_run_id(run_id: str) -> list[str]:
+    return run_id.split(COMPOSITE_RUN_SEPARATOR)
+
+
+def merge_run_statuses(run_id: str, statuses: list[RunStatus]) -> RunStatus:
+    """Report the parts of a `CompositeRun` as one run, with their operations combined."""
+    first = statuses[0]
+    merged = CommittedOperations()
+    has_operations = False
+    for status in statuses:
+        ops = status.committed_operations
+        if ops is not None:
+            has_operations = True
+            merged.created.extend(ops.created)
+            merged.updated.extend(ops.updated)
+            merged.deleted.extend(ops.deleted)
+    combined = composite_run([Run(s.run_id, s.status, s.error) for s in statuses])
+    return RunStatus(
+        run_id=run_id,
+        status=combined.status,
+        group_id=first.group_id,
+        starting_step=min(s.starting_step for s in statuses),
+        input_type=first.input_type,
+        created_at=min(s.created_at for s in statuses),
+        updated_at=max(s.updated_at for s in statuses),
+        committed_operations=merged if has_operations else None,
+        error=combined.error,
+        user_id=first.user_id,
+    )
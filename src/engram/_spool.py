@@ -0,0 +1,503 @@
+from __future__ import annotations
+
+import os
+import random
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from ._models import Run
+from .errors import APIError, ValidationError
+
+# Add record: payload length, CRC-32 of the payload, sequence number, appended at (wall).
+_RECORD = struct.Struct("<IIQd")
+# Ack record: payload length, CRC-32 of the payload, sequence number. The payload is
+# the run ID, or b"\0" followed by the error for an add the server rejected.
+_ACK = struct.Struct("<IIQ")
+_SEGMENT_SUFFIX = ".seg"
+_ACKS_FILE = "acks.log"
+_RUN_PREFIX = "spool-"
+# Rewrite the ack log once it holds this many acks for already deleted segments.
+_MIN_ACK_COMPACTION = 1024
+_MAX_RESULTS = 10_000
+# Statuses worth retrying; other 4xx responses will not succeed on replay.
+_RETRY_STATUSES = frozenset((408, 425, 429))
+
+
+@dataclass(slots=True)
+class SpoolStats:
+    """Counters for an `AddSpool`. Read a snapshot via its `stats`.
+
+    `depth` and `pending_bytes` describe adds not yet accepted by the server, and `lag`
+    is the age in seconds of the oldest of them.
+    """
+
+    depth: int = 0
+    pending_bytes: int = 0
+    lag: float = 0.0
+    appended: int = 0
+    replayed: int = 0
+    rejected: int = 0
+    retries: int = 0
+    segments: int = 0
+    segments_compacted: int = 0
+    fsyncs: int = 0
+    recovered: int = 0
+
+
+@dataclass(slots=True)
+class _Pending:
+    seq: int
+    segment: _Segment
+    offset: int
+    length: int
+    appended_at: float
+
+
+@dataclass(slots=True)
+class _Segment:
+    path: Path
+    first: int
+    last: int
+    size: int
+    pending: set[int]
+
+
+def _read_records(path: Path, header: struct.Struct) -> tuple[list[tuple[int, int, bytes]], int]:
+    """Valid records of a log as (seq, payload offset, header + payload), and the good length.
+
+    Reading stops at the first torn or corrupt record, which a crash mid-write leaves.
+    """
+    data = path.read_bytes()
+    records = []
+    offset = 0
+    while offset + header.size <= len(data):
+        length, crc, seq = header.unpack_from(data, offset)[:3]
+        start = offset + header.size
+        payload = data[start : start + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            break
+        records.append((seq, start, data[offset : start + length]))
+        offset = start + length
+    return records, offset
+
+
+def spool_run_id(seq: int) -> str:
+    return f"{_RUN_PREFIX}{seq}"
+
+
+def is_spool_run_id(run_id: str) -> bool:
+    return _spool_seq(run_id) is not None
+
+
+def _spool_seq(run_id: str) -> int | None:
+    if not run_id.startswith(_RUN_PREFIX):
+        return None
+    try:
+        return int(run_id[len(_RUN_PREFIX) :])
+    except ValueError:
+        return None
+
+
+def _acked_run(seq: int, payload: bytes) -> Run:
+    """The `Run` an ack record stands for."""
+    if payload.startswith(b"\0"):
+        return Run(run_id=spool_run_id(seq), status="failed", error=payload[1:].decode())
+    # Only the run ID is logged; the server accepted the add, so report it as queued.
+    return Run(run_id=payload.decode(), status="queued")
+
+
+class AddSpool:
+    """Durable local write-ahead log for `memories.add`.
+
+    Pass an instance as `add_spool=` to `EngramClient` or `AsyncEngramClient`. Adds are
+    then encoded and appended to segment files in `directory` and `memories.add`
+    returns at once with a ``"spooled"`` `Run` whose `run_id` is ``"spool-<n>"``. A
+    background thread in the client replays the log to Engram, at most `concurrency`
+    requests at a time and with exponential backoff (up to `max_backoff` seconds) while
+    the server is unreachable or overloaded. Adds the server rejects outright (other
+    4xx responses) are not retried. `resolve()` maps a spool run ID to the server's
+    `Run` once it is known, and `wait_resolved()` blocks until then; the client's
+    `runs.get`/`wait` accept spool run IDs through them. Once an add is replayed, the
+    client's `WriteOverlay` and `AddDeduplicator` switch from its spool run ID to the
+    server's run. A `RunThrottle` does not apply to spooled adds or their replay.
+
+    Writes are fsynced in batches, at most `fsync_interval` seconds after they are
+    made (`sync()` forces it). Segments are rotated at `segment_bytes` and deleted once
+    every add in them has been replayed. Opening a directory resumes any adds left by
+    an earlier process; delivery is at least once, so an add whose acknowledgement was
+    lost in a crash is sent again. Only one process should use a directory at a time.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        segment_bytes: int = 8 * 1024 * 1024,
+        fsync_interval: float = 0.05,
+        concurrency: int = 4,
+        max_backoff: float = 30.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if segment_bytes <= 0 or concurrency <= 0:
+            raise ValidationError("segment_bytes and concurrency must be greater than 0.")
+        if fsync_interval < 0 or max_backoff <= 0:
+            raise ValidationError("fsync_interval must not be negative; max_backoff must be > 0.")
+        self.concurrency = concurrency
+        self.max_backoff = max_backoff
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._segment_bytes = segment_bytes
+        self._fsync_interval = fsync_interval
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._segments: dict[int, _Segment] = {}
+        self._pending: OrderedDict[int, _Pending] = OrderedDict()
+        self._in_flight: set[int] = set()
+        self._results: OrderedDict[int, Run] = OrderedDict()
+        self._stats = SpoolStats()
+        self._acks_path = self._directory / _ACKS_FILE
+        self._dirty = False
+        self._last_sync = time.monotonic()
+        self._attached = False
+        self._closed = False
+        self._recover()
+        self._acks_file = open(self._acks_path, "ab", buffering=0)
+        self._active = self._new_segment()
+        self._active_file = open(self._active.path, "ab", buffering=0)
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @property
+    def stats(self) -> SpoolStats:
+        with self._cond:
+            stats = replace(self._stats)
+            stats.depth = len(self._pending)
+            stats.pending_bytes = sum(p.length for p in self._pending.values())
+            stats.segments = len(self._segments)
+            oldest = next(iter(self._pending.values()), None)
+            stats.lag = 0.0 if oldest is None else max(0.0, self._clock() - oldest.appended_at)
+            return stats
+
+    def __len__(self) -> int:
+        """Adds waiting to be replayed."""
+        return len(self._pending)
+
+    def append(self, body: bytes) -> Run:
+        """Append an encoded add body; returns its ``"spooled"`` placeholder run."""
+        with self._cond:
+            if self._closed:
+                raise ValidationError("The add spool is closed.")
+            segment = self._active
+            if segment.size >= self._segment_bytes:
+                segment = self._rotate()
+            seq = self._next_seq
+            self._next_seq += 1
+            appended_at = self._clock()
+            header = _RECORD.pack(len(body), zlib.crc32(body), seq, appended_at)
+            self._active_file.write(header + body)
+            self._pending[seq] = _Pending(
+                seq, segment, segment.size + _RECORD.size, len(body), appended_at
+            )
+            segment.size += _RECORD.size + len(body)
+            segment.last = seq
+            segment.pending.add(seq)
+            self._dirty = True
+            self._stats.appended += 1
+            self._cond.notify_all()
+        return Run(run_id=spool_run_id(seq), status="spooled")
+
+    def resolve(self, run_id: str) -> Run | None:
+        """The server's `Run` for a spooled add, or None while it is still pending.
+
+        Adds the server rejected resolve to a ``"failed"`` run carrying the error.
+        Results of the most recent 10,000 replayed adds are kept, across reopens too.
+        """
+        seq = _spool_seq(run_id)
+        if seq is None:
+            return None
+        with self._cond:
+            return self._results.get(seq)
+
+    def wait_resolved(self, run_id: str, timeout: float | None = None) -> Run | None:
+        """Block until the spooled add `run_id` has been replayed and return its `Run`.
+
+        Returns None on timeout or if the spool is closed first. Raises
+        `ValidationError` for an ID the spool holds neither as pending nor as replayed.
+        """
+        seq = _spool_seq(run_id)
+        with self._cond:
+            if seq is None or (seq not in self._pending and seq not in self._results):
+                raise ValidationError(f"The add spool has no record of run {run_id!r}.")
+            self._cond.wait_for(lambda: seq not in self._pending or self._closed, timeout)
+            return self._results.get(seq)
+
+    def sync(self) -> None:
+        """fsync every write made so far."""
+        with self._cond:
+            self._sync()
+
+    def wait_empty(self, timeout: float | None = None) -> bool:
+        """Block until every spooled add has been replayed; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending, timeout)
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._sync()
+            self._closed = True
+            self._active_file.close()
+            self._acks_file.close()
+            self._cond.notify_all()
+
+    def __enter__(self) -> AddSpool:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
+
+    def _attach(self) -> None:
+        with self._cond:
+            if self._attached:
+                raise ValidationError("An AddSpool can only be used by one client at a time.")
+            self._attached = True
+
+    def _detach(self) -> None:
+        with self._cond:
+            self._attached = False
+            self._cond.notify_all()
+
+    def _take(self, limit: int, timeout: float) -> list[tuple[int, bytes]]:
+        """Claim up to `limit` pending adds, oldest first, waiting up to `timeout`."""
+        with self._cond:
+            if len(self._in_flight) == len(self._pending) and not self._closed:
+                self._cond.wait(timeout)
+            if time.monotonic() - self._last_sync >= self._fsync_interval:
+                self._sync()
+            claimed: list[_Pending] = []
+            for seq, pending in self._pending.items():
+                if len(claimed) == limit:
+                    break
+                if seq not in self._in_flight:
+                    claimed.append(pending)
+                    self._in_flight.add(seq)
+        return [(p.seq, self._read_body(p)) for p in claimed]
+
+    def _release(self, seq: int) -> None:
+        with self._cond:
+            self._in_flight.discard(seq)
+            self._stats.retries += 1
+
+    def _ack(self, seq: int, run: Run) -> None:
+        """Record the outcome of a replayed add and drop it from the log."""
+        payload = (
+            run.run_id.encode() if run.status != "failed" else b"\0" + (run.error or "").encode()
+        )
+        with self._cond:
+            self._in_flight.discard(seq)
+            if self._closed:
+                # The ack cannot be logged any more, so the add is replayed on reopen.
+                return
+            pending = self._pending.pop(seq, None)
+            if pending is None:
+                return
+            self._acks_file.write(_ACK.pack(len(payload), zlib.crc32(payload), seq) + payload)
+            self._dirty = True
+            self._results[seq] = run
+            while len(self._results) > _MAX_RESULTS:
+                self._results.popitem(last=False)
+            if run.status == "failed":
+                self._stats.rejected += 1
+            else:
+                self._stats.replayed += 1
+            segment = pending.segment
+            segment.pending.discard(seq)
+            if not segment.pending and segment is not self._active:
+                self._delete(segment)
+            self._cond.notify_all()
+
+    def _read_body(self, pending: _Pending) -> bytes:
+        with open(pending.segment.path, "rb") as f:
+            f.seek(pending.offset)
+            return f.read(pending.length)
+
+    def _sync(self) -> None:
+        if self._dirty and not self._closed:
+            os.fsync(self._active_file.fileno())
+            os.fsync(self._acks_file.fileno())
+            self._dirty = False
+            self._stats.fsyncs += 1
+        self._last_sync = time.monotonic()
+
+    def _new_segment(self) -> _Segment:
+        first = self._next_seq
+        path = self._directory / f"{first:020d}{_SEGMENT_SUFFIX}"
+        path.touch()
+        segment = self._segments[first] = _Segment(path, first, first - 1, 0, set())
+        return segment
+
+    def _rotate(self) -> _Segment:
+        """Start a new active segment; the old one is kept until it is fully replayed."""
+        self._sync()
+        self._active_file.close()
+        old = self._active
+        self._active = self._new_segment()
+        self._active_file = open(self._active.path, "ab", buffering=0)
+        if not old.pending:
+            self._delete(old)
+        return self._active
+
+    def _delete(self, segment: _Segment) -> None:
+        del self._segments[segment.first]
+        segment.path.unlink(missing_ok=True)
+        self._stats.segments_compacted += 1
+        self._maybe_compact_acks()
+
+    def _maybe_compact_acks(self) -> None:
+        """Drop acks for deleted segments once there are enough of them."""
+        if not self._acks_path.exists():
+            return
+        records, _ = _read_records(self._acks_path, _ACK)
+        kept = self._kept_acks(records)
+        if len(records) - len(kept) >= _MIN_ACK_COMPACTION:
+            self._acks_file.close()
+            self._rewrite(self._acks_path, kept)
+            self._acks_file = open(self._acks_path, "ab", buffering=0)
+
+    def _kept_acks(self, records: list[tuple[int, int, bytes]]) -> list[bytes]:
+        """Acks to keep when the ack log is rewritten.
+
+        That is those of adds still in a segment, which a reopen would replay otherwise,
+        and the most recent ones, which `resolve()` reports.
+        """
+        recent = len(records) - _MAX_RESULTS
+        return [
+            raw for i, (seq, _, raw) in enumerate(records) if i >= recent or self._has_segment(seq)
+        ]
+
+    def _has_segment(self, seq: int) -> bool:
+        return any(s.first <= seq <= s.last for s in self._segments.values())
+
+    def _rewrite(self, path: Path, records: list[bytes]) -> None:
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(b"".join(records))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _recover(self) -> None:
+        """Load pending adds left by an earlier process and drop what was replayed."""
+        acks_path = self._acks_path
+        acked: set[int] = set()
+        ack_records: list[tuple[int, int, bytes]] = []
+        if acks_path.exists():
+            ack_records, good = _read_records(acks_path, _ACK)
+            if good < acks_path.stat().st_size:
+                os.truncate(acks_path, good)
+            acked = {seq for seq, _, _ in ack_records}
+            for seq, _, raw in ack_records[-_MAX_RESULTS:]:
+                self._results[seq] = _acked_run(seq, raw[_ACK.size :])
+        self._next_seq = 1
+        for path in sorted(self._directory.glob(f"*{_SEGMENT_SUFFIX}")):
+            records, good = _read_records(path, _RECORD)
+            if good < path.stat().st_size:
+                os.truncate(path, good)
+            first = int(path.stem) if path.stem.isdigit() else records[0][0] if records else 1
+            self._next_seq = max(self._next_seq, first)
+            segment = _Segment(path, first, first - 1, good, set())
+            for seq, offset, raw in records:
+                self._next_seq = max(self._next_seq, seq + 1)
+                segment.last = seq
+                if seq in acked:
+                    continue
+                appended_at = _RECORD.unpack_from(raw)[3]
+                length = len(raw) - _RECORD.size
+                self._pending[seq] = _Pending(seq, segment, offset, length, appended_at)
+                segment.pending.add(seq)
+            if segment.pending:
+                self._segments[first] = segment
+                self._stats.recovered += len(segment.pending)
+            else:
+                path.unlink()
+        self._next_seq = max([self._next_seq, *(s + 1 for s in acked)])
+        if acks_path.exists():
+            self._rewrite(acks_path, self._kept_acks(ack_records))
+
+
+def _retryable(exc: Exception) -> bool:
+    if isinstance(exc, APIError):
+        status = exc.status_code
+        return status is None or status >= 500 or status in _RETRY_STATUSES
+    return not isinstance(exc, ValidationError)
+
+
+class _SpoolReplayer:
+    """Background thread that sends a client's spooled adds with `send`."""
+
+    def __init__(
+        self,
+        spool: AddSpool,
+        send: Callable[[bytes], Run],
+        on_replayed: Callable[[str, Run], None] | None = None,
+    ) -> None:
+        spool._attach()
+        self._spool = spool
+        self._send = send
+        self._on_replayed = on_replayed
+        self._stop = threading.Event()
+        self._pool = ThreadPoolExecutor(spool.concurrency, thread_name_prefix="engram-spool")
+        self._thread = threading.Thread(target=self._run, name="engram-spool", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        with self._spool._cond:
+            self._spool._cond.notify_all()
+        self._thread.join()
+        self._pool.shutdown()
+        self._spool.sync()
+        self._spool._detach()
+
+    def _run(self) -> None:
+        spool = self._spool
+        backoff = 0.0
+        while not self._stop.is_set() and not spool._closed:
+            batch = spool._take(spool.concurrency, timeout=max(spool._fsync_interval, 0.01))
+            if not batch:
+                continue
+            outcomes = list(self._pool.map(self._replay, batch))
+            if all(outcomes):
+                backoff = 0.0
+                continue
+            backoff = min(spool.max_backoff, backoff * 2 if backoff else 0.1)
+            self._stop.wait(backoff * random.uniform(0.5, 1.0))
+
+    def _replay(self, record: tuple[int, bytes]) -> bool:
+        seq, body = record
+        try:
+            run = self._send(body)
+        except Exception as exc:
+            if _retryable(exc):
+                self._spool._release(seq)
+                return False
+            run = Run(run_id=spool_run_id(seq), status="failed", error=str(exc))
+        self._spool._ack(seq, run)
+        if self._on_replayed is not None:
+            try:
+                self._on_replayed(spool_run_id(seq), run)
+            except Exception:
+                # Keeping the client's local state in step is best effort; the add
+                # itself has been delivered and must not be retried because of this.
+                pass
+        return True
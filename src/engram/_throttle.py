@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
+
+from ._models import Run
+from ._splitting import split_run_id
+from .errors import APIError, ValidationError
+
+# Runs with these statuses are not (or not yet) in the server's pipeline.
+_UNTRACKED_STATUSES = frozenset(("completed", "failed", "spooled"))
+# A run is first polled once it is this fraction of the recent mean latency old.
+_FIRST_POLL_FRACTION = 0.8
+# How soon to look again when the target is taken up by adds still being sent.
+_RESERVED_RECHECK = 0.01
+
+
+@dataclass(slots=True)
+class ThrottleStats:
+    """Counters for a `RunThrottle`. Read a snapshot via its `stats`.
+
+    `unfinished` is the number of this client's runs not yet seen to complete or fail,
+    and `mean_latency` the mean time in seconds from add to finish of recent runs.
+    """
+
+    unfinished: int = 0
+    admitted: int = 0
+    throttled: int = 0
+    waited_seconds: float = 0.0
+    timeouts: int = 0
+    polls: int = 0
+    poll_errors: int = 0
+    finished: int = 0
+    forgotten: int = 0
+    mean_latency: float = 0.0
+
+
+@dataclass(slots=True)
+class _Unfinished:
+    submitted_at: float
+    checked_at: float | None = None
+
+
+class RunThrottle:
+    """Holds back `memories.add` while too many of the client's runs are unfinished.
+
+    Pass an instance as `add_throttle=` to `EngramClient` or `AsyncEngramClient`. Every
+    run an add starts is tracked until a `RunStatus` shows it completed or failed, as
+    seen by `client.runs.get`/`wait` or by the throttle's own polling. While `target`
+    runs are unfinished, further adds wait: the throttle polls the status of the
+    tracked runs, each at most every `poll_interval` seconds and not before it is
+    about as old as the recent mean completion latency, and admits the add once
+    a run finishes. An add that has waited `max_wait` seconds is sent anyway, so a
+    stuck run slows ingestion but never stops it.
+
+    This limits the depth of the server's pipeline rather than the number of HTTP
+    requests in flight. Adds answered by an `AddDeduplicator` or written to an
+    `AddSpool` are not throttled.
+    """
+
+    def __init__(
+        self,
+        *,
+        target: int = 32,
+        poll_interval: float = 0.5,
+        max_wait: float = 300.0,
+        latency_window: int = 100,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if target <= 0 or latency_window <= 0:
+            raise ValidationError("target and latency_window must be greater than 0.")
+        if poll_interval <= 0 or max_wait <= 0:
+            raise ValidationError("poll_interval and max_wait must be greater than 0.")
+        self.target = target
+        self._poll_interval = poll_interval
+        self._max_wait = max_wait
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._unfinished: OrderedDict[str, _Unfinished] = OrderedDict()
+        self._reserved = 0
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+        self._stats = ThrottleStats()
+
+    @property
+    def stats(self) -> ThrottleStats:
+        with self._lock:
+            stats = replace(self._stats)
+            stats.unfinished = len(self._unfinished)
+            stats.mean_latency = self._mean_latency()
+            return stats
+
+    def __len__(self) -> int:
+        """Runs not yet seen to finish."""
+        return len(self._unfinished)
+
+    def admit(self, poll: Callable[[str], object]) -> None:
+        """Wait for room below `target`, fetching run statuses with `poll` meanwhile."""
+        started = self._clock()
+        held = False
+        while True:
+            run_id, delay = self._try_admit(started, held)
+            held = True
+            if run_id is not None:
+                self._poll(run_id, poll)
+            elif delay is None:
+                return
+            else:
+                time.sleep(delay)
+
+    async def async_admit(self, poll: Callable[[str], Awaitable[object]]) -> None:
+        """Async variant of `admit`."""
+        started = self._clock()
+        held = False
+        while True:
+            run_id, delay = self._try_admit(started, held)
+            held = True
+            if run_id is not None:
+                try:
+                    await poll(run_id)
+                except Exception as exc:
+                    self._poll_failed(run_id, exc)
+            elif delay is None:
+                return
+            else:
+                await asyncio.sleep(delay)
+
+    def record(self, run: Run) -> None:
+        """Track the run an admitted add started."""
+        now = self._clock()
+        with self._lock:
+            self._reserved -= 1
+            if run.status in _UNTRACKED_STATUSES:
+                return
+            for run_id in split_run_id(run.run_id):
+                self._unfinished.setdefault(run_id, _Unfinished(now))
+
+    def release(self) -> None:
+        """Give back the slot of an admitted add that failed before starting a run."""
+        with self._lock:
+            self._reserved -= 1
+
+    def finished(self, run_id: str) -> None:
+        """Stop tracking a run that completed or failed."""
+        with self._lock:
+            entry = self._unfinished.pop(run_id, None)
+            if entry is not None:
+                self._latencies.append(self._clock() - entry.submitted_at)
+                self._stats.finished += 1
+
+    def forget(self, run_id: str) -> None:
+        """Stop tracking a run without counting it as finished."""
+        with self._lock:
+            if self._unfinished.pop(run_id, None) is not None:
+                self._stats.forgotten += 1
+
+    def _try_admit(self, started: float, held: bool) -> tuple[str | None, float | None]:
+        """Admit now (None, None), poll a run (run_id, None) or sleep (None, delay)."""
+        now = self._clock()
+        with self._lock:
+            waited = now - started
+            timed_out = waited >= self._max_wait
+            if len(self._unfinished) + self._reserved < self.target or timed_out:
+                self._reserved += 1
+                self._stats.admitted += 1
+                if held:
+                    self._stats.throttled += 1
+                    self._stats.waited_seconds += waited
+                if timed_out:
+                    self._stats.timeouts += 1
+                return None, None
+            if not self._unfinished:
+                return None, _RESERVED_RECHECK
+            run_id, due = self._next_poll()
+            if due <= now:
+                self._unfinished[run_id].checked_at = now
+                self._stats.polls += 1
+                return run_id, None
+            return None, min(due - now, self._max_wait - waited)
+
+    def _next_poll(self) -> tuple[str, float]:
+        """The tracked run to poll next and when."""
+        first_poll = self._mean_latency() * _FIRST_POLL_FRACTION
+        return min(
+            ((run_id, self._due(entry, first_poll)) for run_id, entry in self._unfinished.items()),
+            key=lambda pair: pair[1],
+        )
+
+    def _due(self, entry: _Unfinished, first_poll: float) -> float:
+        if entry.checked_at is None:
+            return entry.submitted_at + first_poll
+        return entry.checked_at + self._poll_interval
+
+    def _mean_latency(self) -> float:
+        latencies = self._latencies
+        return sum(latencies) / len(latencies) if latencies else 0.0
+
+    def _poll(self, run_id: str, poll: Callable[[str], object]) -> None:
+        try:
+            poll(run_id)
+        except Exception as exc:
+            self._poll_failed(run_id, exc)
+
+    def _poll_failed(self, run_id: str, exc: Exception) -> None:
+        with self._lock:
+            self._stats.poll_errors += 1
+        if isinstance(exc, APIError) and exc.status_code == 404:
+            self.forget(run_id)
@@ -1,16 +1,65 @@
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Mapping
+from concurrent.futures import Executor
 
-from ._base_client import DEFAULT_BASE_URL, DEFAULT_TIMEOUT, _BaseClient
-from ._http import AsyncHttpTransport
+from ._base_client import (
+    DEFAULT_BASE_URL,
+    DEFAULT_DECODE_OFFLOAD_THRESHOLD,
+    DEFAULT_TIMEOUT,
+    _BaseClient,
+)
+from ._cache import MemoryCache, SearchCache
+from ._compaction import ConversationCompactor
+from ._compression import DEFAULT_COMPRESSION_THRESHOLD, Compression
+from ._dedup import AddDeduplicator
+from ._http import AsyncHttpTransport, HttpTransport
+from ._models import Run
+from ._overlay import WriteOverlay
 from ._resources import AsyncMemories, AsyncRuns
+from ._resources._paths import MEMORIES_PATH
+from ._serialization import parse_run
+from ._splitting import AddSplitting
+from ._spool import AddSpool, _SpoolReplayer
+from ._throttle import RunThrottle
+from .types import LoopBlockingStats
 
-__all__ = ["DEFAULT_BASE_URL", "DEFAULT_TIMEOUT", "AsyncEngramClient"]
+__all__ = [
+    "DEFAULT_BASE_URL",
+    "DEFAULT_DECODE_OFFLOAD_THRESHOLD",
+    "DEFAULT_TIMEOUT",
+    "AsyncEngramClient",
+]
 
 
 class AsyncEngramClient(_BaseClient):
-    """Asynchronous Engram client."""
+    """Asynchronous Engram client.
+
+    Responses larger than `decode_offload_threshold` bytes are decoded in
+    `decode_executor` (the event loop's default executor when None) instead of on the
+    loop thread. Pass `decode_offload_threshold=None` to always decode inline.
+
+    Set `compression` to ``"gzip"`` or ``"zstd"`` to compress request bodies larger than
+    `compression_threshold` bytes. zstd needs Python 3.14+ or the optional
+    ``zstandard`` package; with ``zstandard`` installed httpx also advertises and
+    decodes zstd responses.
+
+    Pass a `SearchCache` as `search_cache` and/or a `MemoryCache` as `memory_cache` to
+    serve repeated `memories.search` and `memories.get` calls locally. Caches with a
+    persistent backend are warm-loaded from it here. Finished runs seen by `runs.get`
+    or `runs.wait` invalidate what they changed.
+
+    Pass a `WriteOverlay` as `write_overlay` to see your own adds in `memories.search`
+    (as provisional results) before their runs finish, and an `AddDeduplicator` as
+    `add_dedup` to skip adds that repeat a recent one. A `ConversationCompactor` as
+    `conversation_compactor` trims conversations (repeated system prompts, large tool
+    outputs, whitespace) before they are uploaded, and `AddSplitting` as `add_splitting`
+    sends oversized adds as several concurrent requests. With an `AddSpool` as
+    `add_spool`, adds are written to a local log and replayed to Engram by a background
+    thread that starts here and stops on close. A `RunThrottle` as `add_throttle` holds
+    back adds while too many of this client's runs are still unfinished.
+    """
 
     _transport: AsyncHttpTransport
     memories: AsyncMemories
@@ -23,18 +72,68 @@ class AsyncEngramClient(_BaseClient):
         api_key: str,
         headers: Mapping[str, str] | None = None,
         timeout: float = DEFAULT_TIMEOUT,
+        compression: Compression | None = None,
+        compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+        search_cache: SearchCache | None = None,
+        memory_cache: MemoryCache | None = None,
+        write_overlay: WriteOverlay | None = None,
+        add_dedup: AddDeduplicator | None = None,
+        conversation_compactor: ConversationCompactor | None = None,
+        add_splitting: AddSplitting | None = None,
+        add_spool: AddSpool | None = None,
+        add_throttle: RunThrottle | None = None,
+        decode_offload_threshold: int | None = DEFAULT_DECODE_OFFLOAD_THRESHOLD,
+        decode_executor: Executor | None = None,
     ) -> None:
         super().__init__(
             base_url=base_url,
             api_key=api_key,
             headers=headers,
             timeout=timeout,
+            compression=compression,
+            compression_threshold=compression_threshold,
+            decode_offload_threshold=decode_offload_threshold,
+            decode_executor=decode_executor,
         )
         self._transport = AsyncHttpTransport(self._config)
-        self.memories = AsyncMemories(self._transport)
-        self.runs = AsyncRuns(self._transport)
+        self.memories = AsyncMemories(
+            self._transport,
+            search_cache=search_cache,
+            memory_cache=memory_cache,
+            write_overlay=write_overlay,
+            add_dedup=add_dedup,
+            conversation_compactor=conversation_compactor,
+            add_splitting=add_splitting,
+            add_spool=add_spool,
+            add_throttle=add_throttle,
+        )
+        for cache in (search_cache, memory_cache):
+            if cache is not None:
+                cache.warm()
+        self.runs = AsyncRuns(
+            self._transport, on_finished=self.memories._on_run_finished, spool=add_spool
+        )
+        self._spool_replayer: _SpoolReplayer | None = None
+        if add_spool is not None:
+            self._replay_transport = HttpTransport(self._config)
+            self._spool_replayer = _SpoolReplayer(
+                add_spool, self._replay_spooled, self.memories._on_spool_replayed
+            )
+
+    def _replay_spooled(self, body: bytes) -> Run:
+        # Called on the spool's replay thread, so it uses a blocking transport of its own.
+        return parse_run(self._replay_transport.request("POST", MEMORIES_PATH, content=body))
+
+    @property
+    def loop_stats(self) -> LoopBlockingStats:
+        """How long the SDK has blocked the event loop, and how much decoding was offloaded."""
+        return self._transport.loop_stats
 
     async def aclose(self) -> None:
+        await self.memories._close_buffers()
+        if self._spool_replayer is not None:
+            await asyncio.to_thread(self._spool_replayer.close)
+            self._replay_transport.close()
         await self._transport.close()
 
     async def __aenter__(self) -> AsyncEngramClient:
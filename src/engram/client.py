@@ -3,14 +3,46 @@ from __future__ import annotations
 from collections.abc import Mapping
 
 from ._base_client import DEFAULT_BASE_URL, DEFAULT_TIMEOUT, _BaseClient
+from ._cache import MemoryCache, SearchCache
+from ._compaction import ConversationCompactor
+from ._compression import DEFAULT_COMPRESSION_THRESHOLD, Compression
+from ._dedup import AddDeduplicator
 from ._http import HttpTransport
+from ._models import Run
+from ._overlay import WriteOverlay
 from ._resources import Memories, Runs
+from ._resources._paths import MEMORIES_PATH
+from ._serialization import parse_run
+from ._splitting import AddSplitting
+from ._spool import AddSpool, _SpoolReplayer
+from ._throttle import RunThrottle
 
 __all__ = ["DEFAULT_BASE_URL", "DEFAULT_TIMEOUT", "EngramClient"]
 
 
 class EngramClient(_BaseClient):
-    """Synchronous Engram client."""
+    """Synchronous Engram client.
+
+    Set `compression` to ``"gzip"`` or ``"zstd"`` to compress request bodies larger than
+    `compression_threshold` bytes. zstd needs Python 3.14+ or the optional
+    ``zstandard`` package; with ``zstandard`` installed httpx also advertises and
+    decodes zstd responses.
+
+    Pass a `SearchCache` as `search_cache` and/or a `MemoryCache` as `memory_cache` to
+    serve repeated `memories.search` and `memories.get` calls locally. Caches with a
+    persistent backend are warm-loaded from it here. Finished runs seen by `runs.get`
+    or `runs.wait` invalidate what they changed.
+
+    Pass a `WriteOverlay` as `write_overlay` to see your own adds in `memories.search`
+    (as provisional results) before their runs finish, and an `AddDeduplicator` as
+    `add_dedup` to skip adds that repeat a recent one. A `ConversationCompactor` as
+    `conversation_compactor` trims conversations (repeated system prompts, large tool
+    outputs, whitespace) before they are uploaded, and `AddSplitting` as `add_splitting`
+    sends oversized adds as several concurrent requests. With an `AddSpool` as
+    `add_spool`, adds are written to a local log and replayed to Engram by a background
+    thread that starts here and stops on close. A `RunThrottle` as `add_throttle` holds
+    back adds while too many of this client's runs are still unfinished.
+    """
 
     _transport: HttpTransport
     memories: Memories
@@ -23,18 +55,56 @@ class EngramClient(_BaseClient):
         api_key: str,
         headers: Mapping[str, str] | None = None,
         timeout: float = DEFAULT_TIMEOUT,
+        compression: Compression | None = None,
+        compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+        search_cache: SearchCache | None = None,
+        memory_cache: MemoryCache | None = None,
+        write_overlay: WriteOverlay | None = None,
+        add_dedup: AddDeduplicator | None = None,
+        conversation_compactor: ConversationCompactor | None = None,
+        add_splitting: AddSplitting | None = None,
+        add_spool: AddSpool | None = None,
+        add_throttle: RunThrottle | None = None,
     ) -> None:
         super().__init__(
             base_url=base_url,
             api_key=api_key,
             headers=headers,
             timeout=timeout,
+            compression=compression,
+            compression_threshold=compression_threshold,
         )
         self._transport = HttpTransport(self._config)
-        self.memories = Memories(self._transport)
-        self.runs = Runs(self._transport)
+        self.memories = Memories(
+            self._transport,
+            search_cache=search_cache,
+            memory_cache=memory_cache,
+            write_overlay=write_overlay,
+            add_dedup=add_dedup,
+            conversation_compactor=conversation_compactor,
+            add_splitting=add_splitting,
+            add_spool=add_spool,
+            add_throttle=add_throttle,
+        )
+        for cache in (search_cache, memory_cache):
+            if cache is not None:
+                cache.warm()
+        self.runs = Runs(
+            self._transport, on_finished=self.memories._on_run_finished, spool=add_spool
+        )
+        self._spool_replayer = (
+            _SpoolReplayer(add_spool, self._replay_spooled, self.memories._on_spool_replayed)
+            if add_spool is not None
+            else None
+        )
+
+    def _replay_spooled(self, body: bytes) -> Run:
+        return parse_run(self.memories._transport.request("POST", MEMORIES_PATH, content=body))
 
     def close(self) -> None:
+        self.memories._close_buffers()
+        if self._spool_replayer is not None:
+            self._spool_replayer.close()
         self._transport.close()
 
     def __enter__(self) -> EngramClient:
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ._models import AddInput, AddResult, CompositeRun
 
 
 class EngramError(Exception):
@@ -44,3 +47,39 @@ class EngramTimeoutError(EngramError):
         super().__init__(f"Run {run_id!r} did not reach a terminal status within {timeout}s")
         self.run_id = run_id
         self.timeout = timeout
+
+
+class SplitAddError(EngramError):
+    """Raised by `memories.add` when some parts of a split add failed and others did not.
+
+    `error` is the first failed part's error (also the ``__cause__``), `run` is a
+    `CompositeRun` covering the parts the server accepted, and `failed_parts` holds the
+    inputs of the parts that failed, so they can be retried on their own.
+    """
+
+    def __init__(self, error: Exception, run: CompositeRun, failed_parts: list[AddInput]) -> None:
+        super().__init__(
+            f"{len(failed_parts)} of {len(failed_parts) + len(run.runs)} parts of a split add "
+            f"failed: {error}"
+        )
+        self.error = error
+        self.run = run
+        self.failed_parts = failed_parts
+
+
+class AddSkippedError(EngramError):
+    """Set on `add_many` results that were not sent because an earlier add failed."""
+
+
+class AddManyError(EngramError):
+    """Raised by `add_many(fail_fast=True)` after an add failed.
+
+    `error` is the first add's error (also the ``__cause__``) and `results` holds one
+    `AddResult` per item as far as the batch got; items never sent carry an
+    `AddSkippedError`.
+    """
+
+    def __init__(self, error: Exception, results: list[AddResult]) -> None:
+        super().__init__(f"add_many stopped after an add failed: {error}")
+        self.error = error
+        self.results = results
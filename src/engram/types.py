@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from concurrent.futures import Executor
 from dataclasses import dataclass, field
+from typing import Literal
 
 
 @dataclass(slots=True)
@@ -9,3 +11,34 @@ class ClientConfig:
     timeout: float
     headers: dict[str, str] = field(default_factory=dict)
     api_key: str | None = None
+    decode_offload_threshold: int | None = None
+    decode_executor: Executor | None = None
+    compression: Literal["gzip", "zstd"] | None = None
+    compression_threshold: int = 1024
+
+
+@dataclass(slots=True)
+class LoopBlockingStats:
+    """Time the async client spent on the event loop thread encoding and decoding.
+
+    `inline_*` counts work that ran on the loop (and therefore blocked it), one call
+    per request covering both encoding the request and, unless offloaded, decoding
+    the response; `offloaded_*` counts response decoding that was moved to an
+    executor because the body exceeded `decode_offload_threshold`.
+    """
+
+    inline_calls: int = 0
+    inline_seconds: float = 0.0
+    max_inline_seconds: float = 0.0
+    offloaded_calls: int = 0
+    offloaded_seconds: float = 0.0
+
+    def record_inline(self, seconds: float) -> None:
+        self.inline_calls += 1
+        self.inline_seconds += seconds
+        if seconds > self.max_inline_seconds:
+            self.max_inline_seconds = seconds
+
+    def record_offloaded(self, seconds: float) -> None:
+        self.offloaded_calls += 1
+        self.offloaded_seconds += seconds
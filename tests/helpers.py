@@ -0,0 +1,56 @@
+"""Helpers shared by the tests that run a client against an `httpx.MockTransport`."""
+
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+
+from engram import AsyncEngramClient, EngramClient
+from engram._http import AsyncHttpTransport, HttpTransport
+
+BASE_URL = "https://test.example.com"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_client(handler: Callable[[httpx.Request], Any], **options: Any) -> EngramClient:
+    """An `EngramClient` (built with `options`) whose requests all go to `handler`."""
+    client = EngramClient(base_url=BASE_URL, api_key="k", **options)
+    transport = HttpTransport(client._config, httpx.Client(transport=httpx.MockTransport(handler)))
+    client._transport.close()
+    client._transport = transport
+    client.memories._transport = transport
+    client.runs._transport = transport
+    return client
+
+
+def make_async_client(handler: Callable[[httpx.Request], Any], **options: Any) -> AsyncEngramClient:
+    """An `AsyncEngramClient` (built with `options`) whose requests all go to `handler`."""
+    client = AsyncEngramClient(base_url=BASE_URL, api_key="k", **options)
+    transport = AsyncHttpTransport(
+        client._config, httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    client._transport = transport
+    client.memories._transport = transport
+    client.runs._transport = transport
+    return client
+
+
+def run_status(run_id: str, status: str = "completed", **fields: Any) -> dict[str, Any]:
+    """A `GET /v1/runs/{run_id}` response body; `fields` are added or override."""
+    return {
+        "run_id": run_id,
+        "status": status,
+        "group_id": "g1",
+        "starting_step": 0,
+        "input_type": "string",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+        **fields,
+    }
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import threading
+import time
+from typing import Any
+
+import httpx
+import pytest
+
+from engram import AddItem, Run, StringInput
+from engram.errors import AddManyError, AddSkippedError, APIError, ValidationError
+from helpers import make_async_client, make_client
+
+
+class FakeServer:
+    """Names runs after the added string; rejects some and tracks peak concurrency."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.bodies: list[dict[str, Any]] = []
+        self.rejected: set[str] = set()
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _start(self, request: httpx.Request) -> tuple[dict[str, Any], str]:
+        body = json.loads(request.content)
+        with self._lock:
+            self.bodies.append(body)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        return body, body["input"]["string"]["content"][0]
+
+    def _finish(self, content: str) -> httpx.Response:
+        with self._lock:
+            self.in_flight -= 1
+        if content in self.rejected:
+            return httpx.Response(400, json={"detail": f"rejected {content}"})
+        return httpx.Response(200, json={"run_id": f"r-{content}", "status": "queued"})
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        _, content = self._start(request)
+        time.sleep(self.delay)
+        return self._finish(content)
+
+
+class AsyncFakeServer(FakeServer):
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        _, content = self._start(request)
+        await asyncio.sleep(self.delay)
+        return self._finish(content)
+
+
+def _items(*contents: str) -> list[AddItem]:
+    return [AddItem(StringInput([c]), user_id="u1", group=f"g-{c}") for c in contents]
+
+
+def test_results_are_in_input_order() -> None:
+    server = FakeServer(delay=0.01)
+    client = make_client(server)
+    progress: list[tuple[int, int]] = []
+
+    results = client.memories.add_many(
+        _items(*"abcdef"),
+        concurrency=3,
+        on_progress=lambda done, total: progress.append((done, total)),
+    )
+
+    assert [r.run for r in results] == [Run(f"r-{c}", "queued") for c in "abcdef"]
+    assert all(r.ok for r in results)
+    assert server.peak <= 3
+    assert progress == [(i, 6) for i in range(1, 7)]
+    assert {(b["user_id"], b["group"]) for b in server.bodies} == {
+        ("u1", f"g-{c}") for c in "abcdef"
+    }
+
+
+def test_failures_are_reported_per_item() -> None:
+    server = FakeServer()
+    server.rejected.add("b")
+    client = make_client(server)
+
+    results = client.memories.add_many(_items("a", "b", "c"), concurrency=2)
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert isinstance(results[1].error, APIError)
+    assert results[1].run is None
+    assert len(server.bodies) == 3
+
+
+def test_fail_fast_stops_sending() -> None:
+    server = FakeServer()
+    server.rejected.add("a")
+    client = make_client(server)
+
+    with pytest.raises(AddManyError) as exc_info:
+        client.memories.add_many(_items(*"abcdef"), concurrency=1, fail_fast=True)
+    assert len(server.bodies) == 1
+    error = exc_info.value
+    assert isinstance(error.error, APIError)
+    assert error.__cause__ is error.error
+    assert error.results[0].error is error.error
+    assert all(isinstance(r.error, AddSkippedError) for r in error.results[1:])
+    assert not any(r.ok for r in error.results)
+
+
+def test_empty_and_invalid_input() -> None:
+    client = make_client(FakeServer())
+    assert client.memories.add_many([]) == []
+    with pytest.raises(ValidationError):
+        client.memories.add_many(_items("a"), concurrency=0)
+
+
+async def test_async_results_are_in_input_order() -> None:
+    server = AsyncFakeServer(delay=0.01)
+    client = make_async_client(server.handle)
+    server.rejected.add("c")
+    progress: list[int] = []
+
+    results = await client.memories.add_many(
+        _items(*"abcdef"), concurrency=2, on_progress=lambda done, total: progress.append(done)
+    )
+
+    assert [r.run.run_id if r.run else None for r in results] == [
+        "r-a",
+        "r-b",
+        None,
+        "r-d",
+        "r-e",
+        "r-f",
+    ]
+    assert isinstance(results[2].error, APIError)
+    assert server.peak <= 2
+    assert progress == [1, 2, 3, 4, 5, 6]
+
+
+async def test_async_fail_fast() -> None:
+    server = AsyncFakeServer()
+    server.rejected.add("a")
+    client = make_async_client(server.handle)
+
+    with pytest.raises(AddManyError) as exc_info:
+        await client.memories.add_many(_items(*"abcd"), concurrency=1, fail_fast=True)
+    assert len(server.bodies) == 1
+    results = exc_info.value.results
+    assert isinstance(results[0].error, APIError)
+    assert all(isinstance(r.error, AddSkippedError) for r in results[1:])
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import threading
+from collections.abc import AsyncIterator, Iterator
+
+import httpx
+import pytest
+
+from engram import AddItem, StringInput
+from engram.errors import APIError, EngramTimeoutError, ValidationError
+from helpers import make_async_client, make_client, run_status
+
+
+class FakeServer:
+    """Run "r-<n>" finishes after n status polls, so larger inputs finish later."""
+
+    def __init__(self) -> None:
+        self.added: list[str] = []
+        self.rejected: set[str] = set()
+        self.failing: set[str] = set()
+        self._polls: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            content = json.loads(request.content)["input"]["string"]["content"][0]
+            with self._lock:
+                self.added.append(content)
+            if content in self.rejected:
+                return httpx.Response(400, json={"detail": "rejected"})
+            return httpx.Response(200, json={"run_id": f"r-{content}", "status": "queued"})
+        run_id = request.url.path.rsplit("/", 1)[-1]
+        with self._lock:
+            polls = self._polls[run_id] = self._polls.get(run_id, 0) + 1
+        if polls < int(run_id.removeprefix("r-")):
+            status = "running"
+        else:
+            status = "failed" if run_id in self.failing else "completed"
+        created = [{"memory_id": f"m-{run_id}", "committed_at": "2024-01-01"}]
+        ops = {"created": created, "updated": [], "deleted": []}
+        return httpx.Response(200, json=run_status(run_id, status, committed_operations=ops))
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        return self(request)
+
+
+def _item(n: int) -> AddItem:
+    return AddItem(StringInput([str(n)]), user_id="u1")
+
+
+def test_statuses_are_yielded_in_completion_order() -> None:
+    server = FakeServer()
+    server.failing.add("r-1")
+    client = make_client(server)
+
+    results = list(client.memories.add_stream([_item(n) for n in (20, 1, 5)], poll_interval=0.001))
+
+    assert [status.run_id for _, status in results] == ["r-1", "r-5", "r-20"]
+    item, status = results[0]
+    assert item.input_data == StringInput(["1"])
+    assert status.status == "failed"
+    assert results[1][1].memories_created[0].memory_id == "m-r-5"
+
+
+def test_source_is_read_at_most_a_window_ahead() -> None:
+    server = FakeServer()
+    client = make_client(server)
+    pulled = 0
+
+    def source() -> Iterator[AddItem]:
+        nonlocal pulled
+        for n in range(1, 1000):
+            pulled += 1
+            yield _item(n)
+
+    stream = client.memories.add_stream(source(), max_in_flight=3, poll_interval=0.001)
+    next(stream)
+    assert pulled == 3
+    for _ in range(4):
+        next(stream)
+    assert pulled <= 8
+    stream.close()
+
+
+def test_add_errors_stop_the_stream() -> None:
+    server = FakeServer()
+    server.rejected.add("2")
+    client = make_client(server)
+
+    with pytest.raises(APIError):
+        list(client.memories.add_stream([_item(2), _item(3)], max_in_flight=1))
+    assert server.added == ["2"]
+
+
+def test_runs_that_do_not_finish_time_out() -> None:
+    client = make_client(FakeServer())
+    with pytest.raises(EngramTimeoutError):
+        list(client.memories.add_stream([_item(1000)], timeout=0.05, poll_interval=0.01))
+
+
+def test_invalid_settings() -> None:
+    client = make_client(FakeServer())
+    with pytest.raises(ValidationError):
+        client.memories.add_stream([], max_in_flight=0)
+
+
+async def test_async_stream_accepts_async_sources() -> None:
+    server = FakeServer()
+    client = make_async_client(server.handle)
+    pulled = 0
+
+    async def source() -> AsyncIterator[AddItem]:
+        nonlocal pulled
+        for n in (8, 1, 4, 2):
+            pulled += 1
+            yield _item(n)
+
+    seen: list[str] = []
+    async for item, status in client.memories.add_stream(
+        source(), max_in_flight=2, poll_interval=0.001
+    ):
+        if not seen:
+            assert pulled == 2
+        seen.append(status.run_id)
+        assert status.status == "completed"
+        assert item.user_id == "u1"
+
+    assert seen[0] == "r-1"
+    assert sorted(seen) == ["r-1", "r-2", "r-4", "r-8"]
+
+
+async def test_async_stream_accepts_sync_sources_and_cancels_on_close() -> None:
+    server = FakeServer()
+    client = make_async_client(server.handle)
+
+    stream = client.memories.add_stream(
+        [_item(n) for n in (1, 1000, 1000)], max_in_flight=3, poll_interval=0.001
+    )
+    item, status = await anext(stream)
+    assert status.run_id == "r-1"
+    await stream.aclose()
+    await asyncio.sleep(0.01)
+    assert len(server.added) == 3
@@ -0,0 +1,78 @@
+import pytest
+
+from engram import BM25Index
+from engram._models import Memory
+from engram.errors import ValidationError
+
+
+def _memory(memory_id: str, content: str, topic: str = "notes") -> Memory:
+    return Memory(
+        id=memory_id,
+        project_id="p1",
+        content=content,
+        topic=topic,
+        group="g1",
+        created_at="2024-01-01T00:00:00Z",
+        updated_at="2024-01-01T00:00:00Z",
+    )
+
+
+def _index() -> BM25Index:
+    return BM25Index(
+        [
+            _memory("m1", "Alice likes hiking in the Alps"),
+            _memory("m2", "Bob prefers Python over Java", topic="work"),
+            _memory("m3", "Alice writes Python at work; Python every day", topic="work"),
+            _memory("m4", "The weather was rainy"),
+        ]
+    )
+
+
+def test_search_ranks_by_bm25_and_scores_results() -> None:
+    index = _index()
+    results = index.search("python")
+    assert [m.id for m in results] == ["m3", "m2"]
+    assert results.total == 2
+    assert results[0].score is not None and results[1].score is not None
+    assert results[0].score > results[1].score > 0
+    stored = index.get("m3")
+    assert stored is not None and stored.score is None
+
+
+def test_search_matches_topic_and_filters_by_topic() -> None:
+    index = _index()
+    assert [m.id for m in index.search("WORK")][:2] == ["m3", "m2"]
+    assert [m.id for m in index.search("alice", topics=["notes"])] == ["m1"]
+    assert index.search("alice", limit=1).total == 2
+    assert len(index.search("alice", limit=None)) == 2
+    assert index.search("unknown").total == 0
+    assert BM25Index().search("anything").total == 0
+
+
+def test_incremental_add_replace_and_remove() -> None:
+    index = _index()
+    index.add(_memory("m5", "Carol learns Python"))
+    assert "m5" in index
+    assert len(index) == 5
+    index.add(_memory("m2", "Bob switched to Rust", topic="work"))
+    assert "m2" not in [m.id for m in index.search("python")]
+    assert [m.id for m in index.search("rust")] == ["m2"]
+    assert index.remove("m3")
+    assert not index.remove("m3")
+    assert [m.id for m in index.search("python")] == ["m5"]
+    assert len(index) == 4
+    assert sorted(m.id for m in index) == ["m1", "m2", "m4", "m5"]
+
+
+def test_compaction_preserves_results() -> None:
+    index = BM25Index(_memory(f"m{i}", f"token{i % 7} shared") for i in range(3000))
+    for i in range(2500):
+        index.remove(f"m{i}")
+    assert len(index._memories) < 3000
+    results = index.search("token3", limit=None)
+    assert sorted(m.id for m in results) == sorted(f"m{i}" for i in range(2500, 3000) if i % 7 == 3)
+
+
+def test_rejects_invalid_parameters() -> None:
+    with pytest.raises(ValidationError):
+        BM25Index(b=1.5)
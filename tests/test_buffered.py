@@ -0,0 +1,189 @@
+import json
+import threading
+import time
+from typing import Any
+
+import httpx
+import pytest
+
+from engram import (
+    PreExtractedInput,
+    PreExtractedItem,
+    StringInput,
+)
+from engram.errors import APIError, ValidationError
+from helpers import make_async_client, make_client
+
+
+class FakeServer:
+    def __init__(self, status: int = 200) -> None:
+        self.status = status
+        self.requests: list[httpx.Request] = []
+
+    @property
+    def bodies(self) -> list[dict[str, Any]]:
+        return [json.loads(r.content) for r in self.requests]
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.status != 200:
+            return httpx.Response(self.status, json={"detail": "boom"})
+        return httpx.Response(200, json={"run_id": f"r{len(self.requests)}", "status": "queued"})
+
+
+def test_buffer_groups_adds_by_scope_and_input_type() -> None:
+    server = FakeServer()
+    client = make_client(server)
+    with client.memories.buffered(max_delay=60) as buffer:
+        a = buffer.add("one", user_id="u1")
+        b = buffer.add(StringInput(["two", "three"]), user_id="u1")
+        c = buffer.add("four", user_id="u2")
+        d = buffer.add(
+            PreExtractedInput([PreExtractedItem(content="five", topic="t")]), user_id="u1"
+        )
+        assert buffer.pending == 5
+        assert not server.requests
+
+    assert buffer.pending == 0
+    assert len(server.requests) == 3
+    assert a.result() is b.result()
+    assert c.result().run_id != a.result().run_id
+    assert d.result().run_id not in (a.result().run_id, c.result().run_id)
+    inputs = {(body["user_id"], *body["input"]): body["input"] for body in server.bodies}
+    assert inputs[("u1", "string")]["string"]["content"] == ["one", "two", "three"]
+    assert inputs[("u2", "string")]["string"]["content"] == ["four"]
+    assert inputs[("u1", "pre_extracted")]["pre_extracted"]["items"][0]["content"] == "five"
+
+
+def test_full_batches_are_sent_off_the_callers_thread() -> None:
+    server = FakeServer()
+    release = threading.Event()
+    senders: list[str] = []
+
+    def blocking(request: httpx.Request) -> httpx.Response:
+        senders.append(threading.current_thread().name)
+        release.wait(5)
+        return server(request)
+
+    client = make_client(blocking)
+    with client.memories.buffered(max_items=1, max_delay=60) as buffer:
+        first = buffer.add("one")
+        second = buffer.add("two", user_id="u2")
+        assert not first.done() and not second.done()
+        release.set()
+        assert first.result(timeout=5).run_id != second.result(timeout=5).run_id
+    assert all(name.startswith("engram-write-buffer-send") for name in senders)
+
+
+def test_buffer_sends_a_group_once_it_is_full() -> None:
+    server = FakeServer()
+    client = make_client(server)
+    buffer = client.memories.buffered(max_items=2, max_delay=60)
+    first = buffer.add("one")
+    assert not first.done()
+    second = buffer.add("two")
+    assert first.result() is second.result()
+    assert len(server.requests) == 1
+
+    buffer.add("x" * 10, conversation_id="c1")
+    big = client.memories.buffered(max_bytes=8, max_delay=60)
+    assert big.add("y" * 10).done()
+    assert len(server.requests) == 2
+    buffer.close()
+    assert len(server.requests) == 3
+
+
+def test_buffer_sends_a_group_before_it_would_exceed_max_bytes() -> None:
+    server = FakeServer()
+    client = make_client(server)
+    buffer = client.memories.buffered(max_bytes=10, max_delay=60)
+    first = buffer.add("a" * 6)
+    second = buffer.add("b" * 6)
+    assert first.done()
+    assert not second.done()
+    buffer.close()
+    assert [body["input"]["string"]["content"] for body in server.bodies] == [
+        ["a" * 6],
+        ["b" * 6],
+    ]
+
+
+def test_closing_the_client_flushes_open_buffers() -> None:
+    server = FakeServer()
+    client = make_client(server)
+    buffer = client.memories.buffered(max_delay=60)
+    future = buffer.add("one")
+    client.close()
+    assert future.result().run_id == "r1"
+    with pytest.raises(ValidationError):
+        buffer.add("late")
+
+
+def test_buffer_sends_after_max_delay() -> None:
+    server = FakeServer()
+    client = make_client(server)
+    buffer = client.memories.buffered(max_delay=0.01)
+    future = buffer.add("one")
+    assert future.result(timeout=5).run_id == "r1"
+    deadline = time.monotonic() + 5
+    while buffer.pending and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert buffer.pending == 0
+    buffer.close()
+    assert len(server.requests) == 1
+
+
+def test_buffer_propagates_request_errors_and_rejects_other_inputs() -> None:
+    server = FakeServer(status=400)
+    client = make_client(server)
+    buffer = client.memories.buffered(max_delay=60)
+    future = buffer.add("one")
+    with pytest.raises(ValidationError):
+        buffer.add([{"role": "user", "content": "hi"}])
+    buffer.flush()
+    with pytest.raises(APIError):
+        future.result()
+
+    buffer.close()
+    with pytest.raises(ValidationError):
+        buffer.add("late")
+    with pytest.raises(ValidationError):
+        client.memories.buffered(max_items=0)
+
+
+@pytest.mark.asyncio
+async def test_async_buffer_batches_and_flushes_on_close() -> None:
+    server = FakeServer()
+    client = make_async_client(server)
+    async with client.memories.buffered(max_items=3, max_delay=60) as buffer:
+        futures = [buffer.add(text, user_id="u1") for text in ("a", "b", "c", "d")]
+        first = await futures[0]
+        assert [await f for f in futures[1:3]] == [first, first]
+        assert not futures[3].done()
+
+    assert (await futures[3]).run_id != first.run_id
+    assert [body["input"]["string"]["content"] for body in server.bodies] == [
+        ["a", "b", "c"],
+        ["d"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_async_buffer_sends_after_max_delay() -> None:
+    server = FakeServer()
+    client = make_async_client(server)
+    buffer = client.memories.buffered(max_delay=0.01)
+    future = buffer.add("one")
+    assert (await future).run_id == "r1"
+    await buffer.aclose()
+    assert len(server.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_closing_the_async_client_flushes_open_buffers() -> None:
+    server = FakeServer()
+    client = make_async_client(server)
+    buffer = client.memories.buffered(max_delay=60)
+    future = buffer.add("one")
+    await client.aclose()
+    assert (await future).run_id == "r1"
@@ -0,0 +1,680 @@
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from engram import (
+    MemoryCache,
+    SearchCache,
+    SQLiteCacheBackend,
+)
+from engram._cache import BackendEntry, search_cache_key
+from engram._cache._codec import (
+    decode_memory_entry,
+    decode_results,
+    encode_memory_entry,
+    encode_results,
+)
+from engram._models import Memory, SearchResults
+from engram._serialization import build_search_body
+from engram.errors import APIError, ValidationError
+from helpers import FakeClock, make_async_client, make_client
+
+SAMPLE_MEMORY_RESPONSE: dict[str, Any] = {
+    "id": "m1",
+    "project_id": "p1",
+    "content": "some content",
+    "topic": "t1",
+    "group": "g1",
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-01-02T00:00:00Z",
+}
+
+
+def _results(*ids: str) -> SearchResults:
+    memories = [
+        Memory(
+            id=i,
+            project_id="p1",
+            content="x" * 100,
+            topic="t",
+            group="g",
+            created_at="2024-01-01T00:00:00Z",
+            updated_at="2024-01-01T00:00:00Z",
+        )
+        for i in ids
+    ]
+    return SearchResults(memories, total=len(memories))
+
+
+def _key(query: str, **scope: Any) -> str:
+    body = build_search_body(
+        query=query,
+        topics=scope.get("topics"),
+        user_id=scope.get("user_id"),
+        conversation_id=None,
+        group=scope.get("group"),
+        retrieval_config=None,
+    )
+    return search_cache_key(body)
+
+
+def _counting_handler(calls: list[httpx.Request]) -> Any:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        memory = {**SAMPLE_MEMORY_RESPONSE, "id": f"m{len(calls)}"}
+        return httpx.Response(200, json={"memories": [memory], "total": 1})
+
+    return handler
+
+
+# ── Keys ────────────────────────────────────────────────────────────────
+
+
+def test_search_cache_key_normalizes_query_and_topics() -> None:
+    assert _key("  What does   Alice LIKE? ") == _key("what does alice like?")
+    assert _key("q", topics=["b", "a"]) == _key("q", topics=["a", "b", "a"])
+    assert _key("q", user_id="u1") != _key("q", user_id="u2")
+    assert _key("q") != _key("q", topics=[])
+
+
+# ── SearchCache ─────────────────────────────────────────────────────────
+
+
+def test_search_cache_hit_miss_and_ttl() -> None:
+    clock = FakeClock()
+    cache = SearchCache(ttl=10, clock=clock)
+    assert cache.get("k") is None
+    results = _results("m1")
+    cache.put("k", ("u1", None), results)
+    hit = cache.get("k")
+    assert hit is not None and list(hit[0]) == list(results) and hit[1] is False
+    clock.now = 11
+    assert cache.get("k") is None
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.expirations, stats.entries) == (1, 2, 1, 0)
+
+
+def test_search_cache_stale_while_revalidate_window() -> None:
+    clock = FakeClock()
+    cache = SearchCache(ttl=10, stale_while_revalidate=5, clock=clock)
+    cache.put("k", (None, None), _results("m1"))
+    clock.now = 12
+    hit = cache.get("k")
+    assert hit is not None and hit[1] is True
+    assert cache.begin_refresh("k")
+    assert not cache.begin_refresh("k")
+    clock.now = 16
+    assert cache.get("k") is None
+    assert cache.stats.stale_hits == 1
+
+
+def test_search_cache_evicts_lru_by_entries_and_bytes() -> None:
+    cache = SearchCache(max_entries=2)
+    cache.put("a", (None, None), _results("1"))
+    cache.put("b", (None, None), _results("2"))
+    cache.get("a")
+    cache.put("c", (None, None), _results("3"))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats.evictions == 1
+
+    small = SearchCache(max_bytes=1200)
+    small.put("a", (None, None), _results("1", "2"))
+    small.put("b", (None, None), _results("3", "4"))
+    assert small.get("a") is None
+    assert small.stats.bytes <= 1200
+
+
+def test_search_cache_scope_quota_and_invalidation() -> None:
+    cache = SearchCache(max_entries_per_scope=1)
+    cache.put("a1", ("a", None), _results("1"))
+    cache.put("b1", ("b", None), _results("2"))
+    cache.put("a2", ("a", None), _results("3"))
+    assert cache.get("a1") is None
+    assert cache.get("a2") is not None
+    assert cache.get("b1") is not None
+    assert cache.invalidate_scope("b", None) == 1
+    assert cache.get("b1") is None
+    assert len(cache) == 1
+
+
+def test_search_cache_rejects_invalid_config() -> None:
+    with pytest.raises(ValidationError):
+        SearchCache(ttl=0)
+    with pytest.raises(ValidationError):
+        SearchCache(max_entries=0)
+
+
+def test_cached_results_are_copies() -> None:
+    cache = SearchCache()
+    results = _results("m1")
+    cache.put("k", ("u1", None), results)
+    results[0].content = "changed"
+    results.total = 5
+    hit = cache.get("k")
+    assert hit is not None
+    hit[0][0].content = "also changed"
+    hit = cache.get("k")
+    assert hit is not None
+    assert hit[0][0].content == "x" * 100
+    assert hit[0].total == 1
+
+
+def test_cached_memories_are_copies() -> None:
+    cache = MemoryCache()
+    memory = _results("m1")[0]
+    memory.tags = ["a"]
+    cache.put("k", memory)
+    memory.tags.append("b")
+    hit = cache.get("k")
+    assert hit is not None and hit.memory is not None
+    hit.memory.tags = None
+    hit = cache.get("k")
+    assert hit is not None and hit.memory is not None and hit.memory.tags == ["a"]
+
+
+# ── Client integration ──────────────────────────────────────────────────
+
+
+def test_sync_search_served_from_cache() -> None:
+    calls: list[httpx.Request] = []
+    cache = SearchCache()
+    client = make_client(_counting_handler(calls), search_cache=cache)
+    first = client.memories.search(query="What does Alice like?", user_id="u1")
+    second = client.memories.search(query="what does alice  like?", user_id="u1")
+    other = client.memories.search(query="what does alice like?", user_id="u2")
+    assert list(second) == list(first)
+    assert other[0].id == "m2"
+    assert len(calls) == 2
+    assert cache.stats.hits == 1
+
+
+def test_sync_prepared_search_shares_cache() -> None:
+    calls: list[httpx.Request] = []
+    client = make_client(_counting_handler(calls), search_cache=SearchCache())
+    client.memories.search(query="q", user_id="u1", topics=["a"])
+    prepared = client.memories.prepare_search(user_id="u1", topics=["a"])
+    prepared.search("Q")
+    assert len(calls) == 1
+
+
+def test_sync_stale_entry_refreshed_in_background() -> None:
+    calls: list[httpx.Request] = []
+    refreshed = threading.Event()
+    handler = _counting_handler(calls)
+
+    def signalling_handler(request: httpx.Request) -> httpx.Response:
+        response: httpx.Response = handler(request)
+        if len(calls) == 2:
+            refreshed.set()
+        return response
+
+    clock = FakeClock()
+    cache = SearchCache(ttl=1, stale_while_revalidate=10, clock=clock)
+    client = make_client(signalling_handler, search_cache=cache)
+    client.memories.search(query="q")
+    clock.now = 5
+    stale = client.memories.search(query="q")
+    assert stale[0].id == "m1"
+    assert refreshed.wait(5)
+    for _ in range(100):
+        hit = cache.get(_key("q"))
+        if hit is not None and hit[0][0].id == "m2":
+            break
+        time.sleep(0.01)
+    assert client.memories.search(query="q")[0].id == "m2"
+
+
+@pytest.mark.asyncio
+async def test_async_search_served_from_cache_and_revalidated() -> None:
+    calls: list[httpx.Request] = []
+    clock = FakeClock()
+    cache = SearchCache(ttl=1, stale_while_revalidate=10, clock=clock)
+    client = make_async_client(_counting_handler(calls), search_cache=cache)
+    first = await client.memories.search(query="q", group="g1")
+    assert list(await client.memories.search(query="Q", group="g1")) == list(first)
+    clock.now = 5
+    stale = await client.memories.search(query="q", group="g1")
+    assert list(stale) == list(first)
+    await asyncio.gather(*client.memories._background)
+    fresh = await client.memories.search(query="q", group="g1")
+    assert fresh[0].id == "m2"
+    assert len(calls) == 2
+    assert json.loads(calls[1].content)["group"] == "g1"
+
+
+# ── MemoryCache ─────────────────────────────────────────────────────────
+
+
+def test_memory_get_cached_per_scope() -> None:
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json=SAMPLE_MEMORY_RESPONSE)
+
+    cache = MemoryCache()
+    client = make_client(handler, memory_cache=cache)
+    first = client.memories.get("m1", user_id="u1")
+    assert client.memories.get("m1", user_id="u1") == first
+    client.memories.get("m1", user_id="u2")
+    assert len(calls) == 2
+    assert cache.stats.hits == 1
+
+
+def test_memory_get_revalidates_with_etag() -> None:
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=SAMPLE_MEMORY_RESPONSE, headers={"ETag": '"v1"'})
+
+    clock = FakeClock()
+    cache = MemoryCache(ttl=10, clock=clock)
+    client = make_client(handler, memory_cache=cache)
+    first = client.memories.get("m1")
+    clock.now = 11
+    assert client.memories.get("m1") == first
+    assert client.memories.get("m1") == first
+    assert len(calls) == 2
+    assert "If-None-Match" not in calls[0].headers
+    assert calls[1].headers["If-None-Match"] == '"v1"'
+    assert cache.stats.not_modified == 1
+
+
+def test_memory_get_revalidates_by_updated_at_without_etag() -> None:
+    versions = iter(["2024-01-02T00:00:00Z", "2024-01-02T00:00:00Z", "2024-01-03T00:00:00Z"])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={**SAMPLE_MEMORY_RESPONSE, "updated_at": next(versions)})
+
+    clock = FakeClock()
+    client = make_client(handler, memory_cache=MemoryCache(ttl=1, clock=clock))
+    first = client.memories.get("m1")
+    clock.now = 2
+    assert client.memories.get("m1") == first
+    clock.now = 4
+    changed = client.memories.get("m1")
+    assert changed != first
+    assert changed.updated_at == "2024-01-03T00:00:00Z"
+
+
+def test_memory_get_caches_404_briefly() -> None:
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(404, json={"detail": "Not found"})
+
+    clock = FakeClock()
+    cache = MemoryCache(negative_ttl=5, clock=clock)
+    client = make_client(handler, memory_cache=cache)
+    for _ in range(3):
+        with pytest.raises(APIError) as exc_info:
+            client.memories.get("gone")
+        assert exc_info.value.status_code == 404
+    assert len(calls) == 1
+    clock.now = 6
+    with pytest.raises(APIError):
+        client.memories.get("gone")
+    assert len(calls) == 2
+    assert cache.stats.negative_hits == 2
+
+
+def test_memory_delete_invalidates_searches_that_may_hold_it() -> None:
+    calls: list[httpx.Request] = []
+    handler = _counting_handler(calls)
+
+    def delete_handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "DELETE":
+            return httpx.Response(204)
+        return handler(request)  # type: ignore[no-any-return]
+
+    cache = SearchCache()
+    client = make_client(delete_handler, search_cache=cache)
+    scopes = [("u1", "g1"), ("u1", None), ("u1", "g2"), ("u2", None)]
+    for user_id, group in scopes:
+        client.memories.search(query="q", user_id=user_id, group=group)
+    client.memories.delete("m1", user_id="u1", group="g1")
+    assert len(cache) == 2
+    client.memories.delete("m1", user_id="u1")
+    assert len(cache) == 1
+
+
+def test_memory_delete_evicts_entry() -> None:
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.method == "DELETE":
+            return httpx.Response(204)
+        return httpx.Response(200, json=SAMPLE_MEMORY_RESPONSE)
+
+    cache = MemoryCache()
+    client = make_client(handler, memory_cache=cache)
+    client.memories.get("m1", user_id="u1")
+    client.memories.get("m1", user_id="u2")
+    assert len(cache) == 2
+    client.memories.delete("m1", user_id="u1")
+    assert len(cache) == 0
+    client.memories.get("m1", user_id="u1")
+    assert [r.method for r in calls] == ["GET", "GET", "DELETE", "GET"]
+
+
+def test_memory_cache_lru_bound() -> None:
+    cache = MemoryCache(max_entries=1)
+    memory = _results("a")[0]
+    cache.put("k1", memory)
+    cache.put("k2", memory)
+    assert cache.get("k1") is None
+    assert cache.stats.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_async_memory_get_cached_and_evicted() -> None:
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.method == "DELETE":
+            return httpx.Response(204)
+        return httpx.Response(200, json=SAMPLE_MEMORY_RESPONSE)
+
+    client = make_async_client(handler, memory_cache=MemoryCache())
+    first = await client.memories.get("m1")
+    assert await client.memories.get("m1") == first
+    await client.memories.delete("m1")
+    await client.memories.get("m1")
+    assert [r.method for r in calls] == ["GET", "DELETE", "GET"]
+
+
+# ── Persistent backend ──────────────────────────────────────────────────
+
+
+def test_codec_round_trips_memory_rows() -> None:
+    memory = Memory(
+        id="m1",
+        project_id="p1",
+        content="héllo \u2603",
+        topic="t",
+        group="g",
+        created_at="2024-01-01T00:00:00Z",
+        updated_at="2024-01-02T00:00:00Z",
+        user_id="u1",
+        tags=["a", ""],
+        score=0.25,
+    )
+    results = SearchResults([memory, _results("b")[0]], total=7)
+    decoded = decode_results(encode_results(results))
+    assert list(decoded) == list(results)
+    assert decoded.total == 7
+    assert decode_memory_entry(encode_memory_entry(memory, 'W/"1"')) == (memory, 'W/"1"')
+    assert decode_memory_entry(encode_memory_entry(memory, None)) == (memory, None)
+    with pytest.raises(ValueError):
+        decode_results(b"\x09" + encode_results(results)[1:])
+
+
+def test_sqlite_backend_shares_search_results_between_caches(tmp_path: Path) -> None:
+    with SQLiteCacheBackend(tmp_path / "cache.db") as backend:
+        SearchCache(backend=backend).put("k", ("u1", None), _results("a"))
+        # A second cache (e.g. another worker process) misses in memory but hits on disk.
+        other = SearchCache(backend=backend)
+        hit = other.get("k")
+        assert hit is not None
+        assert [m.id for m in hit[0]] == ["a"]
+        assert other.stats.backend_hits == 1
+        assert other.get("k") is not None
+        assert other.stats.backend_hits == 1
+
+        assert other.invalidate_scope("u1", None) == 1
+        assert SearchCache(backend=backend).get("k") is None
+
+
+def test_client_warm_loads_persistent_caches(tmp_path: Path) -> None:
+    with SQLiteCacheBackend(tmp_path / "cache.db") as backend:
+        key = _key("hello")
+        SearchCache(backend=backend).put(key, (None, None), _results("a"))
+        MemoryCache(backend=backend).put('["m1",null,null]', _results("m1")[0])
+
+        calls: list[httpx.Request] = []
+        search_cache = SearchCache(backend=backend)
+        memory_cache = MemoryCache(backend=backend)
+        client = make_client(
+            _counting_handler(calls), search_cache=search_cache, memory_cache=memory_cache
+        )
+        assert len(search_cache) == 1
+        assert len(memory_cache) == 1
+        assert [m.id for m in client.memories.search(query="hello")] == ["a"]
+        assert client.memories.get("m1").id == "m1"
+        assert calls == []
+        assert search_cache.warm() == 0
+
+
+def test_memory_cache_backend_evicts_every_scope(tmp_path: Path) -> None:
+    with SQLiteCacheBackend(tmp_path / "cache.db") as backend:
+        cache = MemoryCache(backend=backend)
+        memory = _results("m1")[0]
+        cache.put("k1", memory, etag='"v1"')
+        cache.put("k2", memory)
+        other = MemoryCache(backend=backend)
+        cached = other.get("k1")
+        assert cached is not None and cached.etag == '"v1"' and cached.fresh
+        assert cache.evict("m1") == 2
+        assert MemoryCache(backend=backend).get("k2") is None
+
+
+def test_sqlite_backend_expires_and_bounds_size(tmp_path: Path) -> None:
+    clock = FakeClock()
+    clock.now = 1000.0
+    with SQLiteCacheBackend(tmp_path / "cache.db", max_bytes=100, clock=clock) as backend:
+        for i in range(4):
+            entry = BackendEntry(key=f"k{i}", value=b"x" * 40, stored_at=clock.now + i)
+            backend.set("ns", entry, expires_at=clock.now + 60)
+        backend.set("ns", BackendEntry("big", b"x" * 101, clock.now), expires_at=clock.now + 60)
+        backend.purge()
+        assert [e.key for e in backend.scan("ns", 10)] == ["k3", "k2"]
+        clock.now += 61
+        assert backend.get("ns", "k3") is None
+        backend.purge()
+        assert list(backend.scan("ns", 10)) == []
+
+
+def test_backend_failures_degrade_to_misses(tmp_path: Path) -> None:
+    backend = SQLiteCacheBackend(tmp_path / "cache.db")
+    backend.close()
+    cache = SearchCache(backend=backend)
+    cache.put("k", (None, None), _results("a"))
+    assert cache.get("k") is not None
+    assert cache.get("other") is None
+    assert cache.stats.backend_errors == 2
+
+
+# ── Run-driven invalidation ─────────────────────────────────────────────
+
+
+def _run_status(status: str, **ops: list[str]) -> dict[str, Any]:
+    return {
+        "run_id": "r1",
+        "status": status,
+        "group_id": "g1",
+        "user_id": "u1",
+        "starting_step": 0,
+        "input_type": "string",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-02T00:00:00Z",
+        "committed_operations": {
+            kind: [
+                {"memory_id": memory_id, "committed_at": "2024-01-01T00:00:00Z"}
+                for memory_id in ops.get(kind, [])
+            ]
+            for kind in ("created", "updated", "deleted")
+        },
+    }
+
+
+def _run_handler(calls: list[httpx.Request], run: dict[str, Any]) -> Any:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.url.path.startswith("/v1/runs/"):
+            return httpx.Response(200, json=run)
+        if request.url.path == "/v1/memories":
+            return httpx.Response(200, json={"run_id": "r1", "status": "queued"})
+        if request.method == "GET":
+            memory_id = request.url.path.rsplit("/", 1)[-1]
+            return httpx.Response(200, json={**SAMPLE_MEMORY_RESPONSE, "id": memory_id})
+        return httpx.Response(200, json={"memories": [], "total": 0})
+
+    return handler
+
+
+def test_finished_run_invalidates_caches() -> None:
+    calls: list[httpx.Request] = []
+    run = _run_status("running", updated=["m2"], deleted=["m3"])
+    search_cache = SearchCache()
+    memory_cache = MemoryCache()
+    client = make_client(
+        _run_handler(calls, run), search_cache=search_cache, memory_cache=memory_cache
+    )
+    client.memories.search(query="q", user_id="u1", group="g1")
+    client.memories.search(query="q", user_id="u1")
+    client.memories.search(query="q", user_id="u2")
+    for memory_id in ("m1", "m2", "m3"):
+        client.memories.get(memory_id, user_id="u1")
+
+    client.runs.get("r1")
+    assert len(search_cache) == 3
+
+    run["status"] = "completed"
+    client.runs.get("r1")
+    assert len(search_cache) == 1
+    assert len(memory_cache) == 1
+    assert memory_cache.get('["m1","u1",null]') is not None
+
+    client.memories.search(query="q", user_id="u1")
+    client.runs.get("r1")
+    assert len(search_cache) == 2
+
+
+def test_finished_run_prefetches_created_memories() -> None:
+    calls: list[httpx.Request] = []
+    run = _run_status("completed", created=["m9"])
+    memory_cache = MemoryCache(prefetch_created=True)
+    client = make_client(_run_handler(calls, run), memory_cache=memory_cache)
+    client.memories.add("x", user_id="u1", group="notes")
+    client.runs.wait("r1")
+    assert [r.url.path for r in calls[1:]] == ["/v1/runs/r1", "/v1/memories/m9"]
+    assert calls[2].url.params["group"] == "notes"
+    assert client.memories.get("m9", user_id="u1", group="notes").id == "m9"
+    assert len(calls) == 3
+
+
+def test_finished_run_invalidates_the_group_it_was_added_to() -> None:
+    calls: list[httpx.Request] = []
+    run = _run_status("completed", created=["m9"])
+    search_cache = SearchCache()
+    memory_cache = MemoryCache(prefetch_created=True)
+    client = make_client(
+        _run_handler(calls, run), search_cache=search_cache, memory_cache=memory_cache
+    )
+    client.memories.search(query="q", user_id="u1", group="notes")
+    client.memories.search(query="q", user_id="u1", group="other")
+    client.memories.add("x", user_id="u1", group="notes")
+
+    client.runs.get("r1")
+    assert len(search_cache) == 1
+    assert client.memories.get("m9", user_id="u1", group="notes").id == "m9"
+    assert memory_cache.stats.hits == 1
+
+
+def test_runs_from_elsewhere_invalidate_every_group_of_the_user() -> None:
+    calls: list[httpx.Request] = []
+    run = _run_status("completed", created=["m9"])
+    search_cache = SearchCache()
+    memory_cache = MemoryCache(prefetch_created=True)
+    client = make_client(
+        _run_handler(calls, run), search_cache=search_cache, memory_cache=memory_cache
+    )
+    client.memories.search(query="q", user_id="u1", group="notes")
+    client.memories.search(query="q", user_id="u1", group="other")
+    client.memories.search(query="q", user_id="u2", group="notes")
+
+    client.runs.get("r1")
+    assert len(search_cache) == 1
+    assert len(memory_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_async_finished_run_invalidates_and_prefetches() -> None:
+    calls: list[httpx.Request] = []
+    run = _run_status("failed", created=["m1", "m2"])
+    search_cache = SearchCache()
+    memory_cache = MemoryCache(prefetch_created=True)
+    client = make_async_client(
+        _run_handler(calls, run), search_cache=search_cache, memory_cache=memory_cache
+    )
+    await client.memories.search(query="q", user_id="u1", group="notes")
+    await client.memories.add("x", user_id="u1", group="notes")
+    await client.runs.wait("r1")
+    assert len(search_cache) == 0
+    assert len(memory_cache) == 2
+    await client.memories.get("m2", user_id="u1", group="notes")
+    assert len(calls) == 5
+
+
+# ── Near-duplicate queries ──────────────────────────────────────────────
+
+
+def test_search_cache_serves_near_duplicate_queries_in_scope() -> None:
+    cache = SearchCache(max_query_distance=0.6)
+    cache.put(_key("What does Alice like in Python?", user_id="u1"), ("u1", None), _results("a"))
+    hit = cache.get(_key("Alice Python preferences", user_id="u1"))
+    assert hit is not None
+    assert [m.id for m in hit[0]] == ["a"]
+    assert hit[1] is False
+    stats = cache.stats
+    assert stats.near_hits == 1
+    assert 0 < stats.mean_near_distance <= 0.6
+
+    assert cache.get(_key("Alice Python preferences", user_id="u2")) is None
+    assert cache.get(_key("Alice Python preferences", user_id="u1", topics=["t"])) is None
+    assert cache.get(_key("Bob weather tomorrow", user_id="u1")) is None
+    assert cache.get(_key("what is it", user_id="u1")) is None
+    assert SearchCache().get(_key("Alice Python preferences", user_id="u1")) is None
+
+    cache.invalidate_scope("u1", None)
+    assert cache.get(_key("Alice Python preferences", user_id="u1")) is None
+    assert cache._near_index == {}
+
+
+def test_search_cache_rejects_invalid_near_settings() -> None:
+    with pytest.raises(ValidationError):
+        SearchCache(max_query_distance=1.0)
+    with pytest.raises(ValidationError):
+        SearchCache(verify_near_hits=2)
+
+
+@pytest.mark.asyncio
+async def test_near_duplicate_hits_are_verified_in_background() -> None:
+    calls: list[httpx.Request] = []
+    cache = SearchCache(max_query_distance=0.6, verify_near_hits=1.0)
+    client = make_async_client(_counting_handler(calls), search_cache=cache)
+    first = await client.memories.search(query="what does Alice like in Python", user_id="u1")
+    near = await client.memories.search(query="Alice Python preferences", user_id="u1")
+    assert list(near) == list(first)
+    await asyncio.gather(*client.memories._background)
+    assert len(calls) == 2
+    assert json.loads(calls[1].content)["query"] == "Alice Python preferences"
+    stats = cache.stats
+    assert stats.near_verified == 1
+    assert stats.mean_near_overlap == 0.0
+    exact = await client.memories.search(query="Alice Python preferences", user_id="u1")
+    assert exact[0].id == "m2"
+    assert cache.stats.near_hits == 1
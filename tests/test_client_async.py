@@ -1,15 +1,20 @@
+import gzip
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import httpx
 import pytest
 
+from engram import MemoryCache
 from engram._http import AsyncHttpTransport
 from engram._models import (
     ConversationInput,
     MessageInput,
     PreExtractedInput,
     PreExtractedItem,
+    RawConversationInput,
     RetrievalConfig,
     StringInput,
     ToolCallFuncInput,
@@ -273,6 +278,43 @@ async def test_add_conversation_content_sends_correct_envelope() -> None:
     assert body["conversation_id"] == "c1"
 
 
+@pytest.mark.asyncio
+async def test_add_stream_body_sends_chunked_envelope() -> None:
+    captured: list[bytes] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        captured.append(await request.aread())
+        assert request.headers.get("Transfer-Encoding") == "chunked"
+        return httpx.Response(200, json={"run_id": "r1", "status": "pending"})
+
+    client = _make_client_with_handler(handler)
+    messages = (MessageInput(role="user", content=f"m{i}") for i in range(3))
+    result = await client.memories.add(
+        ConversationInput(messages=messages), conversation_id="c1", stream_body=True
+    )
+    assert result.run_id == "r1"
+    body = json.loads(captured[0])
+    assert len(body["input"]["conversation"]["messages"]) == 3
+    assert body["conversation_id"] == "c1"
+
+
+@pytest.mark.asyncio
+async def test_add_raw_conversation_sends_messages_verbatim() -> None:
+    captured: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        captured.append(request)
+        return httpx.Response(200, json={"run_id": "r1", "status": "pending"})
+
+    client = _make_client_with_handler(handler)
+    raw = b'[{"role": "user", "content": "hi"}]'
+    await client.memories.add(RawConversationInput(messages=raw), conversation_id="c1")
+    assert (
+        captured[0].content
+        == b'{"input":{"conversation":{"messages":' + raw + b'}},"conversation_id":"c1"}'
+    )
+
+
 # ── memories.get ────────────────────────────────────────────────────────
 
 SAMPLE_MEMORY_RESPONSE: dict[str, Any] = {
@@ -371,6 +413,99 @@ async def test_search_sends_correct_body() -> None:
     assert body["retrieval_config"]["limit"] == 5
 
 
+@pytest.mark.asyncio
+async def test_search_stream_yields_memories_and_total() -> None:
+    response_body: dict[str, Any] = {
+        "memories": [SAMPLE_MEMORY_RESPONSE, {**SAMPLE_MEMORY_RESPONSE, "id": "m2"}],
+        "total": 2,
+    }
+    client = _make_client(body=response_body)
+    async with await client.memories.search_stream(query="test") as stream:
+        ids = [m.id async for m in stream]
+        assert stream.total == 2
+    assert ids == ["m1", "m2"]
+
+
+@pytest.mark.asyncio
+async def test_search_stream_raises_api_error() -> None:
+    client = _make_client(status_code=400, body={"detail": "Bad request"})
+    with pytest.raises(APIError) as exc_info:
+        await client.memories.search_stream(query="test")
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_stream_malformed_body() -> None:
+    client = _make_client_with_handler(
+        lambda _: httpx.Response(200, content=b'{"memories": [{"id": "m1"')
+    )
+    stream = await client.memories.search_stream(query="test")
+    with pytest.raises(APIError):
+        [m async for m in stream]
+
+
+@pytest.mark.asyncio
+async def test_prepare_search_reuses_scope() -> None:
+    captured: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        captured.append(request)
+        return httpx.Response(200, json={"memories": [SAMPLE_MEMORY_RESPONSE], "total": 1})
+
+    client = _make_client_with_handler(handler)
+    prepared = client.memories.prepare_search(
+        user_id="u1", topics=["a"], retrieval_config=RetrievalConfig(retrieval_type="bm25")
+    )
+    first = await prepared.search("first")
+    await prepared.search("second")
+    assert first[0].id == "m1"
+    bodies = [json.loads(r.content) for r in captured]
+    assert [b["query"] for b in bodies] == ["first", "second"]
+    assert bodies[1] == {
+        "query": "second",
+        "retrieval_config": {"retrieval_type": "bm25", "limit": None},
+        "topics": ["a"],
+        "user_id": "u1",
+    }
+
+
+# ── memories.with_raw_response ──────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_raw_search_returns_undecoded_body() -> None:
+    raw_body = b'{"memories": [], "total": 0, "extra": "kept"}'
+    client = _make_client_with_handler(lambda _: httpx.Response(200, content=raw_body))
+    response = await client.memories.with_raw_response.search(query="test")
+    assert response.status_code == 200
+    assert await response.read() == raw_body
+
+
+@pytest.mark.asyncio
+async def test_raw_search_maps_errors() -> None:
+    client = _make_client(status_code=401, body={"detail": "Invalid token"})
+    with pytest.raises(AuthenticationError):
+        await client.memories.with_raw_response.search(query="test")
+
+
+@pytest.mark.asyncio
+async def test_raw_get_streams_to_asgi() -> None:
+    client = _make_client(body=SAMPLE_MEMORY_RESPONSE)
+    messages: list[Any] = []
+
+    async def send(message: Any) -> None:
+        messages.append(message)
+
+    response = await client.memories.with_raw_response.get("m1", stream=True)
+    await response.to_asgi(send)
+    assert messages[0]["type"] == "http.response.start"
+    assert messages[0]["status"] == 200
+    assert (b"content-type", b"application/json") in messages[0]["headers"]
+    body = b"".join(m["body"] for m in messages[1:])
+    assert json.loads(body) == SAMPLE_MEMORY_RESPONSE
+    assert messages[-1]["more_body"] is False
+
+
 # ── runs.get ────────────────────────────────────────────────────────────
 
 
@@ -397,6 +532,101 @@ async def test_get_run() -> None:
     assert len(result.memories_created) == 1
 
 
+# ── Response decoding offload ───────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_small_responses_decode_inline() -> None:
+    client = _make_client(body={"memories": [SAMPLE_MEMORY_RESPONSE], "total": 1})
+    await client.memories.search(query="test")
+    assert client.loop_stats.offloaded_calls == 0
+    assert client.loop_stats.inline_calls == 1
+    assert client.loop_stats.max_inline_seconds > 0
+
+
+@pytest.mark.asyncio
+async def test_large_responses_decode_in_executor() -> None:
+    threads: list[str] = []
+
+    def record_thread(data: dict[str, Any]) -> dict[str, Any]:
+        threads.append(threading.current_thread().name)
+        return data
+
+    with ThreadPoolExecutor(thread_name_prefix="engram-decode") as executor:
+        client = AsyncEngramClient(
+            base_url="https://test.example.com",
+            api_key="k",
+            decode_offload_threshold=0,
+            decode_executor=executor,
+        )
+        mock = httpx.MockTransport(lambda _: httpx.Response(200, json={"ok": True}))
+        transport = AsyncHttpTransport(client._config, httpx.AsyncClient(transport=mock))
+        client._transport = transport
+        data = await transport.request_model("GET", "/v1/anything", record_thread)
+    assert data == {"ok": True}
+    assert threads and threads[0].startswith("engram-decode")
+    assert client.loop_stats.offloaded_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_offloaded_decode_still_maps_errors() -> None:
+    client = _make_client(status_code=404, body={"detail": "Not found"})
+    client._config.decode_offload_threshold = 0
+    with pytest.raises(APIError) as exc_info:
+        await client.memories.get("missing")
+    assert exc_info.value.status_code == 404
+    assert client.loop_stats.offloaded_calls == 1
+    assert client.loop_stats.inline_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_get_and_streams_are_recorded_and_offloaded() -> None:
+    client = _make_client(body=SAMPLE_MEMORY_RESPONSE)
+    client.memories._memory_cache = MemoryCache()
+    client._config.decode_offload_threshold = 0
+    memory = await client.memories.get("m1")
+    assert memory.id == SAMPLE_MEMORY_RESPONSE["id"]
+    assert client.loop_stats.offloaded_calls == 1
+    assert client.loop_stats.inline_calls == 1
+
+    raw = await client.memories.with_raw_response.get("m1")
+    assert raw.status_code == 200
+    assert client.loop_stats.inline_calls == 2
+
+    failing = _make_client(status_code=500, body={"detail": "boom"})
+    failing._config.decode_offload_threshold = 0
+    with pytest.raises(APIError):
+        await failing.memories.with_raw_response.get("m1")
+    assert failing.loop_stats.offloaded_calls == 1
+    assert failing.loop_stats.inline_calls == 1
+
+
+def test_async_client_rejects_negative_offload_threshold() -> None:
+    with pytest.raises(ValidationError):
+        AsyncEngramClient(api_key="test-key", decode_offload_threshold=-1)
+
+
+# ── Request compression ─────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_gzip_compresses_bodies_above_threshold() -> None:
+    captured: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        captured.append(request)
+        return httpx.Response(200, json={"run_id": "r1", "status": "pending"})
+
+    client = _make_client_with_handler(handler)
+    client._config.compression = "gzip"
+    client._config.compression_threshold = 64
+    messages = [{"role": "user", "content": "y" * 500}]
+    await client.memories.add(messages, conversation_id="c1")
+    assert captured[0].headers["Content-Encoding"] == "gzip"
+    body = json.loads(gzip.decompress(captured[0].content))
+    assert body["input"]["conversation"]["messages"] == messages
+
+
 # ── Error handling ──────────────────────────────────────────────────────
 
 
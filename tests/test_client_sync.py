@@ -1,15 +1,18 @@
+import gzip
 import json
-from typing import Any
+from typing import Any, Literal
 
 import httpx
 import pytest
 
+from engram._compression import zstd_available
 from engram._http import HttpTransport
 from engram._models import (
     ConversationInput,
     MessageInput,
     PreExtractedInput,
     PreExtractedItem,
+    RawConversationInput,
     RetrievalConfig,
     StringInput,
     ToolCallFuncInput,
@@ -283,6 +286,43 @@ def test_add_conversation_content_sends_correct_envelope() -> None:
     assert body["conversation_id"] == "c1"
 
 
+def test_add_stream_body_sends_chunked_envelope() -> None:
+    captured: list[bytes] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        captured.append(request.read())
+        assert request.headers.get("Transfer-Encoding") == "chunked"
+        return httpx.Response(200, json={"run_id": "r1", "status": "pending"})
+
+    client = _make_client_with_handler(handler)
+    items = (PreExtractedItem(content=f"fact {i}", topic="t") for i in range(3))
+    result = client.memories.add(PreExtractedInput(items=items), user_id="u1", stream_body=True)
+    assert result.run_id == "r1"
+    body = json.loads(captured[0])
+    assert body == {
+        "input": {
+            "pre_extracted": {"items": [{"content": f"fact {i}", "topic": "t"} for i in range(3)]}
+        },
+        "user_id": "u1",
+    }
+
+
+def test_add_raw_conversation_sends_messages_verbatim() -> None:
+    captured: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        captured.append(request)
+        return httpx.Response(200, json={"run_id": "r1", "status": "pending"})
+
+    client = _make_client_with_handler(handler)
+    raw = b'[{"role": "user", "content": "hi"}]'
+    client.memories.add(RawConversationInput(messages=raw), conversation_id="c1")
+    assert (
+        captured[0].content
+        == b'{"input":{"conversation":{"messages":' + raw + b'}},"conversation_id":"c1"}'
+    )
+
+
 # ── memories.get ────────────────────────────────────────────────────────
 
 SAMPLE_MEMORY_RESPONSE: dict[str, Any] = {
@@ -388,6 +428,116 @@ def test_search_no_retrieval_config_by_default() -> None:
     assert "retrieval_config" not in body
 
 
+def test_search_stream_yields_memories_and_total() -> None:
+    response_body: dict[str, Any] = {
+        "memories": [SAMPLE_MEMORY_RESPONSE, {**SAMPLE_MEMORY_RESPONSE, "id": "m2"}],
+        "total": 2,
+    }
+    client = _make_client(body=response_body)
+    with client.memories.search_stream(query="test") as stream:
+        ids = [m.id for m in stream]
+        assert stream.total == 2
+    assert ids == ["m1", "m2"]
+
+
+def test_search_stream_sends_search_body() -> None:
+    captured: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        captured.append(request)
+        return httpx.Response(200, json={"memories": [], "total": 0})
+
+    client = _make_client_with_handler(handler)
+    with client.memories.search_stream(query="find this", user_id="u1") as stream:
+        assert list(stream) == []
+    assert captured[0].url.path == "/v1/memories/search"
+    assert json.loads(captured[0].content) == {"query": "find this", "user_id": "u1"}
+
+
+def test_search_stream_raises_api_error() -> None:
+    client = _make_client(status_code=400, body={"detail": "Bad request"})
+    with pytest.raises(APIError) as exc_info:
+        client.memories.search_stream(query="test")
+    assert exc_info.value.status_code == 400
+
+
+def test_search_stream_malformed_body() -> None:
+    client = _make_client_with_handler(
+        lambda _: httpx.Response(200, content=b'{"memories": [{"id": "m1"')
+    )
+    stream = client.memories.search_stream(query="test")
+    with pytest.raises(APIError):
+        list(stream)
+
+
+def test_prepare_search_reuses_scope() -> None:
+    captured: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        captured.append(request)
+        return httpx.Response(200, json={"memories": [SAMPLE_MEMORY_RESPONSE], "total": 1})
+
+    client = _make_client_with_handler(handler)
+    prepared = client.memories.prepare_search(
+        user_id="u1", topics=["a"], retrieval_config=RetrievalConfig(retrieval_type="bm25")
+    )
+    first = prepared.search("first")
+    prepared.search("second")
+    assert first[0].id == "m1"
+    bodies = [json.loads(r.content) for r in captured]
+    assert [b["query"] for b in bodies] == ["first", "second"]
+    assert bodies[1] == {
+        "query": "second",
+        "retrieval_config": {"retrieval_type": "bm25", "limit": None},
+        "topics": ["a"],
+        "user_id": "u1",
+    }
+
+
+# ── memories.with_raw_response ──────────────────────────────────────────
+
+
+def test_raw_search_returns_undecoded_body() -> None:
+    raw_body = b'{"memories": [], "total": 0, "extra": "kept"}'
+    client = _make_client_with_handler(
+        lambda _: httpx.Response(
+            200, content=raw_body, headers={"Content-Type": "application/json", "X-Trace": "t1"}
+        )
+    )
+    response = client.memories.with_raw_response.search(query="test", user_id="u1")
+    assert response.status_code == 200
+    assert response.headers["X-Trace"] == "t1"
+    assert response.content == raw_body
+
+
+def test_raw_get_maps_errors() -> None:
+    client = _make_client(status_code=404, body={"detail": "Not found"})
+    with pytest.raises(APIError) as exc_info:
+        client.memories.with_raw_response.get("missing")
+    assert exc_info.value.status_code == 404
+
+
+def test_raw_search_streams_to_wsgi() -> None:
+    raw_body = b'{"memories": [], "total": 0}'
+    client = _make_client_with_handler(
+        lambda _: httpx.Response(
+            200, content=raw_body, headers={"Content-Type": "application/json"}
+        )
+    )
+    started: list[tuple[str, list[tuple[str, str]]]] = []
+
+    def start_response(status: str, headers: list[tuple[str, str]]) -> None:
+        started.append((status, headers))
+
+    response = client.memories.with_raw_response.search(query="test", stream=True)
+    body = b"".join(response.to_wsgi(start_response))
+    assert body == raw_body
+    status, headers = started[0]
+    assert status == "200 OK"
+    assert ("content-type", "application/json") in headers
+    assert all(name != "content-length" for name, _ in headers)
+
+
 # ── runs.get ────────────────────────────────────────────────────────────
 
 
@@ -413,6 +563,56 @@ def test_get_run() -> None:
     assert len(result.memories_created) == 1
 
 
+# ── Request compression ─────────────────────────────────────────────────
+
+
+def _make_compressing_client(
+    handler: Any, compression: Literal["gzip", "zstd"], threshold: int
+) -> EngramClient:
+    client = _make_client_with_handler(handler)
+    client._config.compression = compression
+    client._config.compression_threshold = threshold
+    return client
+
+
+def test_gzip_compresses_bodies_above_threshold() -> None:
+    captured: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        captured.append(request)
+        return httpx.Response(200, json={"run_id": "r1", "status": "pending"})
+
+    client = _make_compressing_client(handler, "gzip", threshold=64)
+    client.memories.add("x" * 1000, user_id="u1")
+    client.memories.add("short")
+    assert captured[0].headers["Content-Encoding"] == "gzip"
+    body = json.loads(gzip.decompress(captured[0].content))
+    assert body == {"input": {"string": {"content": ["x" * 1000]}}, "user_id": "u1"}
+    assert "Content-Encoding" not in captured[1].headers
+    assert json.loads(captured[1].content) == {"input": {"string": {"content": ["short"]}}}
+
+
+@pytest.mark.skipif(not zstd_available(), reason="zstd is not available")
+def test_zstd_compresses_bodies_above_threshold() -> None:
+    captured: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        captured.append(request)
+        return httpx.Response(200, json={"memories": [], "total": 0})
+
+    client = _make_compressing_client(handler, "zstd", threshold=0)
+    client.memories.search(query="find this")
+    assert captured[0].headers["Content-Encoding"] == "zstd"
+    assert captured[0].content[:4] == b"\x28\xb5\x2f\xfd"
+
+
+def test_client_rejects_unknown_compression() -> None:
+    with pytest.raises(ValidationError):
+        EngramClient(api_key="test-key", compression="brotli")  # type: ignore[arg-type]
+    with pytest.raises(ValidationError):
+        EngramClient(api_key="test-key", compression="gzip", compression_threshold=-1)
+
+
 # ── Error handling ──────────────────────────────────────────────────────
 
 
@@ -0,0 +1,131 @@
+import json
+
+import httpx
+import pytest
+
+from engram import (
+    AsyncEngramClient,
+    CompactionReport,
+    ConversationCompactor,
+    ConversationInput,
+    EngramClient,
+    MessageInput,
+    StringInput,
+    ToolCallFuncInput,
+    ToolCallInput,
+)
+from engram._http import AsyncHttpTransport, HttpTransport
+from engram.errors import ValidationError
+
+SYSTEM = "You are a helpful assistant.   \n\n\n\nBe brief."
+
+
+def _conversation() -> list[MessageInput]:
+    call = ToolCallInput(
+        id="call1", function=ToolCallFuncInput(name="lookup", arguments='{ "city":  "Paris" }')
+    )
+    return [
+        MessageInput(role="system", content=SYSTEM),
+        MessageInput(role="user", content="  Where do I live?  "),
+        MessageInput(role="assistant", content="", tool_calls=[call]),
+        MessageInput(role="tool", content="x" * 1000, tool_call_id="call1"),
+        MessageInput(role="system", content=SYSTEM),
+        MessageInput(role="developer", content=SYSTEM),
+    ]
+
+
+def test_compaction_dedupes_minifies_truncates_and_strips() -> None:
+    compactor = ConversationCompactor(max_tool_output=100)
+    compacted, report = compactor.compact(ConversationInput(_conversation(), metadata={"k": 1}))
+    assert isinstance(compacted, ConversationInput)
+    assert compacted.metadata == {"k": 1}
+    messages = list(compacted.messages)
+
+    assert [m.role for m in messages] == ["system", "user", "assistant", "tool", "developer"]
+    assert messages[0].content == "You are a helpful assistant.\n\nBe brief."
+    assert messages[1].content == "Where do I live?"
+    tool_calls = messages[2].tool_calls
+    assert tool_calls is not None and tool_calls[0].function is not None
+    assert tool_calls[0].function.arguments == '{"city":"Paris"}'
+    output = messages[3].content
+    assert output.startswith("x" * 66) and output.endswith("x" * 34)
+    assert "900 characters truncated" in output
+
+    assert report.conversations == 1
+    assert report.messages_removed == 1
+    assert report.outputs_truncated == 1
+    assert report.arguments_minified == 1
+    assert report.bytes_after == sum(len(m.content.encode()) for m in messages) + len(
+        '{"city":"Paris"}'
+    )
+    assert report.bytes_saved == report.bytes_before - report.bytes_after > 900
+
+
+def test_compaction_steps_can_be_disabled_and_other_inputs_pass_through() -> None:
+    compactor = ConversationCompactor(
+        dedupe_context=False, minify_arguments=False, max_tool_output=None, strip_whitespace=False
+    )
+    compacted, report = compactor.compact(ConversationInput(_conversation()))
+    assert isinstance(compacted, ConversationInput)
+    assert list(compacted.messages) == _conversation()
+    assert report.bytes_saved == 0
+
+    text = StringInput("  spaced  ")
+    assert compactor.compact(text) == (text, CompactionReport())
+    with pytest.raises(ValidationError):
+        ConversationCompactor(max_tool_output=10)
+
+
+def test_client_compacts_conversations_and_reports_per_request() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"run_id": "r1", "status": "queued"})
+
+    reports: list[CompactionReport] = []
+    compactor = ConversationCompactor(on_report=reports.append)
+    client = EngramClient(
+        base_url="https://test.example.com", api_key="k", conversation_compactor=compactor
+    )
+    transport = HttpTransport(client._config, httpx.Client(transport=httpx.MockTransport(handler)))
+    client._transport.close()
+    client.memories._transport = transport
+
+    client.memories.add(ConversationInput(_conversation()))
+    client.memories.add(
+        [{"role": "system", "content": "s"}, {"role": "system", "content": "s"}],
+        stream_body=True,
+    )
+    client.memories.add(ConversationInput(iter(_conversation())), stream_body=True)
+    client.memories.add("not a conversation")
+
+    sent = json.loads(requests[0].content)["input"]["conversation"]["messages"]
+    assert len(sent) == 5
+    assert json.loads(requests[1].read())["input"]["conversation"]["messages"] == [
+        {"role": "system", "content": "s"}
+    ]
+    assert len(reports) == 3
+    assert reports[2] == reports[0]
+    assert compactor.stats.conversations == 3
+    assert compactor.stats.bytes_saved == sum(r.bytes_saved for r in reports)
+
+
+@pytest.mark.asyncio
+async def test_async_client_compacts_conversations() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"run_id": "r1", "status": "queued"})
+
+    compactor = ConversationCompactor()
+    client = AsyncEngramClient(
+        base_url="https://test.example.com", api_key="k", conversation_compactor=compactor
+    )
+    client.memories._transport = AsyncHttpTransport(
+        client._config, httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    await client.memories.add(ConversationInput(_conversation()))
+    assert len(json.loads(requests[0].content)["input"]["conversation"]["messages"]) == 5
+    assert compactor.stats.messages_removed == 1
@@ -0,0 +1,158 @@
+from typing import Any
+
+import httpx
+import pytest
+
+from engram import (
+    AddDeduplicator,
+    PreExtractedInput,
+    PreExtractedItem,
+    RawConversationInput,
+    SQLiteCacheBackend,
+    StringInput,
+)
+from engram._models import Run
+from engram.errors import ValidationError
+from helpers import FakeClock, make_async_client, make_client
+
+
+class FakeServer:
+    def __init__(self) -> None:
+        self.run_status = "completed"
+        self.adds = 0
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        if path == "/v1/memories":
+            self.adds += 1
+            return httpx.Response(200, json={"run_id": f"r{self.adds}", "status": "queued"})
+        return httpx.Response(
+            200,
+            json={
+                "run_id": path.rsplit("/", 1)[-1],
+                "status": self.run_status,
+                "group_id": "g1",
+                "starting_step": 0,
+                "input_type": "string",
+                "created_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:00Z",
+            },
+        )
+
+
+def test_repeated_add_returns_the_earlier_run() -> None:
+    server = FakeServer()
+    dedup = AddDeduplicator()
+    client = make_client(server, add_dedup=dedup)
+
+    first = client.memories.add("Alice lives in Paris", user_id="u1")
+    assert client.memories.add("Alice lives in Paris", user_id="u1") is first
+    assert client.memories.add(StringInput("Alice lives in Paris"), user_id="u1") is first
+    assert server.adds == 1
+
+    client.memories.add("Alice lives in Paris", user_id="u2")
+    client.memories.add("Alice lives in Paris", user_id="u1", group="g1")
+    client.memories.add("Alice lives in Rome", user_id="u1")
+    assert server.adds == 4
+
+    stats = dedup.stats
+    assert stats.checks == 6
+    assert stats.duplicates == 2
+    assert stats.recorded == 4
+    assert stats.entries == len(dedup) == 4
+    assert stats.skip_rate == pytest.approx(2 / 6)
+    assert stats.bytes == 4 * (16 + 2)
+    assert 0 < dedup.false_positive_rate < 1e-30
+
+
+def test_dedup_window_and_lru_bound() -> None:
+    server = FakeServer()
+    clock = FakeClock()
+    dedup = AddDeduplicator(window=10, max_entries=2, clock=clock)
+    client = make_client(server, add_dedup=dedup)
+
+    client.memories.add("a")
+    clock.now = 11
+    client.memories.add("a")
+    assert server.adds == 2
+
+    client.memories.add("b")
+    client.memories.add("c")
+    client.memories.add("a")
+    assert server.adds == 5
+    stats = dedup.stats
+    assert stats.expirations == 1
+    assert stats.evictions == 2
+
+
+def test_failed_runs_are_forgotten_and_one_shot_inputs_are_not_hashed() -> None:
+    server = FakeServer()
+    dedup = AddDeduplicator()
+    client = make_client(server, add_dedup=dedup)
+
+    run = client.memories.add("a")
+    server.run_status = "failed"
+    client.runs.get(run.run_id)
+    assert client.memories.add("a").run_id != run.run_id
+    assert dedup.stats.forgotten == 1
+
+    items = (PreExtractedItem(content="x", topic="t") for _ in range(2))
+    client.memories.add(PreExtractedInput(items))
+    client.memories.add(PreExtractedInput([PreExtractedItem(content="x", topic="t")]))
+    client.memories.add(PreExtractedInput([PreExtractedItem(content="x", topic="t")]))
+    assert server.adds == 4
+    dedup.record(b"k" * 16, Run(run_id="r9", status="failed"))
+    assert dedup.lookup(b"k" * 16) is None
+
+
+def test_raw_conversations_are_hashed_without_decoding(monkeypatch: pytest.MonkeyPatch) -> None:
+    dedup = AddDeduplicator()
+    scope: dict[str, Any] = {"user_id": "u1", "conversation_id": None, "group": None}
+    messages = b'[{"role":"user","content":"hi"}]'
+
+    def no_decoding(*args: Any, **kwargs: Any) -> Any:
+        raise AssertionError("raw messages were decoded")
+
+    monkeypatch.setattr("json.loads", no_decoding)
+    key = dedup.key(RawConversationInput(messages), **scope)
+    assert key == dedup.key(RawConversationInput(messages), **scope)
+    assert key != dedup.key(RawConversationInput(messages, metadata={"a": 1}), **scope)
+    assert key != dedup.key(RawConversationInput(messages.replace(b"hi", b"ho")), **scope)
+    assert key != dedup.key(RawConversationInput(messages), **{**scope, "user_id": "u2"})
+
+
+def test_dedup_persists_keys_in_a_backend(tmp_path: Any) -> None:
+    server = FakeServer()
+    with SQLiteCacheBackend(tmp_path / "cache.db") as backend:
+        first = make_client(server, add_dedup=AddDeduplicator(backend=backend))
+        run = first.memories.add("a", user_id="u1")
+
+        dedup = AddDeduplicator(backend=backend)
+        second = make_client(server, add_dedup=dedup)
+        assert second.memories.add("a", user_id="u1") == run
+        assert server.adds == 1
+        assert dedup.stats.backend_hits == 1
+
+        dedup.forget(run.run_id)
+        key = dedup.key("a", user_id="u1", conversation_id=None, group=None)
+        assert key is not None
+        assert AddDeduplicator(backend=backend).lookup(key) is None
+
+
+def test_dedup_validates_settings() -> None:
+    with pytest.raises(ValidationError):
+        AddDeduplicator(window=0)
+    with pytest.raises(ValidationError):
+        AddDeduplicator(digest_size=4)
+
+
+@pytest.mark.asyncio
+async def test_async_add_dedup() -> None:
+    server = FakeServer()
+    client = make_async_client(server, add_dedup=AddDeduplicator())
+    first = await client.memories.add("a", conversation_id="c1")
+    assert await client.memories.add("a", conversation_id="c1") is first
+    assert await client.memories.add("a", conversation_id="c2") is not first
+    assert server.adds == 2
@@ -1,44 +1,97 @@
 def test_public_imports() -> None:
     import engram
     from engram import (  # noqa: F401
+        AddDeduplicator,
+        AddItem,
+        AddManyError,
+        AddResult,
+        AddSkippedError,
+        AddSplitting,
+        AddSpool,
         APIError,
+        AsyncConversationSession,
         AsyncEngramClient,
+        AsyncOrderedAddExecutor,
+        AsyncRawResponse,
+        AsyncScopeMirror,
+        AsyncWriteBuffer,
         AuthenticationError,
+        BackendEntry,
+        BM25Index,
+        CacheBackend,
+        CacheStats,
         CommittedOperation,
         CommittedOperations,
+        CompactionReport,
+        CompactSearchResults,
+        CompositeRun,
         ConnectionError,
+        ConversationCompactor,
         ConversationInput,
+        ConversationSession,
+        DedupStats,
         EngramClient,
         EngramError,
         EngramTimeoutError,
+        LoopBlockingStats,
         Memory,
+        MemoryCache,
         MessageInput,
+        OrderedAddExecutor,
         PreExtractedInput,
         PreExtractedItem,
+        RawConversationInput,
+        RawResponse,
         RetrievalConfig,
         Run,
         RunStatus,
+        RunThrottle,
+        ScopeMirror,
+        SearchCache,
         SearchResults,
+        SplitAddError,
+        SpoolStats,
+        SQLiteCacheBackend,
         StringInput,
+        ThrottleStats,
         ToolCallCustomInput,
         ToolCallFuncInput,
         ToolCallInput,
         ValidationError,
+        WriteBuffer,
+        WriteOverlay,
     )
 
     assert isinstance(EngramClient, type)
     assert isinstance(AsyncEngramClient, type)
+    assert isinstance(RawResponse, type)
+    assert isinstance(AsyncRawResponse, type)
+    assert isinstance(ScopeMirror, type)
+    assert isinstance(AsyncScopeMirror, type)
     assert isinstance(EngramError, type)
     assert isinstance(APIError, type)
     assert isinstance(AuthenticationError, type)
     assert isinstance(ValidationError, type)
     assert isinstance(EngramTimeoutError, type)
+    assert isinstance(AddManyError, type)
+    assert isinstance(AddSkippedError, type)
+    assert isinstance(SplitAddError, type)
+    assert isinstance(LoopBlockingStats, type)
     assert isinstance(Memory, type)
     assert isinstance(Run, type)
     assert isinstance(RunStatus, type)
     assert isinstance(SearchResults, type)
+    assert isinstance(SearchCache, type)
+    assert isinstance(CacheStats, type)
+    assert isinstance(MemoryCache, type)
+    assert isinstance(SQLiteCacheBackend, type)
+    assert isinstance(BackendEntry, type)
+    assert isinstance(BM25Index, type)
+    assert isinstance(CacheBackend, type)
+    assert isinstance(CompactSearchResults, type)
     assert isinstance(PreExtractedInput, type)
     assert isinstance(PreExtractedItem, type)
+    assert isinstance(RawConversationInput, type)
     assert isinstance(RetrievalConfig, type)
     assert isinstance(CommittedOperation, type)
     assert isinstance(CommittedOperations, type)
@@ -48,31 +101,86 @@ def test_public_imports() -> None:
     assert isinstance(ToolCallCustomInput, type)
     assert isinstance(ToolCallFuncInput, type)
     assert isinstance(ToolCallInput, type)
+    assert isinstance(WriteOverlay, type)
+    assert isinstance(AddDeduplicator, type)
+    assert isinstance(DedupStats, type)
+    assert isinstance(ConversationSession, type)
+    assert isinstance(AsyncConversationSession, type)
+    assert isinstance(ConversationCompactor, type)
+    assert isinstance(CompactionReport, type)
+    assert isinstance(AddSplitting, type)
+    assert isinstance(CompositeRun, type)
+    assert isinstance(AddSpool, type)
+    assert isinstance(AddItem, type)
+    assert isinstance(AddResult, type)
+    assert isinstance(OrderedAddExecutor, type)
+    assert isinstance(AsyncOrderedAddExecutor, type)
+    assert isinstance(RunThrottle, type)
+    assert isinstance(ThrottleStats, type)
+    assert isinstance(SpoolStats, type)
+    assert isinstance(WriteBuffer, type)
+    assert isinstance(AsyncWriteBuffer, type)
 
     expected_exports = {
         "APIError",
+        "AddDeduplicator",
+        "AddItem",
+        "AddManyError",
+        "AddResult",
+        "AddSkippedError",
+        "AddSplitting",
+        "AddSpool",
+        "AsyncConversationSession",
         "AsyncEngramClient",
+        "AsyncOrderedAddExecutor",
+        "AsyncRawResponse",
+        "AsyncScopeMirror",
+        "AsyncWriteBuffer",
         "AuthenticationError",
+        "BM25Index",
+        "BackendEntry",
+        "CacheBackend",
+        "CacheStats",
         "CommittedOperation",
         "CommittedOperations",
+        "CompactSearchResults",
+        "CompactionReport",
+        "CompositeRun",
         "ConnectionError",
+        "ConversationSession",
+        "ConversationCompactor",
         "ConversationInput",
+        "DedupStats",
         "EngramClient",
         "EngramError",
         "EngramTimeoutError",
+        "LoopBlockingStats",
         "Memory",
+        "MemoryCache",
         "MessageInput",
+        "OrderedAddExecutor",
         "PreExtractedInput",
         "PreExtractedItem",
+        "RawConversationInput",
+        "RawResponse",
         "RetrievalConfig",
         "Run",
         "RunStatus",
+        "RunThrottle",
+        "SQLiteCacheBackend",
+        "SearchCache",
+        "ScopeMirror",
         "SearchResults",
+        "SplitAddError",
+        "SpoolStats",
         "StringInput",
+        "ThrottleStats",
         "ToolCallCustomInput",
         "ToolCallFuncInput",
         "ToolCallInput",
         "ValidationError",
+        "WriteBuffer",
+        "WriteOverlay",
         "__version__",
     }
     assert set(engram.__all__) == expected_exports
@@ -0,0 +1,248 @@
+import json
+import math
+from typing import Any
+
+import httpx
+import pytest
+
+from engram import RetrievalConfig
+from engram.errors import APIError
+from helpers import FakeClock, make_async_client, make_client
+
+
+def _memory(memory_id: str, topic: str = "t1", content: str = "c") -> dict[str, Any]:
+    return {
+        "id": memory_id,
+        "project_id": "p1",
+        "content": content,
+        "topic": topic,
+        "group": "g1",
+        "user_id": "u1",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    }
+
+
+class FakeServer:
+    """Serves a mutable scope of memories and a single run."""
+
+    def __init__(self, *memories: dict[str, Any]) -> None:
+        self.memories = {m["id"]: m for m in memories}
+        self.run: dict[str, Any] = {}
+        self.requests: list[httpx.Request] = []
+        self.failing: set[str] = set()
+        self.search_down = False
+
+    def finish_run(self, **ops: list[str]) -> None:
+        self.run = {
+            "run_id": f"r{len(self.requests)}",
+            "status": "completed",
+            "group_id": "g1",
+            "user_id": "u1",
+            "starting_step": 0,
+            "input_type": "string",
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-01-01T00:00:00Z",
+            "committed_operations": {
+                kind: [
+                    {"memory_id": i, "committed_at": "2024-01-01T00:00:00Z"}
+                    for i in ops.get(kind, [])
+                ]
+                for kind in ("created", "updated", "deleted")
+            },
+        }
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        if path.startswith("/v1/runs/"):
+            return httpx.Response(200, json=self.run)
+        if path == "/v1/memories":
+            return httpx.Response(200, json={"run_id": "r-add", "status": "queued"})
+        if path == "/v1/memories/search":
+            if self.search_down:
+                return httpx.Response(503, json={"detail": "unavailable"})
+            memories = list(self.memories.values())
+            return httpx.Response(200, json={"memories": memories, "total": len(memories)})
+        memory_id = path.rsplit("/", 1)[-1]
+        if memory_id in self.failing:
+            return httpx.Response(500, json={"detail": "boom"})
+        memory = self.memories.get(memory_id)
+        if memory is None:
+            return httpx.Response(404, json={"detail": "not found"})
+        return httpx.Response(200, json=memory)
+
+
+def test_mirror_bulk_loads_and_serves_reads_locally() -> None:
+    server = FakeServer(_memory("m1"), _memory("m2", topic="t2"))
+    client = make_client(server)
+    mirror = client.memories.mirror(user_id="u1", group="g1", limit=500)
+    assert mirror.needs_resync
+    assert math.isinf(mirror.staleness)
+
+    memory = mirror.get("m1")
+    assert memory is not None and memory.id == "m1"
+    assert mirror.get("missing") is None
+    assert [m.id for m in mirror.fetch(topics=["t2"])] == ["m2"]
+    assert len(mirror.fetch(limit=1)) == 1
+    assert mirror.fetch(limit=1).total == 2
+    assert mirror.complete
+    assert len(server.requests) == 1
+
+    body = json.loads(server.requests[0].content)
+    assert body["retrieval_config"] == {"retrieval_type": "fetch", "limit": 500}
+    assert body["user_id"] == "u1"
+    assert body["group"] == "g1"
+
+
+def test_mirror_applies_finished_runs() -> None:
+    server = FakeServer(_memory("m1"), _memory("m2"))
+    client = make_client(server)
+    mirror = client.memories.mirror(user_id="u1", group="g1")
+    mirror.fetch()
+
+    server.memories["m1"] = _memory("m1", content="updated")
+    server.memories["m3"] = _memory("m3")
+    del server.memories["m2"]
+    server.finish_run(created=["m3", "m4"], updated=["m1"], deleted=["m2"])
+    client.runs.get("r1")
+
+    assert [m.id for m in mirror.fetch()] == ["m1", "m3"]
+    updated = mirror.get("m1")
+    assert updated is not None and updated.content == "updated"
+    paths = [r.url.path for r in server.requests]
+    assert paths.count("/v1/memories/search") == 1
+    assert not mirror.needs_resync
+
+
+def test_mirror_ignores_other_scopes_and_resyncs_periodically() -> None:
+    server = FakeServer(_memory("m1"))
+    client = make_client(server)
+    clock = FakeClock()
+    mirror = client.memories.mirror(user_id="u2", resync_interval=60)
+    mirror._state.clock = clock
+    mirror.fetch()
+
+    server.finish_run(created=["m1"])
+    client.runs.get("r1")
+    assert [r.url.path for r in server.requests][-1] == "/v1/runs/r1"
+
+    clock.now = 30
+    assert mirror.staleness == 30
+    mirror.get("m1")
+    clock.now = 61
+    assert mirror.needs_resync
+    mirror.get("m1")
+    assert [r.url.path for r in server.requests].count("/v1/memories/search") == 2
+    assert mirror.staleness == 0
+
+
+def test_mirror_matches_runs_by_the_group_they_were_added_to() -> None:
+    server = FakeServer(_memory("m1"))
+    client = make_client(server)
+    notes = client.memories.mirror(user_id="u1", group="notes")
+    other = client.memories.mirror(user_id="u1", group="other")
+    notes.fetch()
+    other.fetch()
+
+    run = client.memories.add("x", user_id="u1", group="notes")
+    server.memories["m2"] = _memory("m2")
+    server.finish_run(created=["m2"])
+    server.run["run_id"] = run.run_id
+    assert server.run["group_id"] != "notes"
+    client.runs.get(run.run_id)
+
+    assert "m2" in notes
+    assert "m2" not in other
+    refetched = [r for r in server.requests if r.url.path == "/v1/memories/m2"]
+    assert [r.url.params["group"] for r in refetched] == ["notes"]
+
+
+def test_mirror_marks_itself_for_resync_when_a_run_cannot_be_applied() -> None:
+    server = FakeServer(_memory("m1"))
+    client = make_client(server)
+    mirror = client.memories.mirror(user_id="u1")
+    mirror.fetch()
+
+    server.failing.add("m1")
+    server.finish_run(updated=["m1"])
+    client.runs.get("r1")
+    assert mirror.needs_resync
+    assert mirror.get("m1") is not None
+
+
+@pytest.mark.asyncio
+async def test_async_mirror_loads_and_applies_runs() -> None:
+    server = FakeServer(_memory("m1"))
+    client = make_async_client(server)
+    mirror = client.memories.mirror(user_id="u1", group="g1")
+    assert [m.id for m in await mirror.fetch()] == ["m1"]
+
+    server.memories["m2"] = _memory("m2")
+    server.finish_run(created=["m2"], deleted=["m1"])
+    await client.runs.wait("r1")
+    assert await mirror.get("m1") is None
+    assert "m2" in mirror
+    assert len(mirror) == 1
+    assert [r.url.path for r in server.requests].count("/v1/memories/search") == 1
+
+
+def test_mirror_keyword_search_tracks_applied_runs() -> None:
+    server = FakeServer(_memory("m1", content="likes hiking"), _memory("m2", content="likes tea"))
+    client = make_client(server)
+    mirror = client.memories.mirror(user_id="u1", group="g1")
+    assert [m.id for m in mirror.search("hiking")] == ["m1"]
+
+    server.memories["m3"] = _memory("m3", content="hiking boots")
+    server.finish_run(created=["m3"], deleted=["m1"])
+    client.runs.get("r1")
+    assert [m.id for m in mirror.search("hiking")] == ["m3"]
+    assert mirror.search("likes").total == 1
+
+
+def test_bm25_searches_of_a_mirrored_scope_are_answered_locally() -> None:
+    server = FakeServer(_memory("m1", content="Alice lives in Paris"), _memory("m2"))
+    client = make_client(server)
+    bm25 = RetrievalConfig(retrieval_type="bm25")
+    mirror = client.memories.mirror(user_id="u1", group="g1")
+    assert not mirror.serves_searches
+    client.memories.search(query="paris", user_id="u1", group="g1", retrieval_config=bm25)
+    assert len(server.requests) == 1
+
+    mirror.fetch()
+    assert mirror.serves_searches
+    requests = len(server.requests)
+    results = client.memories.search(query="paris", user_id="u1", group="g1", retrieval_config=bm25)
+    assert [m.id for m in results] == ["m1"]
+    assert len(server.requests) == requests
+    # Other retrieval types and scopes still go to the server.
+    client.memories.search(query="paris", user_id="u1", group="g1")
+    client.memories.search(query="paris", user_id="u2", group="g1", retrieval_config=bm25)
+    assert len(server.requests) == requests + 2
+
+
+def test_bm25_searches_fall_back_to_a_stale_mirror_when_the_server_is_down() -> None:
+    server = FakeServer(_memory("m1", content="Alice lives in Paris"))
+    client = make_client(server)
+    bm25 = RetrievalConfig(retrieval_type="bm25")
+    mirror = client.memories.mirror(user_id="u1", group="g1")
+    mirror.fetch()
+    mirror._state.dirty = True
+    server.search_down = True
+
+    results = client.memories.search(query="paris", user_id="u1", group="g1", retrieval_config=bm25)
+    assert [m.id for m in results] == ["m1"]
+    with pytest.raises(APIError):
+        client.memories.search(query="paris", user_id="u1", group="g1")
+
+
+async def test_async_bm25_searches_of_a_mirrored_scope_are_answered_locally() -> None:
+    server = FakeServer(_memory("m1", content="Alice lives in Paris"))
+    client = make_async_client(server)
+    mirror = client.memories.mirror(user_id="u1", group="g1")
+    await mirror.fetch()
+    server.search_down = True
+    results = await client.memories.search(
+        query="paris", user_id="u1", group="g1", retrieval_config=RetrievalConfig("bm25")
+    )
+    assert [m.id for m in results] == ["m1"]
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import threading
+import time
+from typing import Any
+
+import httpx
+import pytest
+
+from engram import AddItem, Run, StringInput
+from engram._resources.ordered import default_order_key
+from engram.errors import APIError, ValidationError
+from helpers import make_async_client, make_client, run_status
+
+
+class FakeServer:
+    """Records the order adds arrive per conversation; runs finish after `polls` GETs."""
+
+    def __init__(self, delay: float = 0.0, polls: int = 0) -> None:
+        self.delay = delay
+        self.polls = polls
+        self.events: list[tuple[str, str]] = []
+        self.in_flight = 0
+        self.peak = 0
+        self.rejected: set[str] = set()
+        self._gets: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _start(self, request: httpx.Request) -> httpx.Response | None:
+        if request.method == "GET":
+            run_id = request.url.path.rsplit("/", 1)[-1]
+            with self._lock:
+                self._gets[run_id] = self._gets.get(run_id, 0) + 1
+                done = self._gets[run_id] >= self.polls
+                if done:
+                    self.events.append(("finished", run_id))
+            return httpx.Response(200, json=run_status(run_id, "completed" if done else "running"))
+        body: dict[str, Any] = json.loads(request.content)
+        content = body["input"]["string"]["content"][0]
+        with self._lock:
+            self.events.append(("added", content))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        return None
+
+    def _finish(self, request: httpx.Request) -> httpx.Response:
+        content = json.loads(request.content)["input"]["string"]["content"][0]
+        with self._lock:
+            self.in_flight -= 1
+        if content in self.rejected:
+            return httpx.Response(400, json={"detail": "rejected"})
+        return httpx.Response(200, json={"run_id": f"r-{content}", "status": "queued"})
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        response = self._start(request)
+        if response is not None:
+            return response
+        time.sleep(self.delay)
+        return self._finish(request)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        response = self._start(request)
+        if response is not None:
+            return response
+        await asyncio.sleep(self.delay)
+        return self._finish(request)
+
+    def added(self, prefix: str) -> list[str]:
+        return [c for kind, c in self.events if kind == "added" and c.startswith(prefix)]
+
+
+def test_adds_stay_in_order_per_conversation() -> None:
+    server = FakeServer(delay=0.005)
+    client = make_client(server)
+
+    with client.memories.ordered(concurrency=4) as executor:
+        futures = [
+            executor.submit(StringInput([f"{conv}-{i}"]), conversation_id=conv)
+            for i in range(5)
+            for conv in ("a", "b", "c")
+        ]
+    assert executor.pending == 0
+
+    for conv in ("a", "b", "c"):
+        assert server.added(conv) == [f"{conv}-{i}" for i in range(5)]
+    assert server.peak > 1
+    assert server.peak <= 3
+    assert futures[0].result() == Run("r-a-0", "queued")
+
+
+def test_concurrency_limits_parallel_keys() -> None:
+    server = FakeServer(delay=0.01)
+    client = make_client(server)
+
+    with client.memories.ordered(concurrency=2) as executor:
+        for conv in "abcdef":
+            executor.submit(StringInput([conv]), conversation_id=conv)
+    assert server.peak <= 2
+
+
+def test_wait_for_completion_serializes_runs() -> None:
+    server = FakeServer(polls=2)
+    client = make_client(server)
+
+    with client.memories.ordered(wait_for_completion=True, poll_interval=0.001) as executor:
+        first = executor.submit(StringInput(["x-1"]), conversation_id="x")
+        executor.submit(StringInput(["x-2"]), conversation_id="x")
+
+    assert first.result() == Run("r-x-1", "completed")
+    assert server.events.index(("finished", "r-x-1")) < server.events.index(("added", "x-2"))
+
+
+def test_errors_do_not_stop_the_key() -> None:
+    server = FakeServer()
+    server.rejected.add("k-1")
+    client = make_client(server)
+
+    with client.memories.ordered() as executor:
+        failed = executor.submit(StringInput(["k-1"]), conversation_id="k")
+        later = executor.submit(StringInput(["k-2"]), conversation_id="k")
+
+    assert isinstance(failed.exception(), APIError)
+    assert later.result().run_id == "r-k-2"
+
+
+def test_closed_executor_rejects_adds() -> None:
+    client = make_client(FakeServer())
+    executor = client.memories.ordered()
+    executor.close()
+    with pytest.raises(ValidationError):
+        executor.submit("late")
+    with pytest.raises(ValidationError):
+        client.memories.ordered(concurrency=0)
+
+
+def test_default_key() -> None:
+    assert default_order_key(AddItem("x", user_id="u", conversation_id="c")) == (
+        "conversation",
+        None,
+        "c",
+    )
+    assert default_order_key(AddItem("x", user_id="u")) == ("user", None, "u")
+    assert default_order_key(AddItem("x")) is None
+
+
+def test_custom_key() -> None:
+    server = FakeServer(delay=0.005)
+    client = make_client(server)
+
+    with client.memories.ordered(key=lambda item: item.group) as executor:
+        for i in range(4):
+            executor.submit(StringInput([f"g-{i}"]), conversation_id=f"c{i}", group="g")
+    assert server.added("g") == [f"g-{i}" for i in range(4)]
+    assert server.peak == 1
+
+
+async def test_async_adds_stay_in_order_per_conversation() -> None:
+    server = FakeServer(delay=0.005)
+    client = make_async_client(server.handle)
+
+    async with client.memories.ordered(concurrency=2) as executor:
+        futures = [
+            executor.submit(StringInput([f"{conv}-{i}"]), conversation_id=conv)
+            for i in range(4)
+            for conv in ("a", "b", "c")
+        ]
+    assert executor.pending == 0
+
+    for conv in ("a", "b", "c"):
+        assert server.added(conv) == [f"{conv}-{i}" for i in range(4)]
+    assert server.peak == 2
+    assert (await futures[1]).run_id == "r-b-0"
+
+
+async def test_async_wait_for_completion() -> None:
+    server = FakeServer(polls=2)
+    client = make_async_client(server.handle)
+
+    async with client.memories.ordered(wait_for_completion=True, poll_interval=0.001) as executor:
+        first = executor.submit(StringInput(["x-1"]), conversation_id="x")
+        executor.submit(StringInput(["x-2"]), conversation_id="x")
+
+    assert (await first).status == "completed"
+    assert server.events.index(("finished", "r-x-1")) < server.events.index(("added", "x-2"))
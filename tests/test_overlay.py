@@ -0,0 +1,227 @@
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from engram import (
+    AddSpool,
+    ConversationInput,
+    Memory,
+    MessageInput,
+    PreExtractedInput,
+    PreExtractedItem,
+    RetrievalConfig,
+    SearchCache,
+    StringInput,
+    WriteOverlay,
+)
+from engram._models import Run, SearchResults
+from engram._serialization import build_search_body
+from engram.errors import ValidationError
+from helpers import FakeClock, make_async_client, make_client
+
+SERVER_MEMORY: dict[str, Any] = {
+    "id": "m1",
+    "project_id": "p1",
+    "content": "Alice lives in Paris",
+    "topic": "t1",
+    "group": "g1",
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-01-01T00:00:00Z",
+}
+
+
+class FakeServer:
+    def __init__(self) -> None:
+        self.run_status = "running"
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        if path == "/v1/memories":
+            return httpx.Response(
+                200, json={"run_id": f"r{len(self.requests)}", "status": "queued"}
+            )
+        if path == "/v1/memories/search":
+            return httpx.Response(200, json={"memories": [SERVER_MEMORY], "total": 1})
+        return httpx.Response(
+            200,
+            json={
+                "run_id": path.rsplit("/", 1)[-1],
+                "status": self.run_status,
+                "group_id": "g1",
+                "starting_step": 0,
+                "input_type": "string",
+                "created_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:00Z",
+            },
+        )
+
+
+def _body(query: str, **kwargs: Any) -> dict[str, Any]:
+    return build_search_body(
+        query=query,
+        topics=kwargs.get("topics"),
+        user_id=kwargs.get("user_id"),
+        conversation_id=kwargs.get("conversation_id"),
+        group=kwargs.get("group"),
+        retrieval_config=kwargs.get("retrieval_config"),
+    )
+
+
+def test_pending_add_is_searchable_until_its_run_finishes() -> None:
+    server = FakeServer()
+    overlay = WriteOverlay()
+    client = make_client(server, write_overlay=overlay, search_cache=SearchCache())
+    run = client.memories.add("Alice moved to Berlin", user_id="u1")
+
+    results = client.memories.search(query="where does alice live", user_id="u1")
+    assert [m.provisional for m in results] == [True, False]
+    assert results[0].content == "Alice moved to Berlin"
+    assert results[0].user_id == "u1"
+    assert results.total == 2
+    assert overlay.pending_runs == [run.run_id]
+
+    assert len(client.memories.search(query="alice", user_id="u2")) == 1
+    assert len(client.memories.search(query="weather", user_id="u1")) == 1
+
+    client.runs.get(run.run_id)
+    assert overlay.pending_runs == [run.run_id]
+    server.run_status = "completed"
+    client.runs.wait(run.run_id)
+    assert overlay.pending_runs == []
+    assert [m.provisional for m in client.memories.search(query="alice", user_id="u1")] == [False]
+
+
+def test_overlay_extracts_content_from_each_input_type() -> None:
+    overlay = WriteOverlay()
+    run = Run(run_id="r1", status="queued")
+    scope: dict[str, Any] = {"user_id": "u1", "conversation_id": "c1", "group": "g1"}
+    conversation = ConversationInput(
+        messages=[
+            MessageInput(role="system", content="You are helpful"),
+            MessageInput(role="user", content="I adopted a cat"),
+            MessageInput(role="assistant", content="Congrats"),
+        ]
+    )
+    assert overlay.record(run, conversation, **scope) == 1
+    items = PreExtractedInput(items=[PreExtractedItem(content="Likes tea", topic="food")])
+    assert overlay.record(Run("r2", "queued"), items, **scope) == 1
+    generator = PreExtractedInput(items=(i for i in [PreExtractedItem("x", "y")]))
+    assert overlay.record(Run("r3", "queued"), generator, **scope) == 0
+    assert overlay.record(Run("r4", "failed"), "anything", **scope) == 0
+
+    base = SearchResults([], 0)
+    merged = overlay.merge(_body("cat tea", user_id="u1", group="g1"), base)
+    assert sorted(m.content for m in merged) == ["I adopted a cat", "Likes tea"]
+    merged = overlay.merge(_body("cat tea", user_id="u1", group="g1", topics=["food"]), base)
+    assert [m.content for m in merged] == ["Likes tea"]
+    merged = overlay.merge(_body("cat", user_id="u1", group="g1", conversation_id="c2"), base)
+    assert len(merged) == 0
+    assert overlay.resolve("r1") == 1
+    assert len(overlay) == 1
+
+
+def test_overlay_expires_and_bounds_pending_runs() -> None:
+    clock = FakeClock()
+    overlay = WriteOverlay(max_age=10, max_pending=2, clock=clock)
+    scope: dict[str, Any] = {"user_id": None, "conversation_id": None, "group": None}
+    overlay.record(Run("r1", "queued"), "one", **scope)
+    overlay.record(Run("r2", "queued"), StringInput(["two", "three"]), **scope)
+    assert overlay.pending_runs == ["r2"]
+    clock.now = 11
+    assert overlay.pending_runs == []
+    assert len(overlay) == 0
+    with pytest.raises(ValidationError):
+        WriteOverlay(max_age=0)
+
+
+def test_search_polls_runs_pending_past_poll_after() -> None:
+    server = FakeServer()
+    clock = FakeClock()
+    overlay = WriteOverlay(poll_after=5, clock=clock)
+    client = make_client(server, write_overlay=overlay)
+    run = client.memories.add("Alice moved to Berlin", user_id="u1")
+
+    client.memories.search(query="alice", user_id="u1")
+    assert not any(r.url.path.startswith("/v1/runs") for r in server.requests)
+    clock.now = 6
+    client.memories.search(query="alice", user_id="u1")
+    assert server.requests[-1].url.path == f"/v1/runs/{run.run_id}"
+    # Polled once per poll_after at most.
+    polls = len(server.requests)
+    client.memories.search(query="alice", user_id="u1")
+    assert len(server.requests) == polls + 1
+
+    server.run_status = "completed"
+    clock.now = 12
+    results = client.memories.search(query="alice", user_id="u1")
+    assert [m.provisional for m in results] == [False]
+    assert overlay.pending_runs == []
+
+
+def test_merge_drops_committed_content_and_keeps_to_the_limit() -> None:
+    overlay = WriteOverlay()
+    scope: dict[str, Any] = {"user_id": None, "conversation_id": None, "group": None}
+    overlay.record(Run("r1", "queued"), StringInput(["Alice lives in Paris", "Alice"]), **scope)
+    overlay.record(Run("r2", "queued"), "Alice likes Paris", **scope)
+    server = SearchResults([Memory(**SERVER_MEMORY)], 1)
+
+    merged = overlay.merge(_body("alice paris"), server)
+    assert sorted(m.content for m in merged if m.provisional) == ["Alice", "Alice likes Paris"]
+    assert [m.content for m in merged if not m.provisional] == ["Alice lives in Paris"]
+    assert len(overlay) == 2
+    assert sorted(overlay.pending_runs) == ["r1", "r2"]
+
+    limited = overlay.merge(_body("alice", retrieval_config=RetrievalConfig("bm25", 2)), server)
+    assert len(limited) == 2
+    assert all(m.provisional for m in limited)
+    assert limited.total == 3
+
+
+def test_spooled_add_resolves_with_its_replayed_run(tmp_path: Path) -> None:
+    server = FakeServer()
+    overlay = WriteOverlay()
+    spool = AddSpool(tmp_path)
+    client = make_client(server, write_overlay=overlay, add_spool=spool)
+
+    run = client.memories.add("Alice moved to Berlin", user_id="u1")
+    assert spool.wait_empty(timeout=5)
+    replayed = spool.resolve(run.run_id)
+    assert replayed is not None
+    assert overlay.pending_runs == [run.run_id]
+
+    server.run_status = "completed"
+    client.runs.wait(replayed.run_id)
+    assert overlay.pending_runs == []
+    client.close()
+    spool.close()
+
+
+def test_rekey_to_a_failed_run_drops_the_add() -> None:
+    overlay = WriteOverlay()
+    spooled = Run(run_id="spool-1", status="spooled")
+    overlay.record(spooled, "Alice", user_id="u1", conversation_id=None, group=None)
+    overlay.rekey("spool-1", Run(run_id="spool-1", status="failed", error="rejected"))
+    assert len(overlay) == 0
+
+    overlay.record(spooled, "Alice", user_id="u1", conversation_id=None, group=None)
+    overlay.rekey("spool-1", Run(run_id="r9", status="queued"))
+    overlay.clear()
+    assert overlay.resolve("r9") == 0
+
+
+@pytest.mark.asyncio
+async def test_async_pending_add_is_searchable_until_its_run_finishes() -> None:
+    server = FakeServer()
+    overlay = WriteOverlay()
+    client = make_async_client(server, write_overlay=overlay)
+    run = await client.memories.add("Bob prefers green tea", group="g1")
+    prepared = client.memories.prepare_search(group="g1")
+    results = await prepared.search("what tea does bob like")
+    assert results[0].provisional
+    server.run_status = "failed"
+    await client.runs.wait(run.run_id)
+    assert not (await prepared.search("tea"))[0].provisional
@@ -1,8 +1,15 @@
+import json
+from collections.abc import Iterator
+
+import pytest
+
 from engram._models import (
+    AddInput,
     ConversationInput,
     MessageInput,
     PreExtractedInput,
     PreExtractedItem,
+    RawConversationInput,
     RetrievalConfig,
     StringInput,
     ToolCallCustomInput,
@@ -10,14 +17,19 @@ from engram._models import (
     ToolCallInput,
 )
 from engram._serialization import (
+    SearchBodyTemplate,
+    SearchResultsDecoder,
     build_add_body,
     build_memory_params,
     build_search_body,
+    encode_add_body,
+    iter_add_body,
     parse_memory,
     parse_run,
     parse_run_status,
     parse_search_results,
 )
+from engram.errors import ValidationError
 
 # ── build_add_body ──────────────────────────────────────────────────────
 
@@ -235,6 +247,119 @@ def test_build_add_body_conversation_content_with_developer_role() -> None:
     assert msg["content"] == "You are a helpful assistant."
 
 
+# ── iter_add_body ───────────────────────────────────────────────────────
+
+
+def _streamed_inputs() -> list[AddInput]:
+    return [
+        "hello",
+        StringInput(content=["a", "b"]),
+        [{"role": "user", "content": "hi"}],
+        PreExtractedInput(items=[PreExtractedItem(content="fact", topic="t")]),
+        PreExtractedInput(items=[]),
+        ConversationInput(
+            messages=[
+                MessageInput(role="user", content="caf\u00e9", created_at="2024-01-01T00:00:00Z"),
+                MessageInput(
+                    role="assistant",
+                    tool_calls=[
+                        ToolCallInput(
+                            id="tc1", function=ToolCallFuncInput(name="f", arguments="{}")
+                        )
+                    ],
+                ),
+            ],
+            metadata={"k": "v"},
+            updated_at="2024-01-02T00:00:00Z",
+        ),
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_iter_add_body_matches_build_add_body(chunk_size: int) -> None:
+    for input_data in _streamed_inputs():
+        chunks = iter_add_body(
+            input_data, user_id="u1", conversation_id=None, group="g1", chunk_size=chunk_size
+        )
+        expected = build_add_body(input_data, user_id="u1", conversation_id=None, group="g1")
+        assert json.loads(b"".join(chunks)) == expected
+
+
+def test_iter_add_body_consumes_generators_lazily() -> None:
+    consumed: list[int] = []
+
+    def messages() -> Iterator[MessageInput]:
+        for i in range(3):
+            consumed.append(i)
+            yield MessageInput(role="user", content=f"m{i}")
+
+    chunks = iter_add_body(
+        ConversationInput(messages=messages()),
+        user_id=None,
+        conversation_id="c1",
+        group=None,
+        chunk_size=1,
+    )
+    first = next(chunks)
+    assert consumed == []
+    body = json.loads(first + b"".join(chunks))
+    assert consumed == [0, 1, 2]
+    assert [m["content"] for m in body["input"]["conversation"]["messages"]] == ["m0", "m1", "m2"]
+    assert body["conversation_id"] == "c1"
+
+
+# ── encode_add_body ─────────────────────────────────────────────────────
+
+
+def test_encode_add_body_splices_raw_messages() -> None:
+    raw = b'[{"role": "user", "content": "hi"},\n {"role": "assistant", "content": "yo"}]'
+    body = encode_add_body(
+        RawConversationInput(messages=raw, metadata={"k": "v"}),
+        user_id="u1",
+        conversation_id="c1",
+        group=None,
+    )
+    assert raw in body
+    assert json.loads(body) == {
+        "input": {
+            "conversation": {
+                "messages": json.loads(raw),
+                "metadata": {"k": "v"},
+            }
+        },
+        "user_id": "u1",
+        "conversation_id": "c1",
+    }
+
+
+def test_encode_add_body_matches_build_add_body() -> None:
+    input_data = StringInput(content=["a", "b"])
+    body = encode_add_body(input_data, user_id=None, conversation_id=None, group="g1")
+    assert json.loads(body) == build_add_body(
+        input_data, user_id=None, conversation_id=None, group="g1"
+    )
+
+
+def test_encode_add_body_rejects_non_array_raw_messages() -> None:
+    with pytest.raises(ValidationError):
+        encode_add_body(
+            RawConversationInput(messages=b'{"role": "user"}'),
+            user_id=None,
+            conversation_id=None,
+            group=None,
+        )
+
+
+def test_build_add_body_decodes_raw_messages() -> None:
+    body = build_add_body(
+        RawConversationInput(messages=b'[{"role": "user", "content": "hi"}]'),
+        user_id=None,
+        conversation_id=None,
+        group=None,
+    )
+    assert body == {"input": {"conversation": {"messages": [{"role": "user", "content": "hi"}]}}}
+
+
 # ── build_memory_params ─────────────────────────────────────────────────
 
 
@@ -281,6 +406,32 @@ def test_build_search_body_full() -> None:
     assert body["retrieval_config"]["limit"] == 5
 
 
+# ── SearchBodyTemplate ──────────────────────────────────────────────────
+
+
+def test_search_body_template_matches_build_search_body() -> None:
+    config = RetrievalConfig(retrieval_type="hybrid", limit=3)
+    template = SearchBodyTemplate(
+        topics=["a"], user_id="u1", conversation_id=None, group="g1", retrieval_config=config
+    )
+    for query in ["first", 'with "quotes" and \u00fc']:
+        assert json.loads(template.render(query)) == build_search_body(
+            query=query,
+            topics=["a"],
+            user_id="u1",
+            conversation_id=None,
+            group="g1",
+            retrieval_config=config,
+        )
+
+
+def test_search_body_template_without_scope() -> None:
+    template = SearchBodyTemplate(
+        topics=None, user_id=None, conversation_id=None, group=None, retrieval_config=None
+    )
+    assert template.render("q") == b'{"query":"q"}'
+
+
 # ── parse_run ───────────────────────────────────────────────────────────
 
 
@@ -359,6 +510,83 @@ def test_search_results_iterable() -> None:
     assert ids == ["m1", "m2"]
 
 
+def test_parse_memory_interns_scope_fields() -> None:
+    first = parse_memory(json.loads(json.dumps({**SAMPLE_MEMORY, "user_id": "u1"})))
+    second = parse_memory(json.loads(json.dumps({**SAMPLE_MEMORY, "user_id": "u1"})))
+    assert first.project_id is second.project_id
+    assert first.group is second.group
+    assert first.topic is second.topic
+    assert first.user_id is second.user_id
+    nulls = parse_memory({**SAMPLE_MEMORY, "project_id": None, "topic": None, "group": None})
+    assert [nulls.project_id, nulls.topic, nulls.group] == [None] * 3
+
+
+def test_search_results_compact_round_trip() -> None:
+    data = {
+        "memories": [
+            {**SAMPLE_MEMORY, "user_id": "u1", "score": 0.5, "tags": ["x"]},
+            {**SAMPLE_MEMORY, "id": "m2", "topic": "t2"},
+        ],
+        "total": 7,
+    }
+    result = parse_search_results(data)
+    compact = result.compact()
+    assert compact.total == 7
+    assert len(compact) == 2
+    assert list(compact) == list(result)
+    assert compact[-1].id == "m2"
+    assert compact[1].score is None
+    assert compact[0].tags == ["x"]
+    assert [m.id for m in compact[:1]] == ["m1"]
+    with pytest.raises(IndexError):
+        compact[2]
+
+
+# ── SearchResultsDecoder ────────────────────────────────────────────────
+
+
+def _decode_in_chunks(body: bytes, size: int) -> tuple[list[dict[str, object]], int | None]:
+    decoder = SearchResultsDecoder()
+    items: list[dict[str, object]] = []
+    for i in range(0, len(body), size):
+        items.extend(decoder.feed(body[i : i + size]))
+    items.extend(decoder.close())
+    return items, decoder.total
+
+
+def test_search_results_decoder_byte_at_a_time() -> None:
+    memories = [SAMPLE_MEMORY, {**SAMPLE_MEMORY, "id": "m2", "content": 'caf\u00e9 {"x": 1}'}]
+    body = json.dumps({"memories": memories, "total": 12345}, indent=1, ensure_ascii=False).encode()
+    items, total = _decode_in_chunks(body, 1)
+    assert items == memories
+    assert total == 12345
+
+
+def test_search_results_decoder_total_first_and_unknown_keys() -> None:
+    body = json.dumps(
+        {"total": 2, "extra": {"nested": [1, 2]}, "memories": [SAMPLE_MEMORY, SAMPLE_MEMORY]}
+    ).encode()
+    decoder = SearchResultsDecoder()
+    assert decoder.feed(body[:12]) == []
+    assert decoder.total == 2
+    items = decoder.feed(body[12:]) + decoder.close()
+    assert len(items) == 2
+    assert decoder.done
+
+
+def test_search_results_decoder_empty_array() -> None:
+    items, total = _decode_in_chunks(b'{"memories": [], "total": 0}', 3)
+    assert items == []
+    assert total == 0
+
+
+def test_search_results_decoder_rejects_truncated_body() -> None:
+    decoder = SearchResultsDecoder()
+    decoder.feed(b'{"memories": [{"id": "m1"')
+    with pytest.raises(ValueError):
+        decoder.close()
+
+
 # ── parse_run_status ────────────────────────────────────────────────────
 
 
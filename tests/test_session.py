@@ -0,0 +1,139 @@
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from engram import (
+    ConversationInput,
+    MessageInput,
+    ToolCallFuncInput,
+    ToolCallInput,
+)
+from engram.errors import ValidationError
+from helpers import make_async_client, make_client
+
+
+class FakeServer:
+    def __init__(self) -> None:
+        self.requests: list[httpx.Request] = []
+
+    @property
+    def uploads(self) -> list[list[str]]:
+        """The message contents of each add, in order."""
+        bodies = [json.loads(r.content) for r in self.requests]
+        return [[m["content"] for m in b["input"]["conversation"]["messages"]] for b in bodies]
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return httpx.Response(200, json={"run_id": f"r{len(self.requests)}", "status": "queued"})
+
+
+def _conversation(*turns: str) -> list[MessageInput]:
+    messages = [MessageInput(role="system", content="sys")]
+    for i, turn in enumerate(turns):
+        messages.append(MessageInput(role="user" if i % 2 == 0 else "assistant", content=turn))
+    return messages
+
+
+def test_session_uploads_only_the_new_tail_with_context() -> None:
+    server = FakeServer()
+    client = make_client(server)
+    session = client.memories.session("c1", user_id="u1", context_messages=1)
+
+    assert session.add(_conversation("u1", "a1")) is not None
+    assert session.add(_conversation("u1", "a1", "u2", "a2")) is not None
+    assert session.add(_conversation("u1", "a1", "u2", "a2")) is None
+    assert session.add(ConversationInput(_conversation("u1", "a1", "u2", "a2", "u3"))) is not None
+
+    assert server.uploads == [
+        ["sys", "u1", "a1"],
+        ["sys", "a1", "u2", "a2"],
+        ["sys", "a2", "u3"],
+    ]
+    body = json.loads(server.requests[-1].content)
+    assert body["conversation_id"] == "c1"
+    assert body["user_id"] == "u1"
+    assert session.sent == 6
+    assert (session.full_uploads, session.delta_uploads) == (1, 2)
+    assert session.messages_skipped == 1 + 3
+
+
+def test_session_reuploads_everything_after_an_edit() -> None:
+    server = FakeServer()
+    client = make_client(server)
+    session = client.memories.session("c1")
+    session.add(_conversation("u1", "a1"))
+    session.add(_conversation("u1 edited", "a1", "u2"))
+    session.add(_conversation("u1 edited"))
+    session.reset()
+    session.add(_conversation("u1 edited"))
+
+    assert server.uploads == [
+        ["sys", "u1", "a1"],
+        ["sys", "u1 edited", "a1", "u2"],
+        ["sys", "u1 edited"],
+        ["sys", "u1 edited"],
+    ]
+    assert session.full_uploads == 4
+    assert client.memories.session("c1") is session
+    assert client.memories.session("c1", user_id="u2") is not session
+
+
+def test_session_keeps_tool_calls_answered_by_the_tail() -> None:
+    server = FakeServer()
+    client = make_client(server)
+    session = client.memories.session("c1", context_messages=0)
+    call = ToolCallInput(id="call1", function=ToolCallFuncInput(name="f", arguments="{}"))
+    messages = [
+        MessageInput(role="user", content="q"),
+        MessageInput(role="assistant", content="calling", tool_calls=[call]),
+        MessageInput(role="assistant", content="waiting"),
+    ]
+    session.add(messages)
+    session.add([*messages, MessageInput(role="tool", content="result", tool_call_id="call1")])
+    assert server.uploads[-1] == ["calling", "result"]
+
+
+def test_session_rejects_one_shot_iterables() -> None:
+    client = make_client(FakeServer())
+    session = client.memories.session("c1")
+    with pytest.raises(ValidationError):
+        session.add(ConversationInput(m for m in _conversation("u1")))
+    with pytest.raises(ValidationError):
+        client.memories.session("c2", context_messages=-1)
+    assert client.memories.session("c1", context_messages=2) is session
+    with pytest.raises(ValidationError):
+        client.memories.session("c1", context_messages=5)
+
+
+def test_sessions_are_shared_between_threads() -> None:
+    client = make_client(FakeServer())
+    barrier = threading.Barrier(8)
+
+    def sessions(_: int) -> list[object]:
+        barrier.wait()
+        return [client.memories.session(f"c{i}") for i in range(300)]
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(sessions, range(8)))
+    finally:
+        sys.setswitchinterval(interval)
+    assert all(a is b for other in results[1:] for a, b in zip(results[0], other, strict=True))
+
+
+@pytest.mark.asyncio
+async def test_async_session_uploads_deltas() -> None:
+    server = FakeServer()
+    client = make_async_client(server)
+    session = client.memories.session("c1", context_messages=0)
+    await session.add(_conversation("u1"))
+    assert await session.add(_conversation("u1")) is None
+    run = await session.add(_conversation("u1", "a1"))
+    assert run is not None and run.run_id == "r2"
+    assert server.uploads == [["sys", "u1"], ["sys", "a1"]]
@@ -0,0 +1,156 @@
+import json
+from typing import Any
+
+import httpx
+import pytest
+
+from engram import (
+    AddSplitting,
+    CompositeRun,
+    PreExtractedInput,
+    PreExtractedItem,
+    Run,
+    SplitAddError,
+    StringInput,
+)
+from engram._splitting import composite_run
+from engram.errors import APIError, ValidationError
+from helpers import make_async_client, make_client
+
+
+class FakeServer:
+    """Names each run after the first entry of its part; each run creates one memory."""
+
+    def __init__(self) -> None:
+        self.bodies: list[dict[str, Any]] = []
+        self.failing_runs: set[str] = set()
+        self.rejected: set[str] = set()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/v1/memories":
+            body = json.loads(request.content)
+            self.bodies.append(body)
+            payload = body["input"]
+            first = (
+                payload["string"]["content"][0]
+                if "string" in payload
+                else payload["pre_extracted"]["items"][0]["content"]
+            )
+            if first in self.rejected:
+                return httpx.Response(400, json={"detail": "too large"})
+            return httpx.Response(200, json={"run_id": f"r-{first}", "status": "queued"})
+        run_id = path.rsplit("/", 1)[-1]
+        return httpx.Response(
+            200,
+            json={
+                "run_id": run_id,
+                "status": "failed" if run_id in self.failing_runs else "completed",
+                "group_id": "g1",
+                "starting_step": 0,
+                "input_type": "string",
+                "created_at": f"2024-01-01T00:00:0{len(run_id) % 10}Z",
+                "updated_at": f"2024-01-01T00:00:0{len(run_id) % 10}Z",
+                "committed_operations": {
+                    "created": [{"memory_id": f"m-{run_id}", "committed_at": "2024-01-01"}],
+                    "updated": [],
+                    "deleted": [],
+                },
+            },
+        )
+
+
+def test_split_respects_item_and_byte_limits() -> None:
+    splitting = AddSplitting(max_items=2, max_bytes=10)
+    assert splitting.split(StringInput(["a", "b"])) is None
+    assert splitting.split(StringInput("a" * 100)) is None
+    assert splitting.split("a" * 100) is None
+    parts = splitting.split(StringInput(["a", "b", "c", "dddddddddd", "e"]))
+    assert parts == [
+        StringInput(["a", "b"]),
+        StringInput(["c"]),
+        StringInput(["dddddddddd"]),
+        StringInput(["e"]),
+    ]
+    items = [PreExtractedItem(content=str(i), topic="t") for i in range(3)]
+    assert splitting.split(PreExtractedInput(items)) == [
+        PreExtractedInput(items[:2]),
+        PreExtractedInput(items[2:]),
+    ]
+    assert splitting.split(PreExtractedInput(iter(items))) is None
+    with pytest.raises(ValidationError):
+        AddSplitting(concurrency=0)
+
+
+def test_large_add_returns_a_composite_run_that_waits_as_one() -> None:
+    server = FakeServer()
+    client = make_client(server, add_splitting=AddSplitting(max_items=2, concurrency=2))
+
+    run = client.memories.add(StringInput(["a", "b", "c", "d", "e"]), user_id="u1")
+    assert isinstance(run, CompositeRun)
+    assert run.run_ids == ["r-a", "r-c", "r-e"]
+    assert run.run_id == "r-a,r-c,r-e"
+    assert run.status == "queued"
+    assert sorted(b["input"]["string"]["content"][0] for b in server.bodies) == ["a", "c", "e"]
+    assert all(b["user_id"] == "u1" for b in server.bodies)
+
+    status = client.runs.wait(run.run_id, interval=0)
+    assert status.run_id == run.run_id
+    assert status.status == "completed"
+    assert [op.memory_id for op in status.memories_created] == ["m-r-a", "m-r-c", "m-r-e"]
+
+    server.failing_runs.add("r-c")
+    failed = client.runs.get(run.run_id)
+    assert failed.status == "failed"
+
+    small = client.memories.add(StringInput(["x"]))
+    assert type(small) is Run
+
+
+def test_composite_status_is_the_least_advanced_part() -> None:
+    def status(*statuses: str) -> str:
+        return composite_run([Run(f"r{i}", s) for i, s in enumerate(statuses)]).status
+
+    assert status("running", "queued", "completed") == "queued"
+    assert status("completed", "running") == "running"
+    assert status("running", "waiting") == "waiting"
+    assert status("completed", "failed") == "failed"
+
+
+def test_a_failed_part_raises_after_the_others_finish() -> None:
+    server = FakeServer()
+    server.rejected.add("c")
+    client = make_client(server, add_splitting=AddSplitting(max_items=2))
+    with pytest.raises(SplitAddError) as excinfo:
+        client.memories.add(StringInput(["a", "b", "c", "d", "e"]), group="g")
+    assert len(server.bodies) == 3
+    error = excinfo.value
+    assert isinstance(error.__cause__, APIError)
+    assert error.run.run_ids == ["r-a", "r-e"]
+    assert error.failed_parts == [StringInput(["c", "d"])]
+    # The accepted parts are tracked like any other run.
+    assert client.memories._run_groups.pop("r-a") == (True, "g")
+    status = client.runs.wait(error.run.run_id, interval=0)
+    assert len(status.memories_created) == 2
+
+    server.rejected.update({"a", "e"})
+    with pytest.raises(APIError):
+        client.memories.add(StringInput(["a", "b", "c", "d", "e"]))
+
+
+@pytest.mark.asyncio
+async def test_async_large_add_is_split() -> None:
+    server = FakeServer()
+    client = make_async_client(server, add_splitting=AddSplitting(max_items=1, concurrency=2))
+    items = [PreExtractedItem(content=c, topic="t") for c in "abc"]
+    run = await client.memories.add(PreExtractedInput(items))
+    assert isinstance(run, CompositeRun)
+    assert run.run_ids == ["r-a", "r-b", "r-c"]
+    status = await client.runs.wait(run.run_id, interval=0)
+    assert len(status.memories_created) == 3
+
+    server.rejected.add("b")
+    with pytest.raises(SplitAddError) as excinfo:
+        await client.memories.add(PreExtractedInput(items))
+    assert excinfo.value.run.run_ids == ["r-a", "r-c"]
+    assert excinfo.value.failed_parts == [PreExtractedInput([items[1]])]
@@ -0,0 +1,360 @@
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from engram import (
+    AddDeduplicator,
+    AddItem,
+    AddSpool,
+    AsyncEngramClient,
+    EngramClient,
+    Run,
+    StringInput,
+)
+from engram._http import AsyncHttpTransport, HttpTransport
+from engram._resources.runs import Runs
+from engram._spool import _retryable, _SpoolReplayer
+from engram.errors import APIError, EngramTimeoutError, ValidationError
+from helpers import make_client, run_status
+
+
+class FakeServer:
+    """Accepts adds as runs named after their first string; can fail or reject some."""
+
+    def __init__(self) -> None:
+        self.bodies: list[dict[str, Any]] = []
+        self.unavailable = 0
+        self.rejected: set[str] = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            run_id = request.url.path.rsplit("/", 1)[-1]
+            return httpx.Response(200, json=run_status(run_id))
+        body = json.loads(request.content)
+        first = body["input"]["string"]["content"][0]
+        with self._lock:
+            if self.unavailable:
+                self.unavailable -= 1
+                return httpx.Response(503, json={"detail": "unavailable"})
+            self.bodies.append(body)
+        if first in self.rejected:
+            return httpx.Response(400, json={"detail": "bad input"})
+        return httpx.Response(200, json={"run_id": f"r-{first}", "status": "queued"})
+
+
+def _body(content: str) -> bytes:
+    return json.dumps({"input": {"string": {"content": [content]}}}).encode()
+
+
+def _sent(body: bytes) -> str:
+    content: str = json.loads(body)["input"]["string"]["content"][0]
+    return content
+
+
+def test_adds_are_spooled_and_replayed(tmp_path: Path) -> None:
+    server = FakeServer()
+    spool = AddSpool(tmp_path)
+    client = make_client(server, add_spool=spool)
+
+    run = client.memories.add(StringInput(["hello"]), user_id="u1")
+    assert run.status == "spooled"
+    assert run.run_id.startswith("spool-")
+
+    assert spool.wait_empty(timeout=5)
+    assert server.bodies == [{"input": {"string": {"content": ["hello"]}}, "user_id": "u1"}]
+    assert spool.resolve(run.run_id) == Run(run_id="r-hello", status="queued")
+    assert spool.stats.replayed == 1
+    assert spool.stats.depth == 0
+    client.close()
+    spool.close()
+
+
+def test_replayed_adds_update_the_deduplicator(tmp_path: Path) -> None:
+    server = FakeServer()
+    server.rejected.add("bad")
+    spool = AddSpool(tmp_path)
+    client = make_client(server, add_spool=spool, add_dedup=AddDeduplicator())
+
+    client.memories.add(StringInput(["hello"]))
+    client.memories.add(StringInput(["bad"]))
+    assert spool.wait_empty(timeout=5)
+
+    assert client.memories.add(StringInput(["hello"])) == Run(run_id="r-hello", status="queued")
+    assert client.memories.add(StringInput(["bad"])).status == "spooled"
+    client.close()
+    spool.close()
+
+
+def test_rejected_adds_are_not_retried(tmp_path: Path) -> None:
+    server = FakeServer()
+    server.rejected.add("bad")
+    spool = AddSpool(tmp_path)
+    client = make_client(server, add_spool=spool)
+
+    run = client.memories.add(StringInput(["bad"]))
+    assert spool.wait_empty(timeout=5)
+
+    resolved = spool.resolve(run.run_id)
+    assert resolved is not None
+    assert resolved.status == "failed"
+    assert resolved.error is not None and "bad input" in resolved.error
+    assert len(server.bodies) == 1
+    assert spool.stats.rejected == 1
+    client.close()
+    spool.close()
+
+
+def test_unavailable_server_is_retried_with_backoff(tmp_path: Path) -> None:
+    server = FakeServer()
+    server.unavailable = 2
+    spool = AddSpool(tmp_path, max_backoff=0.2)
+    client = make_client(server, add_spool=spool)
+
+    run = client.memories.add(StringInput(["later"]))
+    assert spool.wait_empty(timeout=5)
+
+    assert spool.resolve(run.run_id) == Run(run_id="r-later", status="queued")
+    assert spool.stats.retries == 2
+    client.close()
+    spool.close()
+
+
+def test_pending_adds_survive_a_restart(tmp_path: Path) -> None:
+    spool = AddSpool(tmp_path)
+    for content in ("a", "b", "c"):
+        spool.append(_body(content))
+    spool.close()
+
+    reopened = AddSpool(tmp_path)
+    assert len(reopened) == 3
+    assert reopened.stats.recovered == 3
+
+    sent: list[str] = []
+
+    def send(body: bytes) -> Run:
+        sent.append(_sent(body))
+        return Run(run_id=f"r-{_sent(body)}", status="queued")
+
+    replayer = _SpoolReplayer(reopened, send)
+    assert reopened.wait_empty(timeout=5)
+    replayer.close()
+    assert sorted(sent) == ["a", "b", "c"]
+    # New adds continue the sequence instead of reusing replayed IDs.
+    assert reopened.append(_body("d")).run_id == "spool-4"
+    reopened.close()
+
+    again = AddSpool(tmp_path)
+    assert len(again) == 1
+    again.close()
+
+
+def test_acked_adds_stay_acked_across_reopens(tmp_path: Path) -> None:
+    spool = AddSpool(tmp_path)
+    for content in ("a", "b", "c", "d", "e"):
+        spool.append(_body(content))
+    for seq, body in spool._take(2, timeout=0):
+        spool._ack(seq, Run(run_id=f"r-{_sent(body)}", status="queued"))
+    spool.close()
+
+    for _ in range(2):
+        reopened = AddSpool(tmp_path)
+        assert sorted(reopened._pending) == [3, 4, 5]
+        assert reopened.resolve("spool-2") == Run(run_id="r-b", status="queued")
+        assert reopened.resolve("spool-3") is None
+        reopened.close()
+
+
+def test_replayed_run_ids_survive_a_restart(tmp_path: Path) -> None:
+    server = FakeServer()
+    server.rejected.add("bad")
+    spool = AddSpool(tmp_path)
+    client = make_client(server, add_spool=spool)
+    good = client.memories.add(StringInput(["good"]))
+    bad = client.memories.add(StringInput(["bad"]))
+    assert spool.wait_empty(timeout=5)
+    client.close()
+    spool.close()
+
+    reopened = AddSpool(tmp_path)
+    assert reopened.resolve(good.run_id) == Run(run_id="r-good", status="queued")
+    rejected = reopened.resolve(bad.run_id)
+    assert rejected is not None and rejected.status == "failed"
+    reopened.close()
+
+
+def test_runs_accept_spool_run_ids(tmp_path: Path) -> None:
+    server = FakeServer()
+    server.unavailable = 2
+    server.rejected.add("bad")
+    spool = AddSpool(tmp_path)
+    client = make_client(server, add_spool=spool)
+
+    run = client.memories.add(StringInput(["hello"]))
+    status = client.runs.wait(run.run_id, timeout=5, interval=0.01)
+    assert (status.run_id, status.status) == ("r-hello", "completed")
+    assert client.runs.get(run.run_id).run_id == "r-hello"
+
+    bad = client.memories.add(StringInput(["bad"]))
+    failed = client.runs.wait(bad.run_id, timeout=5, interval=0.01)
+    assert (failed.run_id, failed.status) == (bad.run_id, "failed")
+
+    statuses = list(client.memories.add_stream([AddItem(StringInput(["s"]))], poll_interval=0.01))
+    assert statuses[0][1].run_id == "r-s"
+    with client.memories.ordered(wait_for_completion=True, poll_interval=0.01) as executor:
+        ordered = executor.submit(StringInput(["o"]), conversation_id="c")
+    assert ordered.result().status == "completed"
+    client.close()
+    spool.close()
+
+
+def test_runs_reject_spool_run_ids_not_yet_replayed(tmp_path: Path) -> None:
+    spool = AddSpool(tmp_path)
+    run = spool.append(_body("later"))
+    runs = Runs(HttpTransport(EngramClient(api_key="k")._config), spool=spool)
+    with pytest.raises(ValidationError):
+        runs.get(run.run_id)
+    with pytest.raises(EngramTimeoutError):
+        runs.wait(run.run_id, timeout=0.01)
+    with pytest.raises(ValidationError):
+        spool.wait_resolved("spool-99")
+    spool.close()
+
+
+def test_torn_tail_is_truncated_on_recovery(tmp_path: Path) -> None:
+    spool = AddSpool(tmp_path)
+    spool.append(_body("kept"))
+    spool.close()
+    (segment,) = tmp_path.glob("*.seg")
+    with open(segment, "ab") as f:
+        f.write(b"\x10\x00\x00\x00partial")
+
+    reopened = AddSpool(tmp_path)
+    assert len(reopened) == 1
+    reopened.append(_body("next"))
+    reopened.close()
+
+    again = AddSpool(tmp_path)
+    assert len(again) == 2
+    again.close()
+
+
+def test_replayed_segments_are_deleted(tmp_path: Path) -> None:
+    spool = AddSpool(tmp_path, segment_bytes=64)
+    for i in range(6):
+        spool.append(_body(f"add-{i}"))
+    assert spool.stats.segments > 1
+
+    replayer = _SpoolReplayer(spool, lambda body: Run(run_id=_sent(body), status="queued"))
+    assert spool.wait_empty(timeout=5)
+    replayer.close()
+
+    stats = spool.stats
+    assert stats.segments == 1
+    assert stats.segments_compacted >= 5
+    assert len(list(tmp_path.glob("*.seg"))) == 1
+    spool.close()
+
+
+def test_stats_report_depth_and_lag(tmp_path: Path) -> None:
+    now = [100.0]
+    spool = AddSpool(tmp_path, clock=lambda: now[0])
+    spool.append(_body("one"))
+    now[0] = 102.5
+    spool.append(_body("two"))
+
+    stats = spool.stats
+    assert stats.depth == 2
+    assert stats.pending_bytes == len(_body("one")) + len(_body("two"))
+    assert stats.lag == 2.5
+    assert stats.appended == 2
+    spool.sync()
+    assert spool.stats.fsyncs == 1
+    spool.close()
+
+
+def test_resolve_ignores_unknown_ids(tmp_path: Path) -> None:
+    spool = AddSpool(tmp_path)
+    assert spool.resolve("r-123") is None
+    assert spool.resolve("spool-x") is None
+    assert spool.resolve(spool.append(_body("x")).run_id) is None
+    spool.close()
+
+
+def test_closed_spool_rejects_appends(tmp_path: Path) -> None:
+    spool = AddSpool(tmp_path)
+    spool.close()
+    with pytest.raises(ValidationError):
+        spool.append(_body("x"))
+
+
+def test_spool_serves_one_client(tmp_path: Path) -> None:
+    spool = AddSpool(tmp_path)
+    client = make_client(FakeServer(), add_spool=spool)
+    with pytest.raises(ValidationError):
+        EngramClient(base_url="https://test.example.com", api_key="k", add_spool=spool)
+    client.close()
+    other = make_client(FakeServer(), add_spool=spool)
+    other.close()
+    spool.close()
+
+
+def test_invalid_settings() -> None:
+    with pytest.raises(ValidationError):
+        AddSpool("unused", segment_bytes=0)
+    with pytest.raises(ValidationError):
+        AddSpool("unused", max_backoff=0)
+
+
+def test_retryable_errors() -> None:
+    assert _retryable(APIError("unavailable", status_code=503))
+    assert _retryable(APIError("slow down", status_code=429))
+    assert not _retryable(APIError("bad", status_code=400))
+    assert not _retryable(ValidationError("bad"))
+
+
+async def test_async_client_spools_adds(tmp_path: Path) -> None:
+    server = FakeServer()
+    spool = AddSpool(tmp_path)
+    client = AsyncEngramClient(base_url="https://test.example.com", api_key="k", add_spool=spool)
+    client._replay_transport.close()
+    client._replay_transport = HttpTransport(
+        client._config, httpx.Client(transport=httpx.MockTransport(server))
+    )
+    client._transport = AsyncHttpTransport(
+        client._config, httpx.AsyncClient(transport=httpx.MockTransport(server))
+    )
+    client.memories._transport = client._transport
+
+    run = await client.memories.add(StringInput(["async"]))
+    assert run.status == "spooled"
+    assert spool.wait_empty(timeout=5)
+    assert spool.resolve(run.run_id) == Run(run_id="r-async", status="queued")
+    await client.aclose()
+    spool.close()
+
+
+async def test_async_runs_wait_for_spooled_adds(tmp_path: Path) -> None:
+    server = FakeServer()
+    spool = AddSpool(tmp_path)
+    client = AsyncEngramClient(base_url="https://test.example.com", api_key="k", add_spool=spool)
+    transport = AsyncHttpTransport(
+        client._config, httpx.AsyncClient(transport=httpx.MockTransport(server))
+    )
+    client._replay_transport.close()
+    client._replay_transport = HttpTransport(
+        client._config, httpx.Client(transport=httpx.MockTransport(server))
+    )
+    client._transport = transport
+    client.memories._transport = transport
+    client.runs._transport = transport
+
+    run = await client.memories.add(StringInput(["hello"]))
+    status = await client.runs.wait(run.run_id, timeout=5, interval=0.01)
+    assert status.run_id == "r-hello"
+    await client.aclose()
+    spool.close()
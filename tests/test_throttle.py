@@ -0,0 +1,137 @@
+import json
+import threading
+
+import httpx
+import pytest
+
+from engram import RunThrottle, StringInput
+from engram.errors import APIError, ValidationError
+from helpers import make_async_client, make_client, run_status
+
+
+class FakeServer:
+    """Runs finish once polled `polls` times; tracks the deepest unfinished backlog."""
+
+    def __init__(self, polls: int = 2) -> None:
+        self.polls = polls
+        self.unfinished: set[str] = set()
+        self.deepest = 0
+        self.rejected: set[str] = set()
+        self.missing: set[str] = set()
+        self._polled: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            content = json.loads(request.content)["input"]["string"]["content"][0]
+            if content in self.rejected:
+                return httpx.Response(400, json={"detail": "rejected"})
+            run_id = f"r-{content}"
+            with self._lock:
+                self.unfinished.add(run_id)
+                self.deepest = max(self.deepest, len(self.unfinished))
+            return httpx.Response(200, json={"run_id": run_id, "status": "queued"})
+        run_id = request.url.path.rsplit("/", 1)[-1]
+        if run_id in self.missing:
+            return httpx.Response(404, json={"detail": "not found"})
+        with self._lock:
+            polled = self._polled[run_id] = self._polled.get(run_id, 0) + 1
+            done = polled >= self.polls
+            if done:
+                self.unfinished.discard(run_id)
+        return httpx.Response(200, json=run_status(run_id, "completed" if done else "running"))
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        return self(request)
+
+
+def test_adds_wait_while_the_pipeline_is_full() -> None:
+    server = FakeServer()
+    throttle = RunThrottle(target=2, poll_interval=0.001)
+    client = make_client(server, add_throttle=throttle)
+
+    for i in range(6):
+        client.memories.add(StringInput([str(i)]))
+
+    assert server.deepest == 2
+    assert len(throttle) == 2
+    stats = throttle.stats
+    assert stats.admitted == 6
+    assert stats.throttled == 4
+    assert stats.finished == 4
+    assert stats.polls >= 8
+    assert stats.mean_latency > 0
+
+
+def test_statuses_seen_by_runs_free_slots() -> None:
+    server = FakeServer(polls=1)
+    throttle = RunThrottle(target=2)
+    client = make_client(server, add_throttle=throttle)
+
+    client.memories.add(StringInput(["a"]))
+    client.memories.add(StringInput(["b"]))
+    client.runs.get("r-a")
+    assert len(throttle) == 1
+
+    client.memories.add(StringInput(["c"]))
+    assert throttle.stats.throttled == 0
+
+
+def test_adds_are_sent_after_max_wait() -> None:
+    server = FakeServer(polls=1000)
+    throttle = RunThrottle(target=1, poll_interval=0.01, max_wait=0.05)
+    client = make_client(server, add_throttle=throttle)
+
+    client.memories.add(StringInput(["a"]))
+    client.memories.add(StringInput(["b"]))
+
+    assert throttle.stats.timeouts == 1
+    assert len(throttle) == 2
+
+
+def test_missing_runs_are_forgotten() -> None:
+    server = FakeServer()
+    server.missing.add("r-a")
+    throttle = RunThrottle(target=1, poll_interval=0.001)
+    client = make_client(server, add_throttle=throttle)
+
+    client.memories.add(StringInput(["a"]))
+    client.memories.add(StringInput(["b"]))
+
+    stats = throttle.stats
+    assert stats.forgotten == 1
+    assert stats.poll_errors == 1
+    assert stats.finished == 0
+
+
+def test_failed_adds_give_back_their_slot() -> None:
+    server = FakeServer()
+    server.rejected.add("bad")
+    throttle = RunThrottle(target=1)
+    client = make_client(server, add_throttle=throttle)
+
+    with pytest.raises(APIError):
+        client.memories.add(StringInput(["bad"]))
+    client.memories.add(StringInput(["good"]))
+    assert throttle.stats.throttled == 0
+
+
+def test_invalid_settings() -> None:
+    with pytest.raises(ValidationError):
+        RunThrottle(target=0)
+    with pytest.raises(ValidationError):
+        RunThrottle(poll_interval=0)
+
+
+async def test_async_adds_wait_while_the_pipeline_is_full() -> None:
+    server = FakeServer()
+    throttle = RunThrottle(target=3, poll_interval=0.001)
+    client = make_async_client(server.handle, add_throttle=throttle)
+
+    for i in range(8):
+        await client.memories.add(StringInput([str(i)]))
+
+    assert server.deepest == 3
+    stats = throttle.stats
+    assert stats.throttled == 5
+    assert stats.finished == 5